@@ -1,7 +1,7 @@
 # backend-py/agents/venue_finder.py
 import json
 import os
-from typing import Dict, List, Optional
+from typing import Dict, List, Optional, Tuple
 
 from crewai import Agent, Task, Crew, Process
 from crewai.llm import LLM
@@ -14,7 +14,9 @@ try:
 except Exception:
     _OPENAI_AVAILABLE = False
 
+from utils.geo import DEFAULT_RADIUS_KM, parse_near
 from utils.provider_repository import list_venues
+from utils.provider_table import ProviderTable
 
 MUSICAL_KEYWORDS = {
     "musical",
@@ -30,27 +32,44 @@ MUSICAL_KEYWORDS = {
 }
 
 
-def _matches_event_type(venue: Dict, event_type: Optional[str]) -> bool:
+def _type_matches(venue_type: str, event_type: Optional[str]) -> bool:
     evt = (event_type or "").strip().lower()
     if not evt:
         return True
-    venue_type = (venue.get("type") or "").lower()
+    venue_type = (venue_type or "").lower()
     if not venue_type:
         return True
     if evt == "musical":
         return any(keyword in venue_type for keyword in MUSICAL_KEYWORDS)
     return evt in venue_type or venue_type in evt
 
-def _mongo_base_search(city: str, event_type: str, top_k: int) -> List[Dict]:
-    candidates = list_venues(city=city, limit=max(top_k * 3, 24))
+
+def _matches_event_type(venue: Dict, event_type: Optional[str]) -> bool:
+    return _type_matches(venue.get("type") or "", event_type)
+
+def _mongo_base_search(
+    city: str,
+    event_type: str,
+    top_k: int,
+    near: Optional[Tuple[float, float]] = None,
+    radius_km: float = DEFAULT_RADIUS_KM,
+) -> List[Dict]:
+    # A proximity search replaces the city text match; the 2dsphere index serves it.
+    candidates = list_venues(
+        city=None if near else city,
+        limit=max(top_k * 3, 24),
+        near=near,
+        radius_km=radius_km,
+    )
     if not candidates:
         return []
-    filtered = [venue for venue in candidates if _matches_event_type(venue, event_type)]
-    if not filtered:
-        filtered = candidates
+    table = ProviderTable.from_records(candidates)
+    # The event-type check runs once per distinct venue type, not per venue.
+    mask = table.where("type", lambda venue_type: _type_matches(venue_type, event_type))
+    if not mask.any():
+        mask = None
     # Order by rating, then capacity similar to CSV fallback.
-    filtered.sort(key=lambda r: (r.get("rating", 0.0) or 0.0, r.get("capacity", 0) or 0), reverse=True)
-    return filtered[: top_k * 2]
+    return table.rows(table.top_k(top_k * 2, by=("rating", "capacity"), mask=mask))
 
 
 def openai_venue_search(city: str, event_type: str, base_venues: List[Dict], top_k: int = 7) -> List[Dict]:
@@ -190,9 +209,20 @@ def crewai_venue_analysis(city: str, event_type: str, venues_data: List[Dict], t
         print(f"CrewAI venue analysis error: {e}")
         return venues_data[:top_k]
 
-def find_venues(city: str, event_type: str, top_k: int = 7) -> List[Dict]:
-    """Find venues using OpenAI-enhanced recommendations backed by Mongo data."""
-    base_venues = _mongo_base_search(city, event_type, top_k=top_k)
+def find_venues(
+    city: str,
+    event_type: str,
+    top_k: int = 7,
+    near: Optional[str] = None,
+    radius_km: float = DEFAULT_RADIUS_KM,
+) -> List[Dict]:
+    """Find venues using OpenAI-enhanced recommendations backed by Mongo data.
+
+    ``near`` ("lat,lon" or a town name) restricts candidates to ``radius_km``
+    around that point; unknown places raise ``utils.geo.UnknownLocation``.
+    """
+    point = parse_near(near) if near else None
+    base_venues = _mongo_base_search(city, event_type, top_k=top_k, near=point, radius_km=radius_km)
 
     if not base_venues:
         return []
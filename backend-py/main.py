@@ -13,6 +13,7 @@ from config.database import engine, get_db, Base
 from config.settings import load_environment
 from models.campaign import Campaign
 from models.event_context import EventContextRecord
+from planner.persistence import ensure_plan_indexes
 from routers.planner import router as planner_router
 from routers.venues import router as venues_router
 from routers.concept_names import router as concept_names_router
@@ -72,10 +73,30 @@ app.add_middleware(
     allow_credentials=True,
     allow_methods=["*"],
     allow_headers=["*"],
+    expose_headers=["X-Next-Cursor", "X-Concept-Lookups", "X-Concept-Fetches"],
 )
 
 # --- Database initialization ---
 Base.metadata.create_all(bind=engine)
+ensure_plan_indexes(engine)
+
+
+@app.on_event("startup")
+def start_background_sync() -> None:
+    """Keep the provider catalog in sync, the AI concept pool filled and the default concept warm."""
+    from planner.service import warm_default_concept
+    from utils.concept_repository import start_concept_pool
+    from utils.provider_cache import start_provider_cache_invalidation
+    from utils.provider_catalog import start_provider_catalog_sync
+
+    if os.getenv("PROVIDER_CATALOG_SOURCE", "catalog").strip().lower() == "catalog":
+        start_provider_catalog_sync()
+    # Started here so the first cache miss in an async handler does not start it on the loop.
+    start_provider_cache_invalidation()
+    # No-op unless USE_AI_CONCEPTS=1; concepts are generated here, not per request.
+    start_concept_pool()
+    # Resolved off the event loop so the first planner request does not seed it inline.
+    warm_default_concept()
 
 # --- Mount Existing Event Planner Routers ---
 app.include_router(planner_router)
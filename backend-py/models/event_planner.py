@@ -7,7 +7,7 @@ from config.database import Base
 class EventPlan(Base):
     __tablename__ = "event_plans"
     id = Column(String, primary_key=True)               # uuid
-    campaign_id = Column(String, ForeignKey("campaigns.id"), nullable=False)
+    campaign_id = Column(String, ForeignKey("campaigns.id"), nullable=False, index=True)
     concept_key = Column(String, nullable=False)        # A1..A4
     concept_title = Column(String, nullable=False)
     assumptions = Column(Text, nullable=False)          # pipe-joined list for MVP
@@ -22,7 +22,7 @@ class EventPlan(Base):
 class PlanCost(Base):
     __tablename__ = "plan_costs"
     id = Column(String, primary_key=True)               # uuid
-    event_plan_id = Column(String, ForeignKey("event_plans.id"), nullable=False)
+    event_plan_id = Column(String, ForeignKey("event_plans.id"), nullable=False, index=True)
     category = Column(String, nullable=False)           # venue/catering/...
     amount_lkr = Column(Integer, nullable=False)
     currency = Column(String, default="LKR")
@@ -32,7 +32,7 @@ class PlanCost(Base):
 class PlanTimeline(Base):
     __tablename__ = "plan_timeline"
     id = Column(String, primary_key=True)               # uuid
-    event_plan_id = Column(String, ForeignKey("event_plans.id"), nullable=False)
+    event_plan_id = Column(String, ForeignKey("event_plans.id"), nullable=False, index=True)
     offset_days = Column(Integer, nullable=False)
     milestone = Column(String, nullable=False)
     owner = Column(String, nullable=True)
@@ -0,0 +1,127 @@
+"""Bulk persistence of generated event plans.
+
+``generate_plans`` writes a plan, its cost lines and its timeline for every
+concept. Adding each row to the ORM session builds one unit-of-work object
+per row; :class:`PlanRows` collects plain parameter dicts instead and
+:func:`insert_plan_rows` writes them with one Core ``insert()`` per table,
+which SQLAlchemy executes as a single executemany (or multi-row ``VALUES``)
+inside the session's transaction.
+
+Regenerating replaces a campaign's plans: :func:`delete_campaign_plans`
+removes the old ones with three set-based DELETEs keyed by campaign instead
+of loading each plan and letting the ORM cascade delete its children row by
+row, so the cost does not grow with the number of plans being replaced.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Dict, Iterable, List, Tuple
+
+from sqlalchemy import delete, insert, select
+from sqlalchemy.engine import Engine
+from sqlalchemy.orm import Session
+
+from models.event_planner import EventPlan, PlanCost, PlanTimeline
+from planner.service import uuid
+
+
+class PlanRows:
+    """Row parameters for plans, costs and timelines, in insert order."""
+
+    def __init__(self) -> None:
+        self.plans: List[Dict[str, Any]] = []
+        self.costs: List[Dict[str, Any]] = []
+        self.timeline: List[Dict[str, Any]] = []
+
+    def __len__(self) -> int:
+        return len(self.plans) + len(self.costs) + len(self.timeline)
+
+    def add_plan(
+        self,
+        campaign_id: str,
+        concept_key: str,
+        concept_title: str,
+        assumptions: Iterable[str],
+        costs: Iterable[Tuple[str, int]],
+        timeline: Iterable[Tuple[int, str]],
+        budget_profile: str,
+    ) -> str:
+        """Queue one plan with its cost lines and milestones; returns the new plan id."""
+
+        plan_id = uuid()
+        costs = list(costs)
+        self.plans.append(
+            {
+                "id": plan_id,
+                "campaign_id": campaign_id,
+                "concept_key": concept_key,
+                "concept_title": concept_title,
+                "assumptions": "|".join(assumptions),
+                "total_lkr": sum(amount for _, amount in costs),
+                "budget_profile": budget_profile,
+            }
+        )
+        self.costs.extend(
+            {"id": uuid(), "event_plan_id": plan_id, "category": category, "amount_lkr": amount}
+            for category, amount in costs
+        )
+        self.timeline.extend(
+            {"id": uuid(), "event_plan_id": plan_id, "offset_days": offset, "milestone": label}
+            for offset, label in timeline
+        )
+        return plan_id
+
+
+def insert_plan_rows(db: Session, rows: PlanRows) -> None:
+    """Insert ``rows`` with one executemany per table; the caller commits.
+
+    Plans go first so the cost and timeline foreign keys resolve on databases
+    that check them immediately.
+    """
+
+    for table, params in (
+        (EventPlan.__table__, rows.plans),
+        (PlanCost.__table__, rows.costs),
+        (PlanTimeline.__table__, rows.timeline),
+    ):
+        if params:
+            db.execute(insert(table), params)
+
+
+def delete_campaign_plans(db: Session, campaign_id: str) -> int:
+    """Delete the campaign's plans with their costs and milestones; returns plans deleted.
+
+    Bypasses the ORM session (no per-plan loads), so it must not run while
+    the session holds plan objects that are still needed.
+    """
+
+    plan_ids = select(EventPlan.__table__.c.id).where(EventPlan.__table__.c.campaign_id == campaign_id)
+    for child in (PlanCost.__table__, PlanTimeline.__table__):
+        db.execute(delete(child).where(child.c.event_plan_id.in_(plan_ids)))
+    result = db.execute(delete(EventPlan.__table__).where(EventPlan.__table__.c.campaign_id == campaign_id))
+    return result.rowcount
+
+
+def replace_campaign_plans(db: Session, campaign_id: str, rows: PlanRows) -> None:
+    """Swap the campaign's stored plans for ``rows`` in one transaction."""
+
+    delete_campaign_plans(db, campaign_id)
+    insert_plan_rows(db, rows)
+    db.commit()
+
+
+def ensure_plan_indexes(engine: Engine) -> None:
+    """Create the campaign/plan foreign-key indexes on databases made before they existed."""
+
+    for table in (EventPlan.__table__, PlanCost.__table__, PlanTimeline.__table__):
+        for index in table.indexes:
+            index.create(engine, checkfirst=True)
+
+
+__all__ = [
+    "PlanRows",
+    "delete_campaign_plans",
+    "ensure_plan_indexes",
+    "insert_plan_rows",
+    "replace_campaign_plans",
+]
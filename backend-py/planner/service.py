@@ -2,13 +2,21 @@
 
 from __future__ import annotations
 
+import logging
+import threading
+import time
 from datetime import date as _date
-from typing import Dict, List, Optional, Tuple
+from typing import Any, Dict, Iterable, List, Optional, Tuple, Union
 from uuid import uuid4
 
 from agents.concept_generator import ConceptGenerationUnavailable
 from models.concept import Concept
-from utils.concept_repository import concept_notice, ensure_seed_concept, get_concept, list_concepts
+from utils.concept_repository import concept_notice, ensure_seed_concept, get_concept, get_concepts, list_concepts
+from utils.env import env_float
+from utils.rate_stats import PER_SEAT_ROLE, rate_stats
+from utils.single_flight import SingleFlight
+
+logger = logging.getLogger(__name__)
 
 MILESTONES = [
     (-30, "Vendor shortlist & RFPs"),
@@ -28,8 +36,23 @@ DEFAULT_COST_SPLIT = {
     "sound": 0.10,
 }
 
+# Market per-seat rate quantile used for an unpriced venue, by venue type keywords.
+VENUE_TYPE_QUANTILES = [
+    (("luxury", "5-star"), 0.75),
+    (("hotel", "ballroom"), 0.5),
+    (("garden", "outdoor"), 0.4),
+]
+DEFAULT_VENUE_QUANTILE = 0.35
+# Per-seat rate for an unpriced venue when no market statistics are available.
+VENUE_TYPE_SEAT_RATES = [
+    (("luxury", "5-star"), 3000),
+    (("hotel", "ballroom"), 2000),
+    (("garden", "outdoor"), 1500),
+]
+DEFAULT_SEAT_RATE = 1200
+
 
-def _default_concept() -> Optional[Concept]:
+def _resolve_default_concept() -> Concept:
     try:
         seed = ensure_seed_concept()
         return seed
@@ -58,18 +81,122 @@ def _default_concept() -> Optional[Concept]:
     )
 
 
-_DEFAULT_CONCEPT = _default_concept()
+# The default concept needs Mongo (and possibly OpenAI), so it is resolved on
+# first use rather than at import and refreshed in the background afterwards.
+_DEFAULT_LOCK = threading.Lock()
+_DEFAULT_STATE: Dict[str, Any] = {"concept": None, "loaded_at": None, "refreshing": False}
+_DEFAULT_FLIGHT = SingleFlight()
+
+
+def _default_refresh_seconds() -> float:
+    return env_float("DEFAULT_CONCEPT_REFRESH_SECONDS", 300.0)
+
+
+def _load_default_concept() -> Concept:
+    concept: Optional[Concept] = None
+    try:
+        concept = _resolve_default_concept()
+        return concept
+    finally:
+        with _DEFAULT_LOCK:
+            if concept is not None:
+                _DEFAULT_STATE["concept"] = concept
+                _DEFAULT_STATE["loaded_at"] = time.monotonic()
+            _DEFAULT_STATE["refreshing"] = False
+
+
+def _refresh_default_concept() -> None:
+    try:
+        _load_default_concept()
+    except Exception as exc:  # pragma: no cover - keep serving the previous default
+        logger.warning("Default concept refresh failed: %s", exc)
+
+
+def _default_concept() -> Concept:
+    """Cached default concept; the first call resolves it, stale ones refresh in a thread."""
+
+    with _DEFAULT_LOCK:
+        concept = _DEFAULT_STATE["concept"]
+        loaded_at = _DEFAULT_STATE["loaded_at"]
+        refresh = (
+            concept is not None
+            and not _DEFAULT_STATE["refreshing"]
+            and time.monotonic() - loaded_at >= _default_refresh_seconds()
+        )
+        if refresh:
+            _DEFAULT_STATE["refreshing"] = True
+    if concept is None:
+        return _DEFAULT_FLIGHT.do("default", _load_default_concept)
+    if refresh:
+        threading.Thread(target=_refresh_default_concept, name="default-concept-refresh", daemon=True).start()
+    return concept
+
+
+def warm_default_concept() -> None:
+    """Resolve the default concept in a background thread (e.g. at app startup)."""
+
+    def warm() -> None:
+        try:
+            _default_concept()  # shares the single flight with any concurrent first request
+        except Exception as exc:  # pragma: no cover - requests resolve it on demand instead
+            logger.warning("Default concept warm-up failed: %s", exc)
+
+    threading.Thread(target=warm, name="default-concept-warm", daemon=True).start()
+
+
+# Service helpers take a resolved Concept or, for one-off callers, a concept id.
+ConceptRef = Union[Concept, str, None]
 
 
-def _ensure_concept(concept_id: Optional[str]) -> Concept:
+class ConceptResolver:
+    """Request-scoped concept lookups: each id is fetched at most once per request.
+
+    Seed it with concepts the request already holds and/or :meth:`prefetch`
+    the ids it will need in one batch; ``fetches`` and ``lookups`` count the
+    repository reads and the resolutions served.
+    """
+
+    def __init__(self, concepts: Iterable[Concept] = ()) -> None:
+        self._concepts: Dict[str, Concept] = {concept.concept_id: concept for concept in concepts}
+        self._unknown: set = set()
+        self.fetches = 0
+        self.lookups = 0
+
+    def prefetch(self, concept_ids: Iterable[Optional[str]]) -> None:
+        missing = [
+            cid for cid in dict.fromkeys(concept_ids) if cid and cid not in self._concepts and cid not in self._unknown
+        ]
+        if not missing:
+            return
+        self.fetches += 1
+        for concept in get_concepts(missing):
+            self._concepts[concept.concept_id] = concept
+        self._unknown.update(cid for cid in missing if cid not in self._concepts)
+
+    def resolve(self, concept_id: Optional[str]) -> Concept:
+        """The concept for ``concept_id``; unknown or empty ids get the default concept."""
+
+        self.lookups += 1
+        if concept_id:
+            self.prefetch([concept_id])
+        concept = self._concepts.get(concept_id) if concept_id else None
+        return concept if concept is not None else _default_concept()
+
+    def resolve_many(self, concept_ids: Iterable[Optional[str]]) -> List[Concept]:
+        concept_ids = list(concept_ids)
+        self.prefetch(concept_ids)
+        return [self.resolve(cid) for cid in concept_ids]
+
+
+def _ensure_concept(concept_id: ConceptRef) -> Concept:
+    if isinstance(concept_id, Concept):
+        return concept_id
     if concept_id:
         try:
             return get_concept(concept_id)
         except KeyError:
             pass
-    if _DEFAULT_CONCEPT is None:
-        raise RuntimeError("No concepts available. Ensure provider data is accessible.")
-    return _DEFAULT_CONCEPT
+    return _default_concept()
 
 
 def _round_and_fix(total: int, parts: List[Tuple[str, float]]) -> List[Tuple[str, int]]:
@@ -96,7 +223,7 @@ def _normalized_split(concept: Concept) -> Dict[str, float]:
     return {k: v / total for k, v in filtered.items()}
 
 
-def generate_costs(total_budget_lkr: int, concept_id: Optional[str] = None) -> List[Tuple[str, int]]:
+def generate_costs(total_budget_lkr: int, concept_id: ConceptRef = None) -> List[Tuple[str, int]]:
     concept = _ensure_concept(concept_id)
     split = _normalized_split(concept)
     return _round_and_fix(total_budget_lkr, list(split.items()))
@@ -144,11 +271,11 @@ def apply_venue_lead_time(event_date: _date, milestones, lead_days: int):
     return sorted([(off, lbl) for lbl, off in dedup.items()], key=lambda x: x[0])
 
 
-def pick_title(concept_id: Optional[str]) -> str:
+def pick_title(concept_id: ConceptRef) -> str:
     return _ensure_concept(concept_id).title
 
 
-def pick_concept_details(concept_id: Optional[str]) -> Dict[str, str]:
+def pick_concept_details(concept_id: ConceptRef) -> Dict[str, str]:
     concept = _ensure_concept(concept_id)
     return {
         "title": concept.title,
@@ -161,7 +288,7 @@ def pick_concept_details(concept_id: Optional[str]) -> Dict[str, str]:
     }
 
 
-def pick_assumptions(concept_id: Optional[str]) -> List[str]:
+def pick_assumptions(concept_id: ConceptRef) -> List[str]:
     concept = _ensure_concept(concept_id)
     if concept.default_features:
         return concept.default_features
@@ -173,7 +300,7 @@ def pick_assumptions(concept_id: Optional[str]) -> List[str]:
     ]
 
 
-def feasibility_notes(total: int, attendees: int, concept_id: Optional[str] = None) -> List[str]:
+def feasibility_notes(total: int, attendees: int, concept_id: ConceptRef = None) -> List[str]:
     concept = _ensure_concept(concept_id)
     notes: List[str] = []
     if attendees > 0:
@@ -208,7 +335,20 @@ def _fallback_weight(concept: Concept, key: str, default: float) -> float:
     return split.get(key, default)
 
 
-def calculate_venue_cost(venue_data: dict, attendees: int, concept_id: Optional[str]) -> int:
+def _by_venue_type(venue_type: str, table, default):
+    return next((value for keywords, value in table if any(token in venue_type for token in keywords)), default)
+
+
+def _market_seat_rate(city: Optional[str], venue_type: str) -> Optional[int]:
+    """Precomputed per-seat market rate for an unpriced venue in ``city``, ``None`` when unknown."""
+    stats = rate_stats()
+    if not stats.ensure_loaded():
+        return None
+    quantile = _by_venue_type(venue_type, VENUE_TYPE_QUANTILES, DEFAULT_VENUE_QUANTILE)
+    return stats.quantile(PER_SEAT_ROLE, quantile, city=city)
+
+
+def calculate_venue_cost(venue_data: dict, attendees: int, concept_id: ConceptRef) -> int:
     concept = _ensure_concept(concept_id)
     if not venue_data:
         return int(_target_total(concept, attendees) * _fallback_weight(concept, "venue", 0.4))
@@ -238,31 +378,24 @@ def calculate_venue_cost(venue_data: dict, attendees: int, concept_id: Optional[
     if base_cost > 0:
         return base_cost
 
-    capacity = _as_int(venue_data.get("capacity"), attendees or 100)
     venue_type = (venue_data.get("type") or "").lower()
-
-    if "luxury" in venue_type or "5-star" in venue_type:
-        base_cost = capacity * 3000
-    elif any(token in venue_type for token in ("hotel", "ballroom")):
-        base_cost = capacity * 2000
-    elif any(token in venue_type for token in ("garden", "outdoor")):
-        base_cost = capacity * 1500
-    else:
-        base_cost = capacity * 1200
-
-    return base_cost
+    capacity = _as_int(venue_data.get("capacity"), 0) or attendees or 100
+    seat_rate = _market_seat_rate(venue_data.get("city"), venue_type)
+    if not seat_rate:
+        seat_rate = _by_venue_type(venue_type, VENUE_TYPE_SEAT_RATES, DEFAULT_SEAT_RATE)
+    return capacity * seat_rate
 
 
 def generate_dynamic_costs(
     total_budget_lkr: int,
-    concept_id: Optional[str],
+    concept_id: ConceptRef,
     venue_data: dict = None,
     attendees: int = 100,
 ) -> List[Tuple[str, int]]:
     concept = _ensure_concept(concept_id)
     split = _normalized_split(concept)
 
-    venue_cost = calculate_venue_cost(venue_data, attendees, concept.concept_id)
+    venue_cost = calculate_venue_cost(venue_data, attendees, concept)
     remaining_budget = max(total_budget_lkr - venue_cost, 0)
 
     other_weights = [(key, weight) for key, weight in split.items() if key != "venue"]
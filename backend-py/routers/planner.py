@@ -1,5 +1,12 @@
 # backend-py/routers/planner.py
-from fastapi import APIRouter, Depends, HTTPException
+import asyncio
+import json
+import logging
+from functools import partial
+
+from fastapi import APIRouter, Depends, HTTPException, Response
+from fastapi.concurrency import run_in_threadpool
+from fastapi.responses import StreamingResponse
 from sqlalchemy.orm import Session
 from pydantic import BaseModel, Field
 from typing import List, Optional
@@ -7,24 +14,33 @@ from datetime import date
 
 from config.database import get_db
 from dependencies.api_key import require_planner_api_key
-from models.event_planner import EventPlan, PlanCost, PlanTimeline, SelectedPlan
+from models.event_planner import SelectedPlan
 from models.campaign import Campaign
 
+from planner.persistence import PlanRows, replace_campaign_plans
 from planner.service import (
     DEFAULT_EVENT_TYPE,
+    ConceptResolver,
     generate_costs,
     compress_milestones,
-    concept_ids,
     pick_title,
     pick_assumptions,
     pick_concept_details,
     feasibility_notes,
-    uuid,
     apply_venue_lead_time,
     generate_dynamic_costs,
 )
 from agents.venue_finder import find_venues
-from services.concept_naming import generate_concept_identity
+from services.concept_naming import (
+    ConceptIdentity,
+    batch_naming_enabled,
+    fallback_identity,
+    gather_identities,
+    generate_concept_identities,
+    generate_concept_identity,
+    naming_timeout,
+)
+from utils.async_concept_repository import list_concepts
 
 router = APIRouter(
     prefix="/campaigns",
@@ -33,6 +49,10 @@ router = APIRouter(
 )
 
 DEFAULT_CITY = "Colombo"
+CONCEPT_LOOKUPS_HEADER = "X-Concept-Lookups"
+CONCEPT_FETCHES_HEADER = "X-Concept-Fetches"
+
+logger = logging.getLogger(__name__)
 
 class WizardInput(BaseModel):
     campaign_id: str
@@ -75,130 +95,281 @@ class EventPlanOut(BaseModel):
     derived: dict
 
 
-@router.post("/{campaign_id}/planner/generate", response_model=EventPlanOut)
-def generate_plans(campaign_id: str, body: WizardInput, db: Session = Depends(get_db)):
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
-    if not campaign:
-        raise HTTPException(status_code=404, detail="Campaign not found")
+def _get_campaign(db: Session, campaign_id: str) -> Optional[Campaign]:
+    return db.query(Campaign).filter(Campaign.id == campaign_id).first()
+
+
+
+def _prepare_concept(concept, body: WizardInput):
+    """Deterministic per-concept parts of a plan: title, assumptions, details and costs."""
+    title = pick_title(concept)
+    assumptions = pick_assumptions(concept)
+    concept_details = pick_concept_details(concept)
+
+    # Generate initial costs based on concept theme
+    cost_pairs = generate_costs(body.total_budget_lkr, concept)
+    return title, assumptions, concept_details, cost_pairs
+
+
+_DEFAULT_LEAD_DAYS = 30
 
-    event_info = EventInfo(
+
+def _extract_city(venue_str: str) -> Optional[str]:
+    if not venue_str:
+        return None
+    tokens = [segment.strip() for segment in venue_str.split(",") if segment.strip()]
+    if tokens:
+        return tokens[-1]
+    return None
+
+
+def _event_info(body: WizardInput) -> EventInfo:
+    return EventInfo(
         name=body.event_name,
         venue=body.venue,
         date=body.event_date,
         attendees=body.attendees_estimate,
     )
 
-    # Remove any existing plans for this campaign to avoid duplicates
-    existing_plans = db.query(EventPlan).filter(EventPlan.campaign_id == campaign_id).all()
-    for plan in existing_plans:
-        db.delete(plan)
-    db.flush()
-
-    # Generate concepts and persist
-    concept_list: List[Concept] = []
-    ids = concept_ids(body.number_of_concepts)
-
-    # Get venue suggestions for dynamic pricing
-    suggested_venues = find_venues(DEFAULT_CITY, DEFAULT_EVENT_TYPE, top_k=10)
 
-    # Determine recommended lead time and timeline up front
+def _venue_plan(event_info: EventInfo, suggested_venues: List[dict]):
+    """Top suggestions, the lead time they need and the timeline stretched to fit it."""
     suggested = suggested_venues[:5]
     known_leads = [
         v.get("min_lead_days") for v in suggested
         if isinstance(v.get("min_lead_days"), int) and v.get("min_lead_days") > 0
     ]
-    recommended_lead_days = max(known_leads) if known_leads else 30
+    recommended_lead_days = max(known_leads) if known_leads else _DEFAULT_LEAD_DAYS
 
     base_timeline = compress_milestones(event_info.date)
     tl_with_lead = apply_venue_lead_time(event_info.date, base_timeline, recommended_lead_days)
+    return suggested, recommended_lead_days, tl_with_lead
 
-    def _extract_city(venue_str: str) -> Optional[str]:
-        if not venue_str:
-            return None
-        tokens = [segment.strip() for segment in venue_str.split(",") if segment.strip()]
-        if tokens:
-            return tokens[-1]
-        return None
 
-    event_payload = event_info.model_dump()
-    event_payload["city"] = _extract_city(body.venue) or DEFAULT_CITY
+def _derived(body: WizardInput, event_info: EventInfo, suggested: List[dict], recommended_lead_days: int) -> dict:
+    """Feasibility notes and venue booking risk for the wizard response.
 
-    for cid in ids:
-        title = pick_title(cid)
-        assumptions = pick_assumptions(cid)
-        concept_details = pick_concept_details(cid)
-
-        identity = generate_concept_identity(
-            event=event_payload,
-            concept=concept_details,
-            budget_lkr=body.total_budget_lkr,
-            attendees=body.attendees_estimate,
-            fallback_title=title,
-            fallback_tagline=concept_details.get("tagline"),
+    Blocks while feasibility notes resolve the default concept, so callers
+    dispatch it with ``run_in_threadpool``.
+    """
+    # Venue booking risk note
+    days_to_event = (event_info.date - date.today()).days
+    risk = days_to_event < recommended_lead_days
+    risk_note = None
+    if risk:
+        rld = recommended_lead_days
+        risk_note = f"Event in {days_to_event} days; popular venues often require ~{rld} days lead time."
+    return {
+        "feasibility_notes": feasibility_notes(body.total_budget_lkr, body.attendees_estimate),
+        "suggested_venues": suggested,
+        "recommended_lead_days": recommended_lead_days,
+        "venue_booking_risk": risk,
+        "venue_booking_note": risk_note,
+    }
+
+
+async def _name_concepts(prepared, event_payload: dict, body: WizardInput) -> List[ConceptIdentity]:
+    timeout = naming_timeout()
+    fallbacks = [fallback_identity(title, details.get("tagline")) for title, _, details, _ in prepared]
+    if batch_naming_enabled():
+        # One request names every concept, so the titles can be kept distinct.
+        return await run_in_threadpool(
+            partial(
+                generate_concept_identities,
+                event=event_payload,
+                concepts=[details for _, _, details, _ in prepared],
+                budget_lkr=body.total_budget_lkr,
+                attendees=body.attendees_estimate,
+                fallbacks=fallbacks,
+                timeout=timeout,
+            )
         )
+    # One OpenAI round trip per concept: fan the calls out so the wall-clock
+    # cost is about one call, each with its own timeout and fallback.
+    return await gather_identities(
+        [
+            partial(
+                generate_concept_identity,
+                event=event_payload,
+                concept=details,
+                budget_lkr=body.total_budget_lkr,
+                attendees=body.attendees_estimate,
+                fallback_title=fallback.title,
+                fallback_tagline=details.get("tagline"),
+                timeout=timeout,
+            )
+            for (_, _, details, _), fallback in zip(prepared, fallbacks)
+        ],
+        fallbacks,
+        timeout=timeout,
+    )
 
-        title = identity.title
-        tagline = identity.tagline
-        concept_details["title"] = title
-        concept_details["tagline"] = tagline
 
-        # Generate initial costs based on concept theme
-        cost_pairs = generate_costs(body.total_budget_lkr, cid)
+def _build_concepts(ids: List[str], prepared, identities: List[ConceptIdentity]) -> List[Concept]:
+    concept_list: List[Concept] = []
+    for cid, (_, assumptions, concept_details, cost_pairs), identity in zip(ids, prepared, identities):
+        concept_details["title"] = identity.title
+        concept_details["tagline"] = identity.tagline
         costs = [CostItem(category=c, amount_lkr=v) for c, v in cost_pairs]
-        total = sum(c.amount_lkr for c in costs)
-
-        plan_id = uuid()
-        plan = EventPlan(
-            id=plan_id,
-            campaign_id=campaign_id,
-            concept_key=cid,
-            concept_title=title,
-            assumptions="|".join(assumptions),
-            total_lkr=total,
-            budget_profile=concept_details["title"],
-        )
-        db.add(plan)
-        for c in costs:
-            db.add(PlanCost(id=uuid(), event_plan_id=plan_id, category=c.category, amount_lkr=c.amount_lkr))
-        for off, label in tl_with_lead:
-            db.add(PlanTimeline(id=uuid(), event_plan_id=plan_id, offset_days=off, milestone=label))
-
         concept_list.append(
             Concept(
                 id=cid,
-                title=title,
-                tagline=tagline,
+                title=identity.title,
+                tagline=identity.tagline,
                 assumptions=assumptions,
                 costs=costs,
-                total_lkr=total,
-                budget_profile=concept_details["title"]
+                total_lkr=sum(c.amount_lkr for c in costs),
+                budget_profile=identity.title,
             )
         )
+    return concept_list
 
-    db.commit()
 
-    # Venue booking risk note
-    days_to_event = (event_info.date - date.today()).days
-    risk = days_to_event < recommended_lead_days
-    risk_note = None
-    if risk:
-        rld = recommended_lead_days
-        risk_note = f"Event in {days_to_event} days; popular venues often require ~{rld} days lead time."
+def _plan_rows(campaign_id: str, concept_list: List[Concept], timeline) -> PlanRows:
+    rows = PlanRows()
+    for concept in concept_list:
+        rows.add_plan(
+            campaign_id=campaign_id,
+            concept_key=concept.id,
+            concept_title=concept.title,
+            assumptions=concept.assumptions,
+            costs=[(c.category, c.amount_lkr) for c in concept.costs],
+            timeline=timeline,
+            budget_profile=concept.budget_profile,
+        )
+    return rows
 
-    out = EventPlanOut(
+
+def _plan_out(campaign_id: str, event_info: EventInfo, concept_list: List[Concept], timeline, derived: dict) -> EventPlanOut:
+    return EventPlanOut(
         campaign_id=campaign_id,
         event=event_info,
         concepts=concept_list,
-        timeline=[TimelineItem(offset_days=o, milestone=m) for o, m in tl_with_lead],
-        derived={
-            "feasibility_notes": feasibility_notes(body.total_budget_lkr, body.attendees_estimate),
-            "suggested_venues": suggested,
-            "recommended_lead_days": recommended_lead_days,
-            "venue_booking_risk": risk,
-            "venue_booking_note": risk_note,
-        }
+        timeline=[TimelineItem(offset_days=o, milestone=m) for o, m in timeline],
+        derived=derived,
+    )
+
+
+async def _prepare_concepts(body: WizardInput):
+    """List the request's concepts and do their deterministic work; returns the resolver, ids and parts."""
+    concepts = await list_concepts(limit=body.number_of_concepts)
+    # The listed concepts are the request's only concept fetch; every helper
+    # below gets Concept instances from this resolver instead of re-reading.
+    resolver = ConceptResolver(concepts)
+    ids = [record.concept_id for record in concepts]
+    prepared = await run_in_threadpool(
+        lambda: [_prepare_concept(resolver.resolve(cid), body) for cid in ids]
+    )
+    return resolver, ids, prepared
+
+
+@router.post("/{campaign_id}/planner/generate", response_model=EventPlanOut)
+async def generate_plans(campaign_id: str, body: WizardInput, response: Response, db: Session = Depends(get_db)):
+    # Sync SQLAlchemy/pymongo/OpenAI calls run in the threadpool so the event
+    # loop keeps serving other requests while this one waits on IO.
+    campaign = await run_in_threadpool(_get_campaign, db, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    event_info = _event_info(body)
+
+    # Concept ids and venue suggestions (for dynamic pricing) are independent
+    # Mongo reads, so they overlap.
+    (resolver, ids, prepared), suggested_venues = await asyncio.gather(
+        _prepare_concepts(body),
+        run_in_threadpool(find_venues, DEFAULT_CITY, DEFAULT_EVENT_TYPE, top_k=10),
     )
-    return out
+
+    # Determine recommended lead time and timeline up front
+    suggested, recommended_lead_days, tl_with_lead = _venue_plan(event_info, suggested_venues)
+
+    event_payload = event_info.model_dump()
+    event_payload["city"] = _extract_city(body.venue) or DEFAULT_CITY
+
+    identities = await _name_concepts(prepared, event_payload, body)
+    concept_list = _build_concepts(ids, prepared, identities)
+
+    # Replace the campaign's previous plans (set-based) and write the new ones
+    # in a single transaction, so no write lock is held while concepts are named.
+    rows = _plan_rows(campaign_id, concept_list, tl_with_lead)
+    await run_in_threadpool(replace_campaign_plans, db, campaign_id, rows)
+    # Concept reads beyond the initial listing; 0 means one fetch for the whole request.
+    response.headers[CONCEPT_LOOKUPS_HEADER] = str(resolver.lookups)
+    response.headers[CONCEPT_FETCHES_HEADER] = str(resolver.fetches)
+
+    derived = await run_in_threadpool(_derived, body, event_info, suggested, recommended_lead_days)
+    return _plan_out(campaign_id, event_info, concept_list, tl_with_lead, derived)
+
+
+def _ndjson(event: str, **payload) -> bytes:
+    return (json.dumps({"event": event, **payload}, default=str) + "\n").encode()
+
+
+@router.post("/{campaign_id}/planner/generate/stream")
+async def stream_plans(campaign_id: str, body: WizardInput, db: Session = Depends(get_db)):
+    """Streaming ``generate``: NDJSON events as each part of the plan resolves.
+
+    ``skeleton`` (costs, default-lead timeline and fallback titles) comes as
+    soon as the concepts are listed; ``titles`` and ``venues`` follow in
+    whichever order the naming calls and venue search finish, and ``plan``
+    carries the final plan (the ``generate`` response) once it is saved. A
+    failure after the stream starts is reported as an ``error`` event.
+    """
+    campaign = await run_in_threadpool(_get_campaign, db, campaign_id)
+    if not campaign:
+        raise HTTPException(status_code=404, detail="Campaign not found")
+
+    event_info = _event_info(body)
+    event_payload = event_info.model_dump()
+    event_payload["city"] = _extract_city(body.venue) or DEFAULT_CITY
+
+    async def events():
+        venues_task = asyncio.ensure_future(
+            run_in_threadpool(find_venues, DEFAULT_CITY, DEFAULT_EVENT_TYPE, top_k=10)
+        )
+        pending = {venues_task}
+        try:
+            _, ids, prepared = await _prepare_concepts(body)
+            skeleton_concepts = _build_concepts(
+                ids, prepared, [fallback_identity(title, details.get("tagline")) for title, _, details, _ in prepared]
+            )
+            _, lead_days, timeline = _venue_plan(event_info, [])
+            derived = await run_in_threadpool(_derived, body, event_info, [], lead_days)
+            skeleton = _plan_out(campaign_id, event_info, skeleton_concepts, timeline, derived)
+            yield _ndjson("skeleton", plan=skeleton.model_dump(mode="json"))
+
+            names_task = asyncio.ensure_future(_name_concepts(prepared, event_payload, body))
+            pending.add(names_task)
+            while pending:
+                done, pending = await asyncio.wait(pending, return_when=asyncio.FIRST_COMPLETED)
+                if names_task in done:
+                    concept_list = _build_concepts(ids, prepared, names_task.result())
+                    yield _ndjson(
+                        "titles",
+                        concepts=[{"id": c.id, "title": c.title, "tagline": c.tagline} for c in concept_list],
+                    )
+                if venues_task in done:
+                    suggested, lead_days, timeline = _venue_plan(event_info, venues_task.result())
+                    derived = await run_in_threadpool(_derived, body, event_info, suggested, lead_days)
+                    yield _ndjson(
+                        "venues",
+                        timeline=[{"offset_days": o, "milestone": m} for o, m in timeline],
+                        derived=derived,
+                    )
+
+            await run_in_threadpool(
+                replace_campaign_plans, db, campaign_id, _plan_rows(campaign_id, concept_list, timeline)
+            )
+            plan = _plan_out(campaign_id, event_info, concept_list, timeline, derived)
+            yield _ndjson("plan", plan=plan.model_dump(mode="json"))
+        except Exception as exc:
+            logger.exception("Streaming plan generation failed for campaign %s", campaign_id)
+            yield _ndjson("error", detail=str(exc))
+        finally:
+            for task in pending:
+                task.cancel()
+
+    return StreamingResponse(events(), media_type="application/x-ndjson")
 
 
 # --- NEW: Dynamic Pricing Endpoints ---
@@ -222,7 +393,7 @@ class UpdatedCostsResponse(BaseModel):
     savings_or_overage: int
 
 @router.post("/{campaign_id}/planner/update-costs", response_model=UpdatedCostsResponse)
-def update_concept_costs(
+async def update_concept_costs(
     campaign_id: str, 
     body: UpdateCostsRequest, 
     db: Session = Depends(get_db)
@@ -230,13 +401,14 @@ def update_concept_costs(
     """Update concept costs based on venue selections and attendee adjustments."""
     
     # Verify campaign exists
-    campaign = db.query(Campaign).filter(Campaign.id == campaign_id).first()
+    campaign = await run_in_threadpool(_get_campaign, db, campaign_id)
     if not campaign:
         raise HTTPException(status_code=404, detail="Campaign not found")
     
     venue_data = body.venue_selection.venue_data if body.venue_selection else None
     # Generate dynamic costs
-    cost_pairs = generate_dynamic_costs(
+    cost_pairs = await run_in_threadpool(
+        generate_dynamic_costs,
         total_budget_lkr=body.total_budget_lkr,
         concept_id=body.concept_id,
         venue_data=venue_data,
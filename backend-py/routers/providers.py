@@ -2,19 +2,20 @@
 """
 Provider endpoints for fetching venue, music, lighting, and sound options from MongoDB.
 Supports filtering by city, budget, and other criteria.
+
+Listings are keyset-paginated: when more results exist the response carries an
+``X-Next-Cursor`` header; pass it back as ``?cursor=`` to fetch the next page.
 """
 import logging
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query, Response
 from pydantic import BaseModel
 from typing import List, Optional
 from dependencies.api_key import require_planner_api_key
-from utils.provider_repository import (
-    list_venues,
-    list_solo_musicians,
-    list_music_ensembles,
-    list_lighting,
-    list_sound_specialists
-)
+from utils.geo import DEFAULT_RADIUS_KM, UnknownLocation, parse_near
+from utils.pagination import InvalidCursor
+from utils.async_provider_repository import provider_page
+from utils.mongo_metrics import mongo_metrics
+from utils.provider_cache import provider_cache_stats
 
 logger = logging.getLogger(__name__)
 router = APIRouter(
@@ -38,6 +39,7 @@ class VenueProvider(BaseModel):
     website: Optional[str] = None
     phone: Optional[str] = None
     city: Optional[str] = None
+    location: Optional[dict] = None
     min_lead_days: Optional[int] = None
     source: Optional[str] = "mongo_users"
 
@@ -93,19 +95,49 @@ class SoundProvider(BaseModel):
     contact: Optional[str] = None
     source: Optional[str] = "mongo_users"
 
+# ==================== Pagination ====================
+
+NEXT_CURSOR_HEADER = "X-Next-Cursor"
+CURSOR_DESCRIPTION = f"Opaque cursor from the previous page's {NEXT_CURSOR_HEADER} header"
+SEARCH_DESCRIPTION = "Fuzzy search over name, genres, services and type (e.g., 'jaz', 'hiphop')"
+
+
+async def _fetch_page(listing: str, label: str, response: Response, city: Optional[str], limit: int,
+                cursor: Optional[str], **filters) -> List[dict]:
+    try:
+        items, next_cursor = await provider_page(listing, city=city, limit=limit, cursor=cursor, **filters)
+        
+        # Fallback: if city filter returns no results, try without city filter.
+        # Later pages keep whatever scope their cursor was issued for.
+        if city and not cursor and len(items) == 0:
+            logger.warning(f"No {label} found for city '{city}', fetching all as fallback")
+            items, next_cursor = await provider_page(listing, city=None, limit=limit, **filters)
+    except InvalidCursor as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    
+    if next_cursor:
+        response.headers[NEXT_CURSOR_HEADER] = next_cursor
+    return items
+
 # ==================== Endpoints ====================
 
 @router.get("/venue", response_model=List[VenueProvider], summary="Get venue options")
-def get_venues(
+async def get_venues(
+    response: Response,
     city: Optional[str] = Query(None, description="Filter by city (e.g., 'Colombo', 'Hambantota')"),
     min_capacity: Optional[int] = Query(None, description="Minimum capacity required"),
     max_budget_lkr: Optional[int] = Query(None, description="Maximum budget in LKR"),
-    limit: int = Query(12, ge=1, le=50, description="Maximum number of results")
+    q: Optional[str] = Query(None, description=SEARCH_DESCRIPTION),
+    near: Optional[str] = Query(None, description="Search around 'lat,lon' or a town name (e.g., 'Galle', '6.05,80.22')"),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, le=500, description="Search radius for `near`, in km"),
+    limit: int = Query(12, ge=1, le=50, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """
     Fetch venue providers from MongoDB users collection.
     
     If city filter returns no results, will return ALL venues (fallback behavior).
+    `near`/`radius_km` filter by distance from a point via the catalog's geo index.
     
     Example MongoDB document structure:
     ```json
@@ -119,32 +151,26 @@ def get_venues(
     }
     ```
     """
-    venues = list_venues(city=city, limit=limit)
-    
-    # Fallback: if city filter returns no results, try without city filter
-    if city and len(venues) == 0:
-        logger.warning(f"No venues found for city '{city}', fetching all venues as fallback")
-        venues = list_venues(city=None, limit=limit)
-    
-    # Apply filters
-    if min_capacity:
-        venues = [v for v in venues if (v.get("capacity") or 0) >= min_capacity]
-    
-    if max_budget_lkr:
-        venues = [
-            v for v in venues 
-            if (v.get("avg_cost_lkr") or v.get("standard_rate_lkr") or 0) <= max_budget_lkr
-        ]
-    
-    return venues
+    try:
+        point = parse_near(near) if near else None
+    except UnknownLocation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
+    return await _fetch_page(
+        "venue", "venues", response, city, limit, cursor,
+        min_capacity=min_capacity, max_budget_lkr=max_budget_lkr, q=q,
+        near=point, radius_km=radius_km if point else None,
+    )
 
 
 @router.get("/music", response_model=List[dict], summary="Get music providers (musicians + bands)")
-def get_music_providers(
+async def get_music_providers(
+    response: Response,
     city: Optional[str] = Query(None, description="Filter by city"),
-    genre: Optional[str] = Query(None, description="Filter by genre (e.g., 'Rock', 'Jazz')"),
+    genre: Optional[str] = Query(None, description="Filter by genre, fuzzy (e.g., 'Rock', 'Jazz')"),
     max_budget_lkr: Optional[int] = Query(None, description="Maximum budget in LKR"),
-    limit: int = Query(12, ge=1, le=50, description="Maximum number of results")
+    q: Optional[str] = Query(None, description=SEARCH_DESCRIPTION),
+    limit: int = Query(12, ge=1, le=50, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """
     Fetch music providers from MongoDB users collection.
@@ -173,62 +199,23 @@ def get_music_providers(
     }
     ```
     """
-    # Fetch both types
-    solo_musicians = list_solo_musicians(city=city, limit=limit)
-    bands = list_music_ensembles(city=city, limit=limit)
-    
-    # Fallback: if city filter returns no results, try without city filter
-    if city and len(solo_musicians) == 0 and len(bands) == 0:
-        logger.warning(f"No music providers found for city '{city}', fetching all as fallback")
-        solo_musicians = list_solo_musicians(city=None, limit=limit)
-        bands = list_music_ensembles(city=None, limit=limit)
-    
-    # Combine and mark type
-    all_music = []
-    
-    for musician in solo_musicians:
-        musician["provider_type"] = "solo"
-        all_music.append(musician)
-    
-    for band in bands:
-        band["provider_type"] = "band"
-        all_music.append(band)
-    
-    # Apply genre filter
-    if genre:
-        genre_lower = genre.lower()
-        all_music = [
-            m for m in all_music
-            if m.get("genres") and any(
-                genre_lower in (g or "").lower() 
-                for g in (m.get("genres") if isinstance(m.get("genres"), list) else [m.get("genres")])
-            )
-        ]
-    
-    # Apply budget filter
-    if max_budget_lkr:
-        all_music = [
-            m for m in all_music
-            if (m.get("standard_rate_lkr") or 0) <= max_budget_lkr
-        ]
-    
-    # Sort by rate (cheaper first) then by experience
-    all_music.sort(
-        key=lambda m: (
-            m.get("standard_rate_lkr") or 999999,
-            -(len(m.get("experience") or "") if isinstance(m.get("experience"), str) else 0)
-        )
+    # Genre/text matches come from the search index; budget and ordering run in Mongo
+    return await _fetch_page(
+        "music", "music providers", response, city, limit, cursor,
+        genre=genre, max_budget_lkr=max_budget_lkr, q=q,
     )
-    
-    return all_music[:limit]
 
 
 @router.get("/lighting", response_model=List[LightingProvider], summary="Get lighting designers")
-def get_lighting_providers(
+async def get_lighting_providers(
+    response: Response,
     city: Optional[str] = Query(None, description="Filter by city"),
     max_budget_lkr: Optional[int] = Query(None, description="Maximum budget in LKR"),
     min_crew_size: Optional[int] = Query(None, description="Minimum crew size"),
-    limit: int = Query(12, ge=1, le=50, description="Maximum number of results")
+    service: Optional[str] = Query(None, description="Filter by service, fuzzy (e.g., 'LED', 'recording')"),
+    q: Optional[str] = Query(None, description=SEARCH_DESCRIPTION),
+    limit: int = Query(12, ge=1, le=50, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """
     Fetch lighting designers from MongoDB users collection.
@@ -244,38 +231,22 @@ def get_lighting_providers(
     }
     ```
     """
-    providers = list_lighting(city=city, limit=limit)
-    
-    # Fallback: if city filter returns no results, try without city filter
-    if city and len(providers) == 0:
-        logger.warning(f"No lighting providers found for city '{city}', fetching all as fallback")
-        providers = list_lighting(city=None, limit=limit)
-    
-    # Apply filters
-    if max_budget_lkr:
-        providers = [
-            p for p in providers
-            if (p.get("standard_rate_lkr") or 0) <= max_budget_lkr
-        ]
-    
-    if min_crew_size:
-        providers = [
-            p for p in providers
-            if (p.get("crew_size") or 0) >= min_crew_size
-        ]
-    
-    # Sort by rate
-    providers.sort(key=lambda p: p.get("standard_rate_lkr") or 999999)
-    
-    return providers
+    return await _fetch_page(
+        "lights", "lighting providers", response, city, limit, cursor,
+        max_budget_lkr=max_budget_lkr, min_crew_size=min_crew_size, service=service, q=q,
+    )
 
 
 @router.get("/sound", response_model=List[SoundProvider], summary="Get sound engineers")
-def get_sound_providers(
+async def get_sound_providers(
+    response: Response,
     city: Optional[str] = Query(None, description="Filter by city"),
     max_budget_lkr: Optional[int] = Query(None, description="Maximum budget in LKR"),
     min_crew_size: Optional[int] = Query(None, description="Minimum crew size"),
-    limit: int = Query(12, ge=1, le=50, description="Maximum number of results")
+    service: Optional[str] = Query(None, description="Filter by service, fuzzy (e.g., 'LED', 'recording')"),
+    q: Optional[str] = Query(None, description=SEARCH_DESCRIPTION),
+    limit: int = Query(12, ge=1, le=50, description="Maximum number of results"),
+    cursor: Optional[str] = Query(None, description=CURSOR_DESCRIPTION),
 ):
     """
     Fetch sound engineers from MongoDB users collection.
@@ -291,27 +262,23 @@ def get_sound_providers(
     }
     ```
     """
-    providers = list_sound_specialists(city=city, limit=limit)
-    
-    # Fallback: if city filter returns no results, try without city filter
-    if city and len(providers) == 0:
-        logger.warning(f"No sound providers found for city '{city}', fetching all as fallback")
-        providers = list_sound_specialists(city=None, limit=limit)
-    
-    # Apply filters
-    if max_budget_lkr:
-        providers = [
-            p for p in providers
-            if (p.get("standard_rate_lkr") or 0) <= max_budget_lkr
-        ]
-    
-    if min_crew_size:
-        providers = [
-            p for p in providers
-            if (p.get("crew_size") or 0) >= min_crew_size
-        ]
-    
-    # Sort by rate
-    providers.sort(key=lambda p: p.get("standard_rate_lkr") or 999999)
-    
-    return providers
+    return await _fetch_page(
+        "sound_specialist", "sound providers", response, city, limit, cursor,
+        max_budget_lkr=max_budget_lkr, min_crew_size=min_crew_size, service=service, q=q,
+    )
+
+
+@router.get("/cache/stats", summary="Provider catalog cache counters")
+async def get_provider_cache_stats():
+    """Hit/miss/eviction counters for the shared provider catalog cache."""
+    return provider_cache_stats()
+
+
+@router.get("/mongo/stats", summary="Mongo command latency and connection pool counters")
+async def get_mongo_stats():
+    """Per-collection command latency plus pool checkout counts and wait times.
+
+    A growing ``waiting`` count or ``wait.p95_ms`` means queries are queuing
+    for connections; raise ``MONGO_MAX_POOL_SIZE`` or reduce concurrency.
+    """
+    return mongo_metrics()
@@ -1,8 +1,9 @@
 # backend-py/routers/venues.py
-from fastapi import APIRouter, Depends, Query
+from fastapi import APIRouter, Depends, HTTPException, Query
 from pydantic import BaseModel
 from typing import List, Optional
 from agents.venue_finder import find_venues
+from utils.geo import DEFAULT_RADIUS_KM, UnknownLocation
 from dependencies.api_key import require_planner_api_key
 
 router = APIRouter(
@@ -27,6 +28,11 @@ class VenueOut(BaseModel):
 def suggest_venues(
     city: str = Query(..., description="City name, e.g., Colombo"),
     event_type: str = Query("musical", description="Event type. Defaults to musical."),
-    top_k: int = Query(7, ge=1, le=12)
+    top_k: int = Query(7, ge=1, le=12),
+    near: Optional[str] = Query(None, description="Search around 'lat,lon' or a town name instead of matching the city text"),
+    radius_km: float = Query(DEFAULT_RADIUS_KM, gt=0, le=500, description="Search radius for `near`, in km"),
 ):
-    return find_venues(city=city, event_type=event_type, top_k=top_k)
+    try:
+        return find_venues(city=city, event_type=event_type, top_k=top_k, near=near, radius_km=radius_km)
+    except UnknownLocation as exc:
+        raise HTTPException(status_code=400, detail=str(exc))
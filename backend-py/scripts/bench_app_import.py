@@ -0,0 +1,89 @@
+"""Benchmark FastAPI app import time and check it does no network I/O.
+
+Each run imports ``main`` in a fresh interpreter with an audit hook that
+records every socket connect and DNS lookup made while the import runs. By
+default ``MONGO_URI`` points at an unroutable address, so any import-time
+Mongo query would show up both as a connect attempt and as a stall of up
+to the server selection timeout.
+
+Usage:
+    python scripts/bench_app_import.py --runs 5
+    MONGO_URI=mongodb://localhost:27017 python scripts/bench_app_import.py --keep-env
+"""
+
+from __future__ import annotations
+
+import argparse
+import json
+import os
+import statistics
+import subprocess
+import sys
+from pathlib import Path
+
+BACKEND_ROOT = Path(__file__).resolve().parent.parent
+# Non-routable (TEST-NET-1): connecting would hang until the selection timeout.
+BLACKHOLE_URI = "mongodb://192.0.2.1:27017/?serverSelectionTimeoutMS=5000&connectTimeoutMS=5000"
+
+_CHILD = r"""
+import json, sys, time
+events = []
+watching = True
+
+def hook(event, args):
+    if watching and event in ("socket.connect", "socket.getaddrinfo"):
+        events.append([event, repr(args[1] if event == "socket.connect" else args[:2])])
+
+sys.addaudithook(hook)
+start = time.perf_counter()
+import main  # noqa: F401
+elapsed = time.perf_counter() - start
+watching = False
+print(json.dumps({"seconds": elapsed, "network": events}))
+"""
+
+
+def _run_once(env: dict) -> dict:
+    result = subprocess.run(
+        [sys.executable, "-c", _CHILD],
+        cwd=BACKEND_ROOT,
+        env=env,
+        capture_output=True,
+        text=True,
+        check=True,
+    )
+    return json.loads(result.stdout.strip().splitlines()[-1])
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--runs", type=int, default=5)
+    parser.add_argument(
+        "--keep-env",
+        action="store_true",
+        help="use the current MONGO_URI/USE_AI_CONCEPTS instead of the unroutable defaults",
+    )
+    args = parser.parse_args()
+
+    env = dict(os.environ)
+    if not args.keep_env:
+        env["MONGO_URI"] = BLACKHOLE_URI
+        env["USE_AI_CONCEPTS"] = "1"
+
+    runs = [_run_once(env) for _ in range(max(args.runs, 1))]
+    seconds = [run["seconds"] for run in runs]
+    network = [event for run in runs for event in run["network"]]
+
+    print(f"import main: median {statistics.median(seconds) * 1000:.0f} ms, max {max(seconds) * 1000:.0f} ms "
+          f"over {len(runs)} run(s)")
+    if network:
+        print(f"network I/O during import ({len(network)} event(s)):")
+        for event, target in network[:20]:
+            print(f"  {event} {target}")
+        return 1
+    print("network I/O during import: none")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
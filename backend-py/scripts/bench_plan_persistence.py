@@ -0,0 +1,133 @@
+"""Benchmark ORM ``db.add`` vs Core executemany for generated plan rows.
+
+Each simulated ``generate_plans`` request writes ``--concepts`` plans with
+four cost lines and seven milestones each, then commits. The ORM path adds
+one mapped object per row (the previous router code); the bulk path uses
+:func:`planner.persistence.insert_plan_rows`. Tables are created in a
+scratch database: a temporary SQLite file, plus Postgres when a URL is given.
+
+Usage:
+    python scripts/bench_plan_persistence.py --requests 200
+    python scripts/bench_plan_persistence.py --postgres-url postgresql+psycopg://user:pw@localhost/bench
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import statistics
+import sys
+import tempfile
+import time
+from pathlib import Path
+from typing import Callable, List, Optional
+
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from sqlalchemy import create_engine
+from sqlalchemy.orm import Session, sessionmaker
+
+from config.database import Base
+from models.campaign import Campaign
+from models.event_planner import EventPlan, PlanCost, PlanTimeline
+from planner.persistence import PlanRows, insert_plan_rows
+from planner.service import uuid
+
+COSTS = [("venue", 600_000), ("music", 450_000), ("lighting", 200_000), ("sound", 150_000)]
+TIMELINE = [
+    (-45, "Book venue"),
+    (-30, "Vendor shortlist & RFPs"),
+    (-21, "Confirm venue & core vendors"),
+    (-14, "Lock menu & décor plan"),
+    (-7, "Final run sheet + contact list"),
+    (-1, "Setup & checks"),
+    (0, "Event day"),
+]
+
+
+def _orm_request(db: Session, campaign_id: str, concepts: int) -> None:
+    for index in range(concepts):
+        plan_id = uuid()
+        db.add(
+            EventPlan(
+                id=plan_id,
+                campaign_id=campaign_id,
+                concept_key=f"c{index}",
+                concept_title=f"Concept {index}",
+                assumptions="a|b|c",
+                total_lkr=sum(amount for _, amount in COSTS),
+                budget_profile=f"Concept {index}",
+            )
+        )
+        for category, amount in COSTS:
+            db.add(PlanCost(id=uuid(), event_plan_id=plan_id, category=category, amount_lkr=amount))
+        for offset, label in TIMELINE:
+            db.add(PlanTimeline(id=uuid(), event_plan_id=plan_id, offset_days=offset, milestone=label))
+    db.commit()
+
+
+def _bulk_request(db: Session, campaign_id: str, concepts: int) -> None:
+    rows = PlanRows()
+    for index in range(concepts):
+        rows.add_plan(
+            campaign_id=campaign_id,
+            concept_key=f"c{index}",
+            concept_title=f"Concept {index}",
+            assumptions=["a", "b", "c"],
+            costs=COSTS,
+            timeline=TIMELINE,
+            budget_profile=f"Concept {index}",
+        )
+    insert_plan_rows(db, rows)
+    db.commit()
+
+
+def _time(factory: sessionmaker, write: Callable[[Session, str, int], None], requests: int, concepts: int) -> List[float]:
+    with factory() as db:
+        campaign_id = uuid()
+        db.add(Campaign(id=campaign_id, name="bench"))
+        db.commit()
+        samples = []
+        for _ in range(requests):
+            start = time.perf_counter()
+            write(db, campaign_id, concepts)
+            samples.append((time.perf_counter() - start) * 1000)
+            db.expunge_all()
+    return samples
+
+
+def _bench(label: str, url: str, requests: int, concepts: int) -> None:
+    engine = create_engine(url)
+    Base.metadata.drop_all(engine, tables=[EventPlan.__table__, PlanCost.__table__, PlanTimeline.__table__])
+    Base.metadata.create_all(engine, tables=[Campaign.__table__, EventPlan.__table__, PlanCost.__table__,
+                                             PlanTimeline.__table__])
+    factory = sessionmaker(bind=engine, autoflush=False)
+    rows = concepts * (1 + len(COSTS) + len(TIMELINE))
+    print(f"{label}: {requests} request(s) x {concepts} concept(s) = {rows} rows/request")
+    for name, write in (("orm add", _orm_request), ("core executemany", _bulk_request)):
+        _time(factory, write, min(requests, 5), concepts)  # warm-up
+        samples = _time(factory, write, requests, concepts)
+        print(f"  {name:<17} median {statistics.median(samples):7.2f} ms  p95 "
+              f"{sorted(samples)[int(0.95 * (len(samples) - 1))]:7.2f} ms")
+    engine.dispose()
+
+
+def main() -> int:
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--requests", type=int, default=200)
+    parser.add_argument("--concepts", type=int, default=4)
+    parser.add_argument("--postgres-url", default=os.getenv("BENCH_POSTGRES_URL"))
+    args = parser.parse_args()
+
+    with tempfile.TemporaryDirectory() as scratch:
+        _bench("sqlite", f"sqlite:///{scratch}/bench.db", args.requests, args.concepts)
+    postgres_url: Optional[str] = args.postgres_url
+    if postgres_url:
+        _bench("postgres", postgres_url, args.requests, args.concepts)
+    else:
+        print("postgres: skipped (pass --postgres-url or set BENCH_POSTGRES_URL)")
+    return 0
+
+
+if __name__ == "__main__":
+    sys.exit(main())
@@ -0,0 +1,113 @@
+"""Benchmark regex scans vs. normalised-key index lookups for provider queries.
+
+Builds a synthetic users collection (100k documents by default) in a scratch
+database, then times, for every provider role, the legacy case-insensitive
+``$regex`` filter, the exact-match ``role_key``/``city_key`` filter and the
+``role_filter`` the repository actually sends (the keyed branch ``$or`` the
+regex branch for documents without ``role_key``). Each query uses the ``_id``
+order and limit of the users fallback. Also prints the winning plan stage and
+documents examined from ``explain()``.
+
+Usage:
+    MONGO_URI=mongodb://localhost:27017 python scripts/bench_provider_lookup.py --docs 100000
+"""
+
+from __future__ import annotations
+
+import argparse
+import os
+import random
+import statistics
+import sys
+import time
+from pathlib import Path
+
+# Add parent to sys.path so we can import utils
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from pymongo import MongoClient
+
+from utils.provider_keys import ensure_key_index, key_filter, provider_keys
+from utils.provider_records import ROLE_ALIASES
+from utils.provider_queries import regex_filter, role_filter
+
+ROLES = ["venue", "musician", "music_band", "lights", "sounds", "user"]
+CITIES = ["Colombo", "Colombo 07", "Kandy", "Galle", "Negombo", "Jaffna", "Hambantota", "Matara"]
+QUERY_ROLES = ["venue", "solo_musician", "music_ensemble", "lights", "sound_specialist"]
+
+
+def _synthetic_users(count: int):
+    rng = random.Random(42)
+    for i in range(count):
+        city = rng.choice(CITIES)
+        doc = {
+            "role": rng.choice(ROLES),
+            "name": f"Provider {i}",
+            "city": city,
+            "address": f"{rng.randint(1, 400)} Main Street, {city}",
+            "standardRate": rng.randint(20_000, 900_000),
+        }
+        doc.update(provider_keys(doc))
+        yield doc
+
+
+def _time_query(collection, query, limit: int, repeats: int) -> float:
+    samples = []
+    for _ in range(repeats):
+        start = time.perf_counter()
+        list(collection.find(query).sort("_id", 1).limit(limit))
+        samples.append((time.perf_counter() - start) * 1000)
+    return statistics.median(samples)
+
+
+def _plan_summary(collection, query, limit: int) -> str:
+    explain = collection.find(query).sort("_id", 1).limit(limit).explain()
+    stats = explain.get("executionStats", {})
+    stage = explain.get("queryPlanner", {}).get("winningPlan", {})
+    while "inputStage" in stage:
+        stage = stage["inputStage"]
+    return f"{stage.get('stage')} docsExamined={stats.get('totalDocsExamined')}"
+
+
+def main() -> None:
+    parser = argparse.ArgumentParser(description="Provider lookup benchmark")
+    parser.add_argument("--docs", type=int, default=100_000)
+    parser.add_argument("--limit", type=int, default=20)
+    parser.add_argument("--repeats", type=int, default=15)
+    parser.add_argument("--database", default="provider_lookup_bench")
+    args = parser.parse_args()
+
+    uri = os.getenv("MONGO_URI", "mongodb://localhost:27017")
+    client = MongoClient(uri)
+    collection = client[args.database]["users"]
+    collection.drop()
+
+    print(f"Seeding {args.docs:,} synthetic users ...")
+    batch = []
+    for doc in _synthetic_users(args.docs):
+        batch.append(doc)
+        if len(batch) == 5_000:
+            collection.insert_many(batch)
+            batch = []
+    if batch:
+        collection.insert_many(batch)
+    # Also marks the key index ready, so role_filter builds its keyed form.
+    ensure_key_index(collection)
+
+    print(f"{'role':<18}{'city':<12}{'regex ms':>10}{'index ms':>10}{'shipped ms':>12}   plans")
+    for role in QUERY_ROLES:
+        for city in (None, "Kandy", "Colombo 07"):
+            queries = (regex_filter(role, city), key_filter(ROLE_ALIASES[role], city), role_filter(role, city))
+            timings = "".join(
+                f"{_time_query(collection, query, args.limit, args.repeats):>{width}.2f}"
+                for query, width in zip(queries, (10, 10, 12))
+            )
+            plans = " | ".join(_plan_summary(collection, query, args.limit) for query in queries)
+            print(f"{role:<18}{str(city):<12}{timings}   {plans}")
+
+    collection.drop()
+    client.close()
+
+
+if __name__ == "__main__":
+    main()
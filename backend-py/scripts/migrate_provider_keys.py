@@ -0,0 +1,43 @@
+"""Backfill normalised provider lookup keys on the Mongo users collection.
+
+Writes ``role_key`` and ``city_key`` onto every user document and creates the
+``role_key_1_city_key_1`` compound index. Once the index exists the provider
+repository switches from case-insensitive ``$regex`` scans to exact-match
+indexed queries. Safe to re-run: only documents whose keys changed are written.
+"""
+
+from __future__ import annotations
+
+import argparse
+import logging
+import sys
+from pathlib import Path
+
+# Add parent to sys.path so we can import utils
+sys.path.insert(0, str(Path(__file__).resolve().parent.parent))
+
+from dotenv import load_dotenv
+
+from utils.mongo_client import get_users_collection, mongo_available
+from utils.provider_keys import migrate_provider_keys
+
+logging.basicConfig(level=logging.INFO, format="%(message)s")
+logger = logging.getLogger(__name__)
+
+
+def main() -> None:
+    load_dotenv()
+    parser = argparse.ArgumentParser(description=__doc__.splitlines()[0])
+    parser.add_argument("--batch-size", type=int, default=500, help="Documents per bulk write")
+    args = parser.parse_args()
+
+    if not mongo_available():
+        logger.error("Mongo is not configured; set MONGO_URI/MONGO_DB_NAME.")
+        sys.exit(1)
+
+    updated = migrate_provider_keys(get_users_collection(), batch_size=args.batch_size)
+    logger.info("Provider keys written on %s document(s); index ready.", updated)
+
+
+if __name__ == "__main__":
+    main()
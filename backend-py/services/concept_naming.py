@@ -2,11 +2,16 @@
 
 from __future__ import annotations
 
+import asyncio
 import json
 import logging
 import os
+import threading
+from concurrent.futures import ThreadPoolExecutor
 from dataclasses import dataclass
-from typing import Any, Dict, Optional
+from typing import Any, Callable, Dict, List, Optional, Sequence
+
+from utils.env import env_float, env_int
 
 try:  # The OpenAI SDK is optional in some deployments
     from openai import OpenAI, APIError  # type: ignore
@@ -18,6 +23,29 @@ logger = logging.getLogger(__name__)
 
 
 _DEFAULT_MODEL = "gpt-4o-mini"
+_DEFAULT_MAX_WORKERS = 4
+_DEFAULT_TIMEOUT_SECONDS = 8.0
+# Same per-concept budget as the single-call path; truncated JSON would drop the whole batch.
+_BATCH_TOKENS_PER_CONCEPT = 120
+
+_EXECUTOR: Optional[ThreadPoolExecutor] = None
+_EXECUTOR_LOCK = threading.Lock()
+
+
+def naming_timeout() -> float:
+    """Per-call budget for one identity request (``CONCEPT_NAMING_TIMEOUT_SECONDS``)."""
+
+    return env_float("CONCEPT_NAMING_TIMEOUT_SECONDS", _DEFAULT_TIMEOUT_SECONDS)
+
+
+def _executor() -> ThreadPoolExecutor:
+    # Dedicated and bounded so slow naming calls cannot starve the request threadpool.
+    global _EXECUTOR
+    with _EXECUTOR_LOCK:
+        if _EXECUTOR is None:
+            workers = max(env_int("CONCEPT_NAMING_MAX_WORKERS", _DEFAULT_MAX_WORKERS), 1)
+            _EXECUTOR = ThreadPoolExecutor(max_workers=workers, thread_name_prefix="concept-naming")
+        return _EXECUTOR
 
 
 def _client() -> Optional[OpenAI]:
@@ -38,7 +66,7 @@ class ConceptIdentity:
     source: str = "fallback"
 
 
-def _default_identity(fallback_title: str, fallback_tagline: Optional[str]) -> ConceptIdentity:
+def fallback_identity(fallback_title: str, fallback_tagline: Optional[str]) -> ConceptIdentity:
     return ConceptIdentity(
         title=fallback_title,
         tagline=fallback_tagline or "Custom event experience",
@@ -46,6 +74,35 @@ def _default_identity(fallback_title: str, fallback_tagline: Optional[str]) -> C
     )
 
 
+def _event_brief(event: Dict[str, Any], concept: Dict[str, Any], budget_lkr: int, attendees: int) -> Dict[str, Any]:
+    return {
+        "event_name": event.get("name") or event.get("event_name"),
+        "venue": event.get("venue"),
+        "city": event.get("city") or concept.get("city") or "Colombo",
+        "date": str(event.get("date")),
+        "attendees": attendees,
+        "budget_lkr": budget_lkr,
+    }
+
+
+def _concept_brief(concept: Dict[str, Any], fallback_title: str, fallback_tagline: Optional[str]) -> Dict[str, Any]:
+    return {
+        "title": fallback_title,
+        "tagline": fallback_tagline,
+        "venue_preference": concept.get("venue_preference"),
+        "music_focus": concept.get("music_focus"),
+        "lighting_style": concept.get("lighting_style"),
+        "sound_profile": concept.get("sound_profile"),
+        "experience_notes": concept.get("experience_notes"),
+    }
+
+
+def batch_naming_enabled() -> bool:
+    """Whether plans are named with one batched request (``CONCEPT_NAMING_BATCH=1``)."""
+
+    return os.getenv("CONCEPT_NAMING_BATCH", "0").strip().lower() in {"1", "true", "yes", "on"}
+
+
 def generate_concept_identity(
     *,
     event: Dict[str, Any],
@@ -54,12 +111,16 @@ def generate_concept_identity(
     attendees: int,
     fallback_title: str,
     fallback_tagline: Optional[str],
+    timeout: Optional[float] = None,
 ) -> ConceptIdentity:
-    """Return a concept title/tagline, using OpenAI when available."""
+    """Return a concept title/tagline, using OpenAI when available.
+
+    ``timeout`` (seconds) bounds the OpenAI request; on expiry the fallback is returned.
+    """
 
     client = _client()
     if client is None:
-        return _default_identity(fallback_title, fallback_tagline)
+        return fallback_identity(fallback_title, fallback_tagline)
 
     model = os.getenv("OPENAI_CONCEPT_MODEL", _DEFAULT_MODEL)
 
@@ -68,26 +129,10 @@ def generate_concept_identity(
         "Respond with strictly formatted JSON containing `title` and `tagline`."
     )
 
-    city = event.get("city") or concept.get("city") or "Colombo"
-    mood = concept.get("lighting_style") or concept.get("music_focus")
-
     user_payload = {
-        "event_name": event.get("name") or event.get("event_name"),
-        "venue": event.get("venue"),
-        "city": city,
-        "date": str(event.get("date")),
-        "attendees": attendees,
-        "budget_lkr": budget_lkr,
-        "concept": {
-            "title": fallback_title,
-            "tagline": fallback_tagline,
-            "venue_preference": concept.get("venue_preference"),
-            "music_focus": concept.get("music_focus"),
-            "lighting_style": concept.get("lighting_style"),
-            "sound_profile": concept.get("sound_profile"),
-            "experience_notes": concept.get("experience_notes"),
-        },
-        "mood_hint": mood,
+        **_event_brief(event, concept, budget_lkr, attendees),
+        "concept": _concept_brief(concept, fallback_title, fallback_tagline),
+        "mood_hint": concept.get("lighting_style") or concept.get("music_focus"),
     }
 
     prompt = (
@@ -107,22 +152,172 @@ def generate_concept_identity(
             temperature=0.8,
             max_tokens=120,
             response_format={"type": "json_object"},
+            **({"timeout": timeout} if timeout else {}),
         )
     except APIError as exc:  # pragma: no cover - network failure path
         logger.warning("OpenAI concept identity generation failed: %s", exc)
-        return _default_identity(fallback_title, fallback_tagline)
+        return fallback_identity(fallback_title, fallback_tagline)
     except Exception as exc:  # pragma: no cover - broad guard for reliability
         logger.warning("Unexpected OpenAI error: %s", exc)
-        return _default_identity(fallback_title, fallback_tagline)
+        return fallback_identity(fallback_title, fallback_tagline)
 
     try:
         content = response.choices[0].message.content
         parsed = json.loads(content)
     except Exception as exc:  # pragma: no cover - parsing guard
         logger.warning("Failed to parse OpenAI concept identity payload: %s", exc)
-        return _default_identity(fallback_title, fallback_tagline)
+        return fallback_identity(fallback_title, fallback_tagline)
 
     title = parsed.get("title") or fallback_title
     tagline = parsed.get("tagline") or fallback_tagline or "Custom event experience"
 
     return ConceptIdentity(title=title.strip(), tagline=tagline.strip(), source="openai")
+
+
+async def gather_identities(
+    calls: Sequence[Callable[[], ConceptIdentity]],
+    fallbacks: Sequence[ConceptIdentity],
+    timeout: Optional[float] = None,
+) -> List[ConceptIdentity]:
+    """Run identity ``calls`` concurrently on the naming pool, in order.
+
+    Each call gets ``timeout`` seconds (default :func:`naming_timeout`); a call
+    that times out or fails yields its own entry from ``fallbacks`` without
+    affecting the others. A timed-out call keeps its worker until the OpenAI
+    request (bounded by the same timeout) returns.
+    """
+
+    loop = asyncio.get_running_loop()
+    budget = naming_timeout() if timeout is None else timeout
+
+    async def _one(call: Callable[[], ConceptIdentity], fallback: ConceptIdentity) -> ConceptIdentity:
+        try:
+            return await asyncio.wait_for(loop.run_in_executor(_executor(), call), budget)
+        except asyncio.TimeoutError:
+            logger.warning("Concept identity generation timed out after %.1fs; using fallback", budget)
+        except Exception as exc:  # generate_concept_identity guards OpenAI errors; this catches the rest
+            logger.warning("Concept identity generation failed: %s", exc)
+        return fallback
+
+    return list(await asyncio.gather(*(_one(call, fallback) for call, fallback in zip(calls, fallbacks))))
+
+
+def _batch_identities(
+    items: Any, fallbacks: Sequence[ConceptIdentity]
+) -> List[ConceptIdentity]:
+    """Match batch results to concepts by ``index``, falling back per missing, blank or repeated title."""
+
+    by_index: Dict[int, Dict[str, Any]] = {}
+    if isinstance(items, list):
+        for position, item in enumerate(items):
+            if not isinstance(item, dict):
+                continue
+            index = item.get("index", position)
+            if isinstance(index, int) and 0 <= index < len(fallbacks) and index not in by_index:
+                by_index[index] = item
+
+    identities: List[ConceptIdentity] = []
+    seen = set()
+    for index, fallback in enumerate(fallbacks):
+        item = by_index.get(index, {})
+        title = item.get("title") if isinstance(item.get("title"), str) else ""
+        tagline = item.get("tagline") if isinstance(item.get("tagline"), str) else ""
+        if title.strip() and title.strip().lower() not in seen:
+            identity = ConceptIdentity(title.strip(), tagline.strip() or fallback.tagline, "openai")
+        else:
+            identity = _distinct_fallback(fallback, seen)
+        seen.add(identity.title.lower())
+        identities.append(identity)
+    return identities
+
+
+def _distinct_fallback(fallback: ConceptIdentity, seen: set) -> ConceptIdentity:
+    """``fallback``, numbered ("Title 2", "Title 3", ...) when an earlier concept already took its title."""
+
+    title, number = fallback.title, 1
+    while title.lower() in seen:
+        number += 1
+        title = f"{fallback.title} {number}"
+    return fallback if title == fallback.title else ConceptIdentity(title, fallback.tagline, fallback.source)
+
+
+def generate_concept_identities(
+    *,
+    event: Dict[str, Any],
+    concepts: Sequence[Dict[str, Any]],
+    budget_lkr: int,
+    attendees: int,
+    fallbacks: Sequence[ConceptIdentity],
+    timeout: Optional[float] = None,
+) -> List[ConceptIdentity]:
+    """Name every concept of a plan with one OpenAI request, in order.
+
+    The model sees all concepts at once, so it can keep the titles distinct;
+    a title that is missing, blank or repeats an earlier one falls back to
+    that concept's entry in ``fallbacks``. Any request or parsing failure
+    returns ``fallbacks`` unchanged.
+    """
+
+    fallbacks = list(fallbacks)
+    if not concepts:
+        return []
+    client = _client()
+    if client is None:
+        return fallbacks
+
+    model = os.getenv("OPENAI_CONCEPT_MODEL", _DEFAULT_MODEL)
+
+    system_prompt = (
+        "You are an award-winning event creative director. "
+        "Respond with strictly formatted JSON containing a `concepts` array."
+    )
+
+    user_payload = {
+        **_event_brief(event, concepts[0], budget_lkr, attendees),
+        "concepts": [
+            {"index": index, **_concept_brief(concept, fallback.title, fallback.tagline)}
+            for index, (concept, fallback) in enumerate(zip(concepts, fallbacks))
+        ],
+    }
+
+    prompt = (
+        f"Generate a fresh, market-ready identity for each of the {len(concepts)} concepts of this musical event.\n"
+        "Return JSON {\"concepts\": [{\"index\", \"title\" (4-6 words), \"tagline\" (10-14 words)}]} "
+        "with one entry per concept index.\n"
+        "Keep each specific to the city and its vibe; no two titles may be the same or near-duplicates."
+    )
+
+    try:
+        response = client.chat.completions.create(
+            model=model,
+            messages=[
+                {"role": "system", "content": system_prompt},
+                {"role": "user", "content": json.dumps(user_payload)},
+                {"role": "user", "content": prompt},
+            ],
+            temperature=0.8,
+            max_tokens=_BATCH_TOKENS_PER_CONCEPT * len(concepts) + 40,
+            response_format={"type": "json_object"},
+            **({"timeout": timeout} if timeout else {}),
+        )
+    except APIError as exc:  # pragma: no cover - network failure path
+        logger.warning("OpenAI batch concept identity generation failed: %s", exc)
+        return fallbacks
+    except Exception as exc:  # pragma: no cover - broad guard for reliability
+        logger.warning("Unexpected OpenAI error: %s", exc)
+        return fallbacks
+
+    try:
+        parsed = json.loads(response.choices[0].message.content)
+        items = parsed.get("concepts")
+    except Exception as exc:
+        logger.warning("Failed to parse OpenAI batch concept identity payload: %s", exc)
+        return fallbacks
+
+    if not isinstance(items, list) or len(items) != len(concepts):
+        logger.warning(
+            "OpenAI returned %s identities for %s concepts; filling the rest with fallbacks",
+            len(items) if isinstance(items, list) else 0,
+            len(concepts),
+        )
+    return _batch_identities(items, fallbacks)
@@ -0,0 +1,58 @@
+"""Shared fixtures for API tests that need a database."""
+
+from __future__ import annotations
+
+import os
+import pathlib
+import sys
+import tempfile
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+# Importing ``main`` creates tables and indexes; keep that off the checked-in planner.db.
+os.environ.setdefault("DATABASE_URL", f"sqlite:///{tempfile.mkdtemp(prefix='planner-tests-')}/planner.db")
+
+
+@pytest.fixture
+def planner_db(tmp_path):
+    """Session factory for a throwaway SQLite database that the app's ``get_db`` yields from."""
+
+    from sqlalchemy import create_engine
+    from sqlalchemy.orm import sessionmaker
+
+    from config.database import Base, get_db
+    from main import app
+
+    engine = create_engine(f"sqlite:///{tmp_path / 'planner.db'}", connect_args={"check_same_thread": False})
+    Base.metadata.create_all(bind=engine)
+    factory = sessionmaker(autocommit=False, autoflush=False, bind=engine)
+
+    def override_get_db():
+        db = factory()
+        try:
+            yield db
+        finally:
+            db.close()
+
+    app.dependency_overrides[get_db] = override_get_db
+    yield factory
+    app.dependency_overrides.pop(get_db, None)
+    engine.dispose()
+
+
+@pytest.fixture
+def planner_client(planner_db):
+    """API-keyed test client backed by :func:`planner_db`."""
+
+    os.environ.setdefault("PLANNER_API_KEY", "test-planner-key")
+    from fastapi.testclient import TestClient
+
+    from main import app
+
+    client = TestClient(app)
+    client.headers.update({"X-API-Key": os.environ["PLANNER_API_KEY"]})
+    return client
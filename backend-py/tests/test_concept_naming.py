@@ -0,0 +1,135 @@
+"""Concurrent concept naming: fan-out, per-call timeouts and fallbacks."""
+
+from __future__ import annotations
+
+import asyncio
+import json
+import pathlib
+import sys
+import time
+from types import SimpleNamespace
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from services import concept_naming  # noqa: E402
+from services.concept_naming import (  # noqa: E402
+    ConceptIdentity,
+    fallback_identity,
+    gather_identities,
+    generate_concept_identities,
+)
+
+
+def _slow(title: str, seconds: float):
+    def call() -> ConceptIdentity:
+        time.sleep(seconds)
+        return ConceptIdentity(title, f"{title} tagline", "openai")
+
+    return call
+
+
+def test_calls_run_concurrently_and_keep_their_order() -> None:
+    titles = ["One", "Two", "Three"]
+    start = time.perf_counter()
+    identities = asyncio.run(
+        gather_identities([_slow(t, 0.2) for t in titles], [fallback_identity(t, None) for t in titles], timeout=2)
+    )
+    elapsed = time.perf_counter() - start
+
+    assert [identity.title for identity in identities] == titles
+    assert all(identity.source == "openai" for identity in identities)
+    assert elapsed < 0.5, f"naming ran serially ({elapsed:.2f}s)"
+
+
+def test_a_slow_call_falls_back_without_holding_up_the_others() -> None:
+    def broken() -> ConceptIdentity:
+        raise RuntimeError("boom")
+
+    identities = asyncio.run(
+        gather_identities(
+            [_slow("Fast", 0.01), _slow("Slow", 1.0), broken],
+            [fallback_identity(t, "Fallback tagline") for t in ("Fast", "Slow", "Broken")],
+            timeout=0.2,
+        )
+    )
+
+    assert [(identity.title, identity.source) for identity in identities] == [
+        ("Fast", "openai"),
+        ("Slow", "fallback"),
+        ("Broken", "fallback"),
+    ]
+    assert identities[1].tagline == "Fallback tagline"
+
+
+class _FakeClient:
+    def __init__(self, payload):
+        self.requests = []
+        self.chat = SimpleNamespace(completions=SimpleNamespace(create=self._create))
+        self._payload = payload
+
+    def _create(self, **kwargs):
+        self.requests.append(kwargs)
+        content = json.dumps(self._payload)
+        return SimpleNamespace(choices=[SimpleNamespace(message=SimpleNamespace(content=content))])
+
+
+def _name_batch(monkeypatch, payload, titles=("Alpha", "Beta", "Gamma")):
+    client = _FakeClient(payload)
+    monkeypatch.setattr(concept_naming, "_client", lambda: client)
+    identities = generate_concept_identities(
+        event={"name": "Launch", "city": "Kandy"},
+        concepts=[{"music_focus": title} for title in titles],
+        budget_lkr=500_000,
+        attendees=120,
+        fallbacks=[fallback_identity(title, f"{title} fallback") for title in titles],
+    )
+    return client, identities
+
+
+def test_batch_names_every_concept_in_one_request(monkeypatch) -> None:
+    client, identities = _name_batch(
+        monkeypatch,
+        {"concepts": [{"index": i, "title": f"New {i}", "tagline": f"Line {i}"} for i in (2, 0, 1)]},
+    )
+
+    assert len(client.requests) == 1
+    sent = json.loads(client.requests[0]["messages"][1]["content"])
+    assert [concept["index"] for concept in sent["concepts"]] == [0, 1, 2]
+    assert [(identity.title, identity.tagline) for identity in identities] == [
+        ("New 0", "Line 0"),
+        ("New 1", "Line 1"),
+        ("New 2", "Line 2"),
+    ]
+
+
+def test_batch_falls_back_per_missing_or_repeated_title(monkeypatch) -> None:
+    _, identities = _name_batch(
+        monkeypatch,
+        {"concepts": [{"index": 0, "title": "Same Night"}, {"index": 1, "title": "same night", "tagline": "x"}]},
+    )
+
+    assert [(identity.title, identity.source) for identity in identities] == [
+        ("Same Night", "openai"),
+        ("Beta", "fallback"),
+        ("Gamma", "fallback"),
+    ]
+    assert identities[0].tagline == "Alpha fallback"
+
+
+def test_batch_returns_the_fallbacks_when_the_payload_is_unusable(monkeypatch) -> None:
+    _, identities = _name_batch(monkeypatch, {"titles": "nope"})
+    assert [identity.title for identity in identities] == ["Alpha", "Beta", "Gamma"]
+    assert all(identity.source == "fallback" for identity in identities)
+
+
+def test_batch_numbers_a_fallback_that_collides_with_an_earlier_title(monkeypatch) -> None:
+    client, identities = _name_batch(
+        monkeypatch,
+        {"concepts": [{"index": 0, "title": "Beta", "tagline": "First"}, {"index": 1, "title": "beta"}]},
+    )
+
+    assert [identity.title for identity in identities] == ["Beta", "Beta 2", "Gamma"]
+    assert len({identity.title.lower() for identity in identities}) == 3
+    assert client.requests[0]["max_tokens"] >= 120 * 3
@@ -0,0 +1,171 @@
+"""Background concept pool: claiming, refilling and retiring stale concepts."""
+
+from __future__ import annotations
+
+import importlib
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from agents.concept_generator import ConceptGenerationUnavailable  # noqa: E402
+from utils import concept_repository as repo  # noqa: E402
+from utils.concept_pool import READY, SERVED, STALE, ConceptPool, bucket_key  # noqa: E402
+
+
+def _matches(doc, query):
+    for field, cond in query.items():
+        value = doc.get(field)
+        if isinstance(cond, dict):
+            if "$gte" in cond and not value >= cond["$gte"]:
+                return False
+            if "$lt" in cond and not value < cond["$lt"]:
+                return False
+            if "$in" in cond and value not in cond["$in"]:
+                return False
+            if "$ne" in cond and value == cond["$ne"]:
+                return False
+        elif value != cond:
+            return False
+    return True
+
+
+class _Cursor(list):
+    def sort(self, field, direction):
+        # Like Mongo, a missing field sorts before any value.
+        ordered = sorted(self, key=lambda doc: (doc.get(field) is not None, doc.get(field) or 0))
+        return _Cursor(reversed(ordered) if direction < 0 else ordered)
+
+    def limit(self, count):
+        return _Cursor(self[:count])
+
+
+class _FakeConcepts:
+    def __init__(self):
+        self.docs = []
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def find(self, query):
+        return _Cursor(dict(doc) for doc in self.docs if _matches(doc, query))
+
+    def update_many(self, query, update):
+        for doc in self.docs:
+            if _matches(doc, query):
+                doc.update(update["$set"])
+
+    def delete_many(self, query):
+        self.docs = [doc for doc in self.docs if not _matches(doc, query)]
+
+    def count_documents(self, query):
+        return sum(1 for doc in self.docs if _matches(doc, query))
+
+    def update_one(self, query, update, upsert=False):
+        for doc in self.docs:
+            if _matches(doc, query):
+                doc.update(update["$set"])
+                return
+        self.docs.append({**query, **update["$set"]})
+
+
+@pytest.fixture
+def pool(monkeypatch):
+    monkeypatch.setenv("CONCEPT_POOL_SIZE", "2")
+    monkeypatch.delenv("CONCEPT_POOL_BUCKETS", raising=False)
+    collection = _FakeConcepts()
+    calls = []
+
+    def generate(city, vibe):
+        calls.append((city, vibe))
+        return {"concept_id": f"c{len(calls)}", "title": f"{city} #{len(calls)}", "updated_at": datetime.utcnow()}
+
+    pool = ConceptPool(lambda: collection, generate)
+    monkeypatch.setattr(pool, "ensure_started", lambda: False)
+    pool.collection, pool.calls = collection, calls
+    return pool
+
+
+def test_bucket_key_normalises_city_and_vibe() -> None:
+    assert bucket_key("12 Galle Road, Colombo 03", "Chill   Rooftop") == "colombo|chill rooftop"
+    assert bucket_key("Atlantis", None).startswith("atlantis|")
+
+
+def test_refill_fills_each_bucket_to_the_pool_size(pool) -> None:
+    assert pool.refill() == 2
+    assert pool.refill() == 0
+    pool.want("Kandy", "Chill rooftop")
+    assert pool.refill() == 2
+    assert {doc["pool_bucket"] for doc in pool.collection.docs} == {
+        bucket_key(None, None),
+        bucket_key("Kandy", "Chill rooftop"),
+    }
+    assert all(doc["pool_state"] == READY for doc in pool.collection.docs)
+
+
+def test_take_reuses_concepts_least_recently_served_first(pool) -> None:
+    pool.refill()
+    first = pool.take(None, None, 1)
+    second = pool.take(None, None, 1)
+    assert first[0]["concept_id"] != second[0]["concept_id"]
+    assert all(doc["pool_state"] == SERVED for doc in pool.collection.docs)
+
+    for _ in range(5):
+        assert {doc["concept_id"] for doc in pool.take(None, None, 2)} == {"c1", "c2"}
+    # Serving never consumes concepts, so traffic does not drive generation.
+    assert pool.refill() == 0
+    assert len(pool.calls) == 2
+
+
+def test_refill_retires_aged_concepts_and_deletes_them_after_retention(pool, monkeypatch) -> None:
+    pool.refill()
+    pool.take(None, None, 1)
+    pool.collection.docs[0]["updated_at"] = datetime.utcnow() - timedelta(days=2)
+    assert pool.refill() == 1
+    assert [doc["pool_state"] for doc in pool.collection.docs] == [STALE, READY, READY]
+
+    monkeypatch.setenv("CONCEPT_POOL_RETENTION_SECONDS", "0")
+    assert pool.refill() == 0
+    assert [doc["concept_id"] for doc in pool.collection.docs] == ["c2", "c3"]
+
+
+def test_refill_stops_a_bucket_when_generation_fails(pool) -> None:
+    def unavailable(city, vibe):
+        raise ConceptGenerationUnavailable("offline")
+
+    pool._generate = unavailable
+    assert pool.refill() == 0
+
+
+def test_list_concepts_reads_the_pool_and_never_generates_inline(monkeypatch) -> None:
+    monkeypatch.setenv("USE_AI_CONCEPTS", "1")
+    importlib.reload(repo)
+    try:
+        monkeypatch.setattr(repo, "_build_context", lambda context=None: {"city": "Colombo", "providers": {}})
+        monkeypatch.setattr(repo, "mongo_available", lambda: True)
+        monkeypatch.setattr(repo, "_load_from_mongo", lambda limit: [])
+
+        def unexpected_seed(context=None):
+            raise AssertionError("request path must not generate concepts")
+
+        monkeypatch.setattr(repo, "_seed_via_ai", unexpected_seed)
+        monkeypatch.setattr(repo._POOL, "take", lambda city, vibe, count: [])
+        warming = repo.list_concepts(limit=2)
+        assert len(warming) == 2
+        assert repo.ai_enabled(), "an empty pool must not switch AI mode off"
+
+        pooled = {"concept_id": "pool-1", "title": "Pooled", "updated_at": datetime.utcnow()}
+        monkeypatch.setattr(repo._POOL, "take", lambda city, vibe, count: [pooled])
+        assert [concept.concept_id for concept in repo.list_concepts(limit=1)] == ["pool-1"]
+
+        # The default concept is resolved on the request path too: no inline seeding either.
+        monkeypatch.setattr(repo._POOL, "request_refill", lambda: None)
+        assert repo.ensure_seed_concept().concept_id == "fallback-live-showcase"
+    finally:
+        monkeypatch.delenv("USE_AI_CONCEPTS")
+        importlib.reload(repo)
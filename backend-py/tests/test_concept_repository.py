@@ -1,8 +1,12 @@
+import asyncio
 import importlib
 
 import pytest
 
+from utils import async_concept_repository as async_repo
+from utils import concept_context, concept_documents
 from utils import concept_repository as repo
+from utils.concept_pool import LISTABLE
 from agents.concept_generator import ConceptGenerationQuotaExceeded, ConceptGenerationUnavailable
 
 
@@ -10,8 +14,14 @@ from agents.concept_generator import ConceptGenerationQuotaExceeded, ConceptGene
 def reload_repo():
     """Ensure the repository module sees fresh environment state per test."""
     importlib.reload(repo)
+    concept_context.CONTEXT_CACHE.invalidate()
+    concept_documents.CONCEPT_CACHE.invalidate()
+    concept_documents._CONCEPT_INDEX_STATE.clear()
     yield
     importlib.reload(repo)
+    concept_context.CONTEXT_CACHE.invalidate()
+    concept_documents.CONCEPT_CACHE.invalidate()
+    concept_documents._CONCEPT_INDEX_STATE.clear()
 
 
 @pytest.fixture
@@ -82,3 +92,373 @@ def test_quota_exhaustion_disables_ai(monkeypatch, provider_snapshot):
     monkeypatch.setattr(repo, "_seed_via_ai", unexpected_call)
     repo.list_concepts(limit=1)
     assert calls["count"] == 0
+
+
+def test_build_context_is_memoized_per_city_and_attendees(monkeypatch, provider_snapshot):
+    calls = {"count": 0}
+
+    def counting_snapshot(city=None, limit=6):
+        calls["count"] += 1
+        return provider_snapshot
+
+    monkeypatch.setattr(repo, "_provider_snapshot", counting_snapshot)
+
+    first = repo._build_context()
+    with_concept = repo._build_context({"concept_id": "abc", "vibe": "Chill"})
+    assert calls["count"] == 1
+    assert with_concept["concept_id"] == "abc"
+    assert with_concept["vibe"] == "Chill"
+    assert with_concept["target_pp_lkr"] == first["target_pp_lkr"]
+
+    # Callers mutating their copy do not leak into the memo.
+    first["providers"]["music"].append("Intruder")
+    assert "Intruder" not in repo._build_context()["providers"]["music"]
+
+    bigger = repo._build_context({"attendees": 800})
+    assert calls["count"] == 2
+    assert bigger["budget_lkr"] == bigger["target_pp_lkr"] * 800
+
+
+def test_layered_context_matches_a_direct_build(monkeypatch, provider_snapshot):
+    for overrides in ({"target_pp_lkr": 4200}, {"attendees": 300, "target_pp_lkr": 4200}, {"budget_lkr": 1}):
+        direct = concept_context.context_from_snapshot(dict(overrides), provider_snapshot)
+        repo._build_context()  # warm the memo for the default key
+        assert repo._build_context(dict(overrides)) == direct
+
+
+def test_concurrent_context_builds_share_one_snapshot(monkeypatch, provider_snapshot):
+    import threading
+    import time
+
+    calls = {"count": 0}
+
+    def slow_snapshot(city=None, limit=6):
+        calls["count"] += 1
+        time.sleep(0.05)
+        return provider_snapshot
+
+    monkeypatch.setattr(repo, "_provider_snapshot", slow_snapshot)
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(repo._build_context())) for _ in range(5)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls["count"] == 1
+    assert len(results) == 5
+    assert len({id(result) for result in results}) == 5
+
+
+class _FakeConcepts:
+    """Just enough of a pymongo collection for by-id lookups."""
+
+    def __init__(self, docs):
+        self.docs = {doc["concept_id"]: doc for doc in docs}
+        self.queries = []
+        self.indexes = []
+
+    def create_index(self, key, **kwargs):
+        self.indexes.append((key, kwargs))
+
+    def find(self, query, projection=None):
+        self.queries.append(("find", projection))
+        for concept_id in query["concept_id"]["$in"]:
+            doc = self.docs.get(concept_id)
+            if doc is not None:
+                yield {field: doc[field] for field in projection if projection[field]} if projection else dict(doc)
+
+    def find_one(self, query, projection=None):
+        self.queries.append(projection)
+        doc = self.docs.get(query["concept_id"])
+        if doc is None:
+            return None
+        if projection:
+            return {field: doc[field] for field in projection if projection[field] and field in doc}
+        return dict(doc)
+
+
+@pytest.fixture
+def concept_collection(monkeypatch):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "1")
+    collection = _FakeConcepts([{"concept_id": "neon-nights", "title": "Neon Nights", "updated_at": 1}])
+    monkeypatch.setattr(repo, "mongo_available", lambda: True)
+    monkeypatch.setattr(repo, "_collection", lambda: collection)
+    return collection
+
+
+def test_get_concept_reads_one_document_and_revalidates_cache(concept_collection):
+    first = repo.get_concept("neon-nights")
+    assert first.title == "Neon Nights"
+    assert concept_collection.queries == [None]
+    assert concept_collection.indexes == [("concept_id", {"unique": True, "name": concept_documents.CONCEPT_INDEX_NAME})]
+
+    first.title = "Mutated"
+    again = repo.get_concept("neon-nights")
+    assert again.title == "Neon Nights"
+    assert concept_collection.queries == [None, concept_documents.STAMP_PROJECTION]
+
+    concept_collection.docs["neon-nights"].update(title="Neon Nights II", updated_at=2)
+    assert repo.get_concept("neon-nights").title == "Neon Nights II"
+    assert concept_collection.queries[-2:] == [concept_documents.STAMP_PROJECTION, None]
+    assert len(concept_collection.indexes) == 1
+
+
+def test_concept_index_is_retried_after_a_transient_failure(concept_collection, monkeypatch):
+    class Transient(Exception):
+        pass
+
+    class Duplicate(Exception):
+        code = 11000
+
+    errors = [Transient("server selection timeout"), Duplicate("E11000 duplicate key")]
+    created = concept_collection.create_index
+
+    def flaky_create_index(key, **kwargs):
+        created(key, **kwargs)
+        if errors:
+            raise errors.pop(0)
+
+    monkeypatch.setattr(concept_collection, "create_index", flaky_create_index)
+    for _ in range(4):
+        assert repo.get_concept("neon-nights").title == "Neon Nights"
+    # Retried after the timeout, settled by the permanent duplicate-key error.
+    assert len(concept_collection.indexes) == 2
+
+
+def test_find_concept_drops_deleted_documents(concept_collection):
+    assert repo._find_concept("neon-nights") is not None
+    del concept_collection.docs["neon-nights"]
+    assert repo._find_concept("neon-nights") is None
+    assert concept_documents.CONCEPT_CACHE.get("neon-nights") is None
+    assert repo._find_concept("missing") is None
+
+
+def _seed_context():
+    return {"city": "Colombo", "attendees": 200, "providers": {"music": ["Aisha"]}, "target_pp_lkr": 3000}
+
+
+def test_concurrent_seeds_share_one_generation(monkeypatch):
+    import threading
+    import time
+
+    from test_mongo_lease import FakeLeases
+
+    stored = []
+
+    class Concepts:
+        def update_one(self, query, update, upsert=False):
+            stored.append(update["$set"])
+
+    calls = {"count": 0}
+
+    def slow_generate(context):
+        calls["count"] += 1
+        time.sleep(0.05)
+        return {"concept_id": "seeded", "title": "Seeded"}
+
+    monkeypatch.setattr(repo, "_collection", lambda: Concepts())
+    monkeypatch.setattr(repo, "get_leases_collection", lambda: FakeLeases())
+    monkeypatch.setattr(repo, "generate_concept", slow_generate)
+
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(repo._seed_via_ai(_seed_context()))) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls["count"] == 1
+    assert len(stored) == 1
+    assert [concept.concept_id for concept in results] == ["seeded"] * 4
+
+
+def test_seed_waits_for_the_worker_holding_the_lease(monkeypatch):
+    from datetime import datetime
+
+    from test_mongo_lease import FakeLeases
+    from utils.mongo_lease import MongoLease
+
+    leases = FakeLeases()
+    assert MongoLease(leases, "concept-seed:Colombo:200", ttl_seconds=60, owner="other-worker").acquire()
+    acquired_at = leases.docs["concept-seed:Colombo:200"]["acquired_at"]
+    polls = {"count": 0}
+
+    class Concepts:
+        def find_one(self, query, sort=None):
+            polls["count"] += 1
+            assert query["updated_at"] == {"$gte": acquired_at}
+            if polls["count"] < 2:
+                return None
+            return {"concept_id": "from-other", "title": "Other", "updated_at": datetime.utcnow()}
+
+    def unexpected_generate(context):
+        raise AssertionError("lease holder is already generating")
+
+    monkeypatch.setattr(repo, "_SEED_POLL_SECONDS", 0.01)
+    monkeypatch.setattr(repo, "_collection", lambda: Concepts())
+    monkeypatch.setattr(repo, "get_leases_collection", lambda: leases)
+    monkeypatch.setattr(repo, "generate_concept", unexpected_generate)
+
+    assert repo._seed_via_ai(_seed_context()).concept_id == "from-other"
+
+
+def test_get_concepts_reads_all_ids_in_one_query(concept_collection, provider_snapshot):
+    concept_collection.docs["city-lights"] = {"concept_id": "city-lights", "title": "City Lights", "updated_at": 1}
+
+    concepts = repo.get_concepts(["neon-nights", "city-lights", "neon-nights", "fallback-live-showcase-2"])
+    assert [concept.concept_id for concept in concepts] == ["neon-nights", "city-lights", "fallback-live-showcase-2"]
+    assert concept_collection.queries == [("find", None)]
+
+    concept_collection.docs["city-lights"].update(title="City Lights II", updated_at=2)
+    titles = [concept.title for concept in repo.get_concepts(["neon-nights", "city-lights"])]
+    assert titles == ["Neon Nights", "City Lights II"]
+    assert concept_collection.queries[1:] == [("find", repo._BATCH_STAMP_PROJECTION), ("find", None)]
+
+
+class _AsyncConceptCursor:
+    def __init__(self, docs, calls):
+        self.docs = docs
+        self.calls = calls
+
+    def sort(self, field, direction):
+        self.calls.append(("sort", field, direction))
+        return self
+
+    def limit(self, count):
+        self.calls.append(("limit", count))
+        self.docs = self.docs[:count]
+        return self
+
+    async def to_list(self, length=None):
+        return list(self.docs)
+
+
+@pytest.fixture
+def async_concepts(monkeypatch, provider_snapshot):
+    calls = []
+    docs = [
+        {"_id": "a", "concept_id": "neon-nights", "title": "Neon Nights", "updated_at": 2},
+        {"_id": "b", "concept_id": "jazz-garden", "title": "Jazz Garden", "updated_at": 1},
+    ]
+
+    class Concepts:
+        def find(self, query):
+            calls.append(("find", query))
+            return _AsyncConceptCursor(docs, calls)
+
+    async def snapshot(city=None, limit=6):
+        return provider_snapshot
+
+    monkeypatch.setattr(async_repo, "async_driver_available", lambda: True)
+    monkeypatch.setattr(async_repo, "_collection", lambda: Concepts())
+    monkeypatch.setattr(async_repo, "_provider_snapshot", snapshot)
+    return calls
+
+
+def test_async_list_concepts_awaits_stored_concepts(monkeypatch, async_concepts):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "1")
+    monkeypatch.setenv("CONCEPT_POOL_SIZE", "0")
+
+    concepts = asyncio.run(async_repo.list_concepts(limit=1))
+
+    assert [concept.concept_id for concept in concepts] == ["neon-nights"]
+    assert async_concepts == [("find", LISTABLE), ("sort", "updated_at", -1), ("limit", 1)]
+    assert concept_documents.CONCEPT_CACHE.get("neon-nights")[0] == 2
+
+
+def test_async_list_concepts_serves_provider_fallbacks_without_ai(monkeypatch, async_concepts):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "0")
+
+    concepts = asyncio.run(async_repo.list_concepts(limit=2))
+
+    assert [concept.title for concept in concepts][0].endswith("#1")
+    assert len(concepts) == 2
+    assert concepts[0].providers["music"][0] == "Aisha"
+    assert async_concepts == []
+    # The async build shares the sync memo.
+    assert repo._build_context()["providers"] == concepts[0].providers
+
+
+def test_async_list_concepts_reads_the_pool_off_the_loop(monkeypatch, async_concepts):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "1")
+    monkeypatch.setenv("CONCEPT_POOL_SIZE", "2")
+    taken = []
+
+    def take(city, vibe, count):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        taken.append((city, count))
+        return [{"concept_id": "pool-1", "title": "Pooled", "updated_at": 3}]
+
+    monkeypatch.setattr(repo._POOL, "take", take)
+
+    concepts = asyncio.run(async_repo.list_concepts(limit=1))
+
+    assert [concept.concept_id for concept in concepts] == ["pool-1"]
+    assert taken == [("Colombo", 1)]
+    assert async_concepts == []
+
+
+class _AsyncConcepts:
+    """Async by-id lookups over :class:`_FakeConcepts`."""
+
+    def __init__(self, docs):
+        self.sync = _FakeConcepts(docs)
+
+    async def create_index(self, key, **kwargs):
+        self.sync.create_index(key, **kwargs)
+
+    async def find_one(self, query, projection=None):
+        return self.sync.find_one(query, projection)
+
+
+def test_async_get_concept_revalidates_the_shared_cache(monkeypatch, provider_snapshot):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "1")
+    collection = _AsyncConcepts([{"concept_id": "neon-nights", "title": "Neon Nights", "updated_at": 1}])
+    monkeypatch.setattr(async_repo, "async_driver_available", lambda: True)
+    monkeypatch.setattr(async_repo, "_collection", lambda: collection)
+
+    assert asyncio.run(async_repo.get_concept("neon-nights")).title == "Neon Nights"
+    assert asyncio.run(async_repo.get_concept("neon-nights")).title == "Neon Nights"
+
+    assert collection.sync.queries == [None, concept_documents.STAMP_PROJECTION]
+    assert len(collection.sync.indexes) == 1
+    assert concept_documents.concept_index_settled()
+
+
+def test_async_get_concept_serves_fallback_variants_without_ai(monkeypatch, async_concepts):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "0")
+
+    concept = asyncio.run(async_repo.get_concept("fallback-live-showcase-2"))
+
+    assert concept.concept_id == "fallback-live-showcase-2"
+    assert concept.providers["music"][0] == "Aisha"
+    assert async_concepts == []
+
+
+def test_async_ensure_seed_concept_seeds_off_the_loop(monkeypatch, async_concepts):
+    monkeypatch.setenv("USE_AI_CONCEPTS", "1")
+    monkeypatch.setenv("CONCEPT_POOL_SIZE", "0")
+
+    class EmptyConcepts:
+        def find(self, query):
+            return _AsyncConceptCursor([], [])
+
+    def seed(context=None):
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        return repo.fallback_concept({**context, "concept_id": "seeded"})
+
+    monkeypatch.setattr(async_repo, "_collection", lambda: EmptyConcepts())
+    monkeypatch.setattr(repo, "_seed_via_ai", seed)
+
+    assert asyncio.run(async_repo.ensure_seed_concept()).concept_id == "seeded"
+
+    def quota_error(context=None):
+        raise ConceptGenerationQuotaExceeded("OpenAI quota exhausted; using provider fallback.")
+
+    monkeypatch.setattr(repo, "_seed_via_ai", quota_error)
+
+    assert asyncio.run(async_repo.ensure_seed_concept()).concept_id == "fallback-live-showcase"
+    assert not repo.ai_enabled()
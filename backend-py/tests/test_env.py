@@ -0,0 +1,28 @@
+"""Numeric settings parsed from environment variables."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils.env import env_float, env_int  # noqa: E402
+
+
+def test_env_numbers_fall_back_to_defaults(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.delenv("BENCH_SETTING", raising=False)
+    assert env_float("BENCH_SETTING", 1.5) == 1.5
+    assert env_int("BENCH_SETTING", 4) == 4
+
+    monkeypatch.setenv("BENCH_SETTING", "2.75")
+    assert env_float("BENCH_SETTING", 1.5) == 2.75
+    assert env_int("BENCH_SETTING", 4) == 2
+
+    monkeypatch.setenv("BENCH_SETTING", "many")
+    assert env_float("BENCH_SETTING", 1.5) == 1.5
+    assert env_int("BENCH_SETTING", 4) == 4
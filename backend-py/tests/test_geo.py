@@ -0,0 +1,74 @@
+"""Offline geocoding and venue proximity filters."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import provider_queries, provider_records  # noqa: E402
+from utils.geo import (  # noqa: E402
+    EARTH_RADIUS_KM,
+    GAZETTEER,
+    UnknownLocation,
+    distance_km,
+    geo_point,
+    locate_text,
+    parse_near,
+)
+from utils.provider_catalog import catalog_record  # noqa: E402
+
+
+def test_locate_text_prefers_the_town_at_the_end() -> None:
+    assert locate_text("12 Galle Road, Colombo 03") == GAZETTEER["colombo"]
+    assert locate_text("Lake View Hotel, Nuwara Eliya") == GAZETTEER["nuwara eliya"]
+    assert locate_text("Somewhere unknown") is None
+
+
+def test_geo_point_uses_explicit_coordinates_first() -> None:
+    doc = {"city": "Kandy", "latitude": 7.0, "longitude": 80.0}
+    assert geo_point(doc) == {"type": "Point", "coordinates": [80.0, 7.0]}
+    assert geo_point({"venueAddress": "Magampura Port Access Road, Hambantota"})["coordinates"] == list(
+        GAZETTEER["hambantota"]
+    )
+    assert geo_point({"city": "Atlantis"}) is None
+
+
+def test_parse_near_accepts_coordinates_and_town_names() -> None:
+    assert parse_near("6.05, 80.22") == (80.22, 6.05)
+    assert parse_near("Mount Lavinia") == GAZETTEER["mount lavinia"]
+    with pytest.raises(UnknownLocation):
+        parse_near("Atlantis")
+    with pytest.raises(UnknownLocation):
+        parse_near("95,10")
+
+
+def test_distance_between_towns() -> None:
+    assert 95 < distance_km(GAZETTEER["colombo"], GAZETTEER["galle"]) < 120
+
+
+def test_catalog_records_carry_location_only_when_placed() -> None:
+    placed = catalog_record({"_id": 1, "role": "venue", "name": "Fort Hall", "city": "Galle"})
+    assert placed["location"]["coordinates"] == list(GAZETTEER["galle"])
+    unplaced = catalog_record({"_id": 2, "role": "venue", "name": "Nowhere Hall", "city": "Atlantis"})
+    assert "location" not in unplaced
+
+
+def test_near_filter_targets_geo_index_and_python_twin() -> None:
+    query = provider_queries.catalog_filter(["venue"], None, {"near": GAZETTEER["galle"], "radius_km": 10})
+    center, radians = query["location"]["$geoWithin"]["$centerSphere"]
+    assert center == list(GAZETTEER["galle"])
+    assert radians == pytest.approx(10 / EARTH_RADIUS_KM)
+
+    near_galle = {"near": GAZETTEER["galle"], "radius_km": 25}
+    hikkaduwa = provider_records.venue_record({"name": "Beach Deck", "city": "Hikkaduwa"})
+    colombo = provider_records.venue_record({"name": "City Hall", "city": "Colombo"})
+    unplaced = provider_records.venue_record({"name": "Mystery Hall"})
+    assert provider_queries.matches_filters(hikkaduwa, near_galle)
+    assert not provider_queries.matches_filters(colombo, near_galle)
+    assert not provider_queries.matches_filters(unplaced, near_galle)
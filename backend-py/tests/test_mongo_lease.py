@@ -0,0 +1,71 @@
+"""Mongo lease documents used to de-duplicate work across workers."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from datetime import datetime, timedelta
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils.mongo_lease import DuplicateKeyError, MongoLease  # noqa: E402
+
+
+class FakeLeases:
+    """Upsert semantics of a collection with a unique ``_id``."""
+
+    def __init__(self):
+        self.docs = {}
+
+    def create_index(self, *args, **kwargs):
+        pass
+
+    def update_one(self, query, update, upsert=False):
+        doc = self.docs.get(query["_id"])
+        if doc is not None:
+            if doc["expires_at"] <= query["expires_at"]["$lte"]:
+                doc.update(update["$set"])
+                return
+            if upsert:
+                raise DuplicateKeyError("E11000 duplicate key")
+            return
+        if upsert:
+            self.docs[query["_id"]] = {"_id": query["_id"], **update["$set"]}
+
+    def find_one(self, query):
+        doc = self.docs.get(query["_id"])
+        return dict(doc) if doc else None
+
+    def delete_one(self, query):
+        doc = self.docs.get(query["_id"])
+        if doc is not None and doc["owner"] == query["owner"]:
+            del self.docs[query["_id"]]
+
+
+def test_only_one_holder_until_release() -> None:
+    leases = FakeLeases()
+    first = MongoLease(leases, "job", ttl_seconds=60)
+    second = MongoLease(leases, "job", ttl_seconds=60)
+
+    assert first.acquire()
+    assert not second.acquire()
+    assert second.holder()["owner"] == first.owner
+
+    second.release()  # not the holder: no effect
+    assert not second.acquire()
+    first.release()
+    assert second.acquire()
+
+
+def test_expired_lease_can_be_taken_over() -> None:
+    leases = FakeLeases()
+    stale = MongoLease(leases, "job", ttl_seconds=60)
+    assert stale.acquire()
+    leases.docs["job"]["expires_at"] = datetime.utcnow() - timedelta(seconds=1)
+
+    fresh = MongoLease(leases, "job", ttl_seconds=60)
+    assert fresh.acquire()
+    stale.release()
+    assert leases.docs["job"]["owner"] == fresh.owner
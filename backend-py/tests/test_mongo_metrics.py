@@ -0,0 +1,68 @@
+"""Mongo client pool options and driver-level metrics listeners."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import mongo_client  # noqa: E402
+from utils.mongo_metrics import MongoMetrics  # noqa: E402
+
+
+def test_client_options_read_pool_env(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setenv("MONGO_MAX_POOL_SIZE", "40")
+    monkeypatch.setenv("MONGO_WAIT_QUEUE_TIMEOUT_MS", "1500")
+    monkeypatch.setenv("MONGO_MIN_POOL_SIZE", "lots")
+    monkeypatch.delenv("MONGO_MAX_IDLE_TIME_MS", raising=False)
+    monkeypatch.setenv("MONGO_METRICS_ENABLED", "0")
+
+    options = mongo_client._client_options()
+    assert options["maxPoolSize"] == 40
+    assert options["waitQueueTimeoutMS"] == 1500
+    assert "minPoolSize" not in options
+    assert "maxIdleTimeMS" not in options
+    assert "event_listeners" not in options
+
+
+def test_command_latency_is_grouped_by_collection() -> None:
+    metrics = MongoMetrics()
+    metrics.command_started(1, 10, "find", {"find": "provider_catalog", "filter": {}})
+    metrics.command_started(1, 11, "getMore", {"getMore": 123, "collection": "provider_catalog"})
+    metrics.command_finished(1, 10, "find", 4_000, failed=False)
+    metrics.command_finished(1, 11, "getMore", 2_000, failed=True)
+    metrics.command_started(2, 12, "find", {"find": "provider_catalog"})
+    metrics.command_finished(2, 12, "find", 8_000, failed=False)
+
+    commands = {(row["collection"], row["command"]): row for row in metrics.snapshot()["commands"]}
+    find = commands[("provider_catalog", "find")]
+    assert find["count"] == 2
+    assert find["avg_ms"] == 6.0
+    assert find["max_ms"] == 8.0
+    assert commands[("provider_catalog", "getMore")]["failures"] == 1
+
+
+def test_pool_counts_checkouts_and_waits() -> None:
+    metrics = MongoMetrics()
+    address = ("db.local", 27017)
+    for _ in range(3):
+        metrics.pool_event(address, "checkout_started")
+    metrics.pool_event(address, "checked_out", duration_s=0.002)
+    metrics.pool_event(address, "checked_out", duration_s=0.050)
+    metrics.pool_event(address, "checked_in")
+
+    pool = metrics.snapshot()["pools"]["db.local:27017"]
+    assert pool["waiting"] == 1
+    assert pool["in_use"] == 1
+    assert pool["peak_in_use"] == 2
+    assert pool["wait"]["max_ms"] == 50.0
+
+    metrics.pool_event(address, "checkout_failed", duration_s=2.0, reason="timeout")
+    pool = metrics.snapshot()["pools"]["db.local:27017"]
+    assert pool["waiting"] == 0
+    assert pool["checkout_failures"] == {"timeout": 1}
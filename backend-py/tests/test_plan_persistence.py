@@ -0,0 +1,108 @@
+"""Bulk insert of generated plans, costs and timelines."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+from sqlalchemy import create_engine, event
+from sqlalchemy.orm import sessionmaker
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from config.database import Base  # noqa: E402
+from models.campaign import Campaign  # noqa: E402
+from models.event_planner import EventPlan, PlanCost, PlanTimeline  # noqa: E402
+from planner.persistence import PlanRows, insert_plan_rows, replace_campaign_plans  # noqa: E402
+
+
+def _engine():
+    engine = create_engine("sqlite://")
+    Base.metadata.create_all(
+        engine, tables=[Campaign.__table__, EventPlan.__table__, PlanCost.__table__, PlanTimeline.__table__]
+    )
+    return engine
+
+
+def _rows(campaign_id: str, plans: int) -> PlanRows:
+    rows = PlanRows()
+    for index in range(plans):
+        rows.add_plan(
+            campaign_id=campaign_id,
+            concept_key=f"c{index}",
+            concept_title=f"Concept {index}",
+            assumptions=["Lights"],
+            costs=[("venue", 600), ("music", 400)],
+            timeline=[(-7, "Run sheet"), (0, "Event day")],
+            budget_profile=f"Concept {index}",
+        )
+    return rows
+
+
+def test_plan_rows_are_inserted_with_one_statement_per_table() -> None:
+    engine = _engine()
+    inserts = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        if statement.lstrip().upper().startswith("INSERT"):
+            inserts.append(statement.split("(")[0].split()[-1])
+
+    db = sessionmaker(bind=engine)()
+    db.add(Campaign(id="camp", name="Bulk"))
+    db.commit()
+    inserts.clear()
+
+    rows = PlanRows()
+    timeline = [(-30, "Shortlist"), (-7, "Run sheet"), (0, "Event day")]
+    for index in range(4):
+        rows.add_plan(
+            campaign_id="camp",
+            concept_key=f"c{index}",
+            concept_title=f"Concept {index}",
+            assumptions=["Lights", "Sound"],
+            costs=[("venue", 600), ("music", 400)],
+            timeline=timeline,
+            budget_profile=f"Concept {index}",
+        )
+    assert len(rows) == 4 + 8 + 12
+    insert_plan_rows(db, rows)
+    db.commit()
+
+    assert inserts == ["event_plans", "plan_costs", "plan_timeline"]
+    plans = db.query(EventPlan).filter(EventPlan.campaign_id == "camp").order_by(EventPlan.concept_key).all()
+    assert [plan.total_lkr for plan in plans] == [1000] * 4
+    assert plans[0].assumptions == "Lights|Sound"
+    assert [cost.currency for cost in plans[0].costs] == ["LKR", "LKR"]
+    assert sorted(item.offset_days for item in plans[0].timeline) == [-30, -7, 0]
+
+
+def test_replacing_plans_costs_three_deletes_regardless_of_history() -> None:
+    engine = _engine()
+    db = sessionmaker(bind=engine)()
+    db.add_all([Campaign(id="busy", name="Busy"), Campaign(id="other", name="Other")])
+    db.commit()
+    insert_plan_rows(db, _rows("busy", 40))
+    insert_plan_rows(db, _rows("other", 2))
+    db.commit()
+
+    statements = []
+
+    @event.listens_for(engine, "before_cursor_execute")
+    def record(conn, cursor, statement, parameters, context, executemany):
+        statements.append(statement.split()[0].upper())
+
+    replace_campaign_plans(db, "busy", _rows("busy", 2))
+    assert statements.count("DELETE") == 3
+    assert statements.count("SELECT") == 0
+
+    def count(model, campaign):
+        if model is EventPlan:
+            return db.query(EventPlan).filter(EventPlan.campaign_id == campaign).count()
+        return db.query(model).join(EventPlan).filter(EventPlan.campaign_id == campaign).count()
+
+    assert [count(model, "busy") for model in (EventPlan, PlanCost, PlanTimeline)] == [2, 4, 4]
+    assert [count(model, "other") for model in (EventPlan, PlanCost, PlanTimeline)] == [2, 4, 4]
+    assert db.query(PlanCost).count() == 8
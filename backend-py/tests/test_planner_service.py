@@ -0,0 +1,151 @@
+"""Lazy default concept resolution in the planner service."""
+
+from __future__ import annotations
+
+import asyncio
+import importlib
+import pathlib
+import sys
+import time
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from models.concept import Concept  # noqa: E402
+from services.concept_naming import ConceptIdentity  # noqa: E402
+from utils import concept_repository  # noqa: E402
+
+
+@pytest.fixture
+def service(monkeypatch):
+    calls = []
+
+    def seed(context=None):
+        calls.append(time.monotonic())
+        return Concept(concept_id=f"seed-{len(calls)}", title="Seeded")
+
+    monkeypatch.setattr(concept_repository, "ensure_seed_concept", seed)
+    from planner import service as module
+
+    module = importlib.reload(module)
+    module.seed_calls = calls
+    yield module
+    monkeypatch.undo()
+    importlib.reload(module)
+
+
+def test_import_does_not_resolve_the_default_concept(service) -> None:
+    assert service.seed_calls == []
+    assert service._ensure_concept(None).concept_id == "seed-1"
+    assert service._ensure_concept(None).concept_id == "seed-1"
+    assert len(service.seed_calls) == 1
+
+
+def test_warm_default_concept_resolves_it_off_the_request_path(service) -> None:
+    service.warm_default_concept()
+    deadline = time.monotonic() + 2
+    while service._DEFAULT_STATE["concept"] is None and time.monotonic() < deadline:
+        time.sleep(0.01)
+    assert service._ensure_concept(None).concept_id == "seed-1"
+    assert len(service.seed_calls) == 1
+
+
+def test_stale_default_is_served_while_refreshing_in_background(service, monkeypatch) -> None:
+    service._default_concept()
+    monkeypatch.setenv("DEFAULT_CONCEPT_REFRESH_SECONDS", "0")
+
+    assert service._default_concept().concept_id == "seed-1"
+    deadline = time.monotonic() + 2
+    while service._DEFAULT_STATE["refreshing"] and time.monotonic() < deadline:
+        time.sleep(0.01)
+    monkeypatch.setenv("DEFAULT_CONCEPT_REFRESH_SECONDS", "300")
+    assert service._default_concept().concept_id == "seed-2"
+
+
+def test_resolver_fetches_all_ids_in_one_batch(service, monkeypatch) -> None:
+    batches = []
+
+    def batch(ids):
+        batches.append(list(ids))
+        return [Concept(concept_id=cid, title=cid.upper()) for cid in ids if cid != "ghost"]
+
+    monkeypatch.setattr(service, "get_concepts", batch)
+    resolver = service.ConceptResolver([Concept(concept_id="listed", title="Listed")])
+
+    concepts = resolver.resolve_many(["a", "b", "listed", "ghost"])
+    assert [concept.title for concept in concepts] == ["A", "B", "Listed", "Seeded"]
+    for _ in range(3):
+        assert resolver.resolve("b").title == "B"
+        assert resolver.resolve("ghost").concept_id == "seed-1"
+    assert batches == [["a", "b", "ghost"]]
+    assert resolver.fetches == 1
+
+
+def test_service_helpers_accept_resolved_concepts(service, monkeypatch) -> None:
+    def unexpected(concept_id):
+        raise AssertionError("resolved concepts must not be fetched again")
+
+    monkeypatch.setattr(service, "get_concept", unexpected)
+    concept = Concept(concept_id="x", title="Resolved", cost_split={"venue": 1, "music": 1})
+    assert service.pick_title(concept) == "Resolved"
+    assert dict(service.generate_costs(1000, concept)) == {"venue": 500, "music": 500}
+    costs = service.generate_dynamic_costs(1_000_000, concept, {"name": "Hall", "capacity": 100}, 100)
+    assert [category for category, _ in costs] == ["venue", "music"]
+
+
+def test_generate_plans_fetches_concepts_once_for_any_count(monkeypatch, planner_client) -> None:
+    import routers.planner as planner_router
+    from planner import service as service_module
+
+    resolvers = []
+
+    class RecordingResolver(planner_router.ConceptResolver):
+        def __init__(self, concepts=()):
+            super().__init__(concepts)
+            resolvers.append(self)
+
+    notes_calls = []
+
+    async def listed(limit=None):
+        return [Concept(concept_id=f"c{i}", title=f"Concept {i}") for i in range(limit)]
+
+    def notes(*args, **kwargs):
+        # May resolve the default concept (Mongo/OpenAI): must not run on the event loop.
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        notes_calls.append(args)
+        return []
+
+    def unexpected(concept_id):
+        raise AssertionError("listed concepts must not be fetched again")
+
+    monkeypatch.setattr(planner_router, "ConceptResolver", RecordingResolver)
+    monkeypatch.setattr(planner_router, "list_concepts", listed)
+    monkeypatch.setattr(planner_router, "feasibility_notes", notes)
+    monkeypatch.setattr(planner_router, "find_venues", lambda *args, **kwargs: [])
+    monkeypatch.setattr(service_module, "get_concept", unexpected)
+    identity = ConceptIdentity(title="Named", tagline="Tag", source="test")
+    monkeypatch.setattr(planner_router, "generate_concept_identity", lambda **kwargs: identity)
+
+    campaign_id = planner_client.post("/campaigns", json={"name": "Resolver Campaign"}).json()["id"]
+    for count in (1, 4):
+        body = {
+            "campaign_id": campaign_id,
+            "event_name": "Resolver Night",
+            "venue": "Harbourfront Arena, Colombo",
+            "event_date": "2030-01-01",
+            "attendees_estimate": 150,
+            "total_budget_lkr": 1_500_000,
+            "number_of_concepts": count,
+        }
+        response = planner_client.post(f"/campaigns/{campaign_id}/planner/generate", json=body)
+        assert response.status_code == 200, response.text
+        assert len(response.json()["concepts"]) == count
+        assert resolvers[-1].fetches == 0
+        assert resolvers[-1].lookups == count
+        assert response.headers["X-Concept-Fetches"] == "0"
+        assert response.headers["X-Concept-Lookups"] == str(count)
+    assert len(notes_calls) == 2
@@ -0,0 +1,92 @@
+"""Streaming planner endpoint: skeleton first, enrichments as they resolve."""
+
+from __future__ import annotations
+
+import json
+import pathlib
+import sys
+import threading
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from sqlalchemy import text  # noqa: E402
+
+import routers.planner as planner_router  # noqa: E402
+from models.concept import Concept  # noqa: E402
+from services.concept_naming import ConceptIdentity  # noqa: E402
+
+
+def test_stream_sends_the_skeleton_before_titles_and_venues(monkeypatch, planner_client, planner_db) -> None:
+    venues_released = threading.Event()
+
+    async def listed(limit=None):
+        return [Concept(concept_id=f"c{i}", title=f"Concept {i}") for i in range(limit)]
+
+    def slow_venues(*args, **kwargs):
+        # Venues resolve only once naming has started, i.e. after the skeleton was sent.
+        assert venues_released.wait(5)
+        return [{"name": "Harbour Hall", "min_lead_days": 90}]
+
+    def named(**kwargs):
+        venues_released.set()
+        return ConceptIdentity(title=f"Named {kwargs['fallback_title']}", tagline="Tag", source="test")
+
+    monkeypatch.setattr(planner_router, "list_concepts", listed)
+    monkeypatch.setattr(planner_router, "find_venues", slow_venues)
+    monkeypatch.setattr(planner_router, "generate_concept_identity", named)
+
+    client = planner_client
+    campaign_id = client.post("/campaigns", json={"name": "Stream Campaign"}).json()["id"]
+    body = {
+        "campaign_id": campaign_id,
+        "event_name": "Stream Night",
+        "venue": "Harbourfront Arena, Colombo",
+        "event_date": "2030-01-01",
+        "attendees_estimate": 150,
+        "total_budget_lkr": 1_500_000,
+        "number_of_concepts": 2,
+    }
+    with client.stream("POST", f"/campaigns/{campaign_id}/planner/generate/stream", json=body) as response:
+        assert response.status_code == 200
+        assert response.headers["content-type"].startswith("application/x-ndjson")
+        events = [json.loads(line) for line in response.iter_lines()]
+
+    kinds = [event["event"] for event in events]
+    assert kinds[0] == "skeleton" and kinds[-1] == "plan"
+    assert sorted(kinds[1:-1]) == ["titles", "venues"]  # in whichever order they resolve
+
+    skeleton = events[0]["plan"]
+    assert [concept["title"] for concept in skeleton["concepts"]] == ["Concept 0", "Concept 1"]
+    assert all(concept["costs"] for concept in skeleton["concepts"])
+    assert skeleton["derived"]["suggested_venues"] == []
+
+    titles = next(event for event in events if event["event"] == "titles")
+    assert [concept["title"] for concept in titles["concepts"]] == ["Named Concept 0", "Named Concept 1"]
+    venues = next(event for event in events if event["event"] == "venues")
+    assert venues["derived"]["recommended_lead_days"] == 90
+
+    plan = events[-1]["plan"]
+    assert [concept["title"] for concept in plan["concepts"]] == ["Named Concept 0", "Named Concept 1"]
+    assert plan["derived"]["suggested_venues"][0]["name"] == "Harbour Hall"
+    with planner_db() as session:
+        stored = session.execute(
+            text("SELECT concept_title FROM event_plans WHERE campaign_id = :cid ORDER BY concept_title"),
+            {"cid": campaign_id},
+        ).scalars().all()
+    assert stored == ["Named Concept 0", "Named Concept 1"]
+
+
+def test_stream_rejects_unknown_campaigns(planner_client) -> None:
+    client = planner_client
+    body = {
+        "campaign_id": "missing",
+        "event_name": "Nowhere",
+        "venue": "Colombo",
+        "event_date": "2030-01-01",
+        "attendees_estimate": 10,
+        "total_budget_lkr": 100_000,
+    }
+    response = client.post("/campaigns/missing/planner/generate/stream", json=body)
+    assert response.status_code == 404
@@ -0,0 +1,89 @@
+"""Provider catalog cache behaviour (TTL, LRU eviction, invalidation)."""
+
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import sys
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import provider_cache  # noqa: E402
+from utils import provider_repository  # noqa: E402
+from utils.provider_cache import ProviderCatalogCache  # noqa: E402
+
+
+def test_cache_expires_entries_after_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    now = {"t": 1000.0}
+    monkeypatch.setattr(provider_cache.time, "monotonic", lambda: now["t"])
+    cache = ProviderCatalogCache(ttl_seconds=30, max_entries=4)
+
+    cache.set("k", [1])
+    assert cache.get("k") == [1]
+    now["t"] += 31
+    assert cache.get("k") is None
+    assert (cache.hits, cache.misses) == (1, 1)
+
+
+def test_cache_evicts_least_recently_used() -> None:
+    cache = ProviderCatalogCache(ttl_seconds=60, max_entries=2)
+    cache.set("a", 1)
+    cache.set("b", 2)
+    assert cache.get("a") == 1  # "b" is now least recently used
+    cache.set("c", 3)
+
+    assert cache.get("b") is None
+    assert cache.get("a") == 1
+    assert cache.stats()["evictions"] == 1
+
+
+def test_list_venues_served_from_cache_until_invalidated(monkeypatch: pytest.MonkeyPatch) -> None:
+    cache = ProviderCatalogCache(ttl_seconds=60, max_entries=8)
+    monkeypatch.setattr(provider_cache, "_CACHE", cache)
+    monkeypatch.setattr(provider_cache, "_ensure_invalidation", lambda: None)
+
+    calls = []
+
+    def fake_query(role_key, city, limit, fields=None, filters=None):
+        calls.append((role_key, city, limit))
+        return [{"_id": "v1", "name": "Lotus Hall", "capacity": "300", "standardRate": 90000}]
+
+    monkeypatch.setattr(provider_repository, "_query_users", fake_query)
+
+    first = provider_repository.list_venues(city="Colombo", limit=5)
+    first[0]["name"] = "mutated by caller"
+    second = provider_repository.list_venues(city=" colombo ", limit=5)
+
+    assert len(calls) == 1
+    assert second[0]["name"] == "Lotus Hall"
+
+    provider_cache._on_users_changed({"operationType": "update"})
+    provider_repository.list_venues(city="Colombo", limit=5)
+    assert len(calls) == 2
+    assert cache.stats()["invalidations"] == 1
+
+
+def test_async_miss_starts_the_change_feed_off_the_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(provider_cache, "_CACHE", ProviderCatalogCache(ttl_seconds=60, max_entries=8))
+    monkeypatch.setattr(provider_cache, "_WATCHING", False)
+    started = []
+
+    def ensure_invalidation() -> None:
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        started.append(1)
+        provider_cache._WATCHING = True
+
+    async def load():
+        return [{"name": "Lotus Hall"}]
+
+    monkeypatch.setattr(provider_cache, "_ensure_invalidation", ensure_invalidation)
+    copy = lambda items: [dict(item) for item in items]  # noqa: E731
+
+    for key in (("venue", None, 5), ("venue", "kandy", 5)):
+        assert asyncio.run(provider_cache.cached_value_async(key, load, copy=copy)) == [{"name": "Lotus Hall"}]
+    assert started == [1]
@@ -0,0 +1,248 @@
+"""Materialised provider catalog normalisation and read path."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import pagination, provider_cache, provider_catalog  # noqa: E402
+from utils import provider_repository  # noqa: E402
+from utils.provider_cache import ProviderCatalogCache  # noqa: E402
+from utils.provider_catalog import ProviderCatalogSync, catalog_record  # noqa: E402
+from utils.provider_search import ProviderSearchIndex  # noqa: E402
+from utils.rate_stats import RateStats  # noqa: E402
+from utils.venue_name_index import VenueNameIndex  # noqa: E402
+
+
+def test_catalog_record_precomputes_role_views() -> None:
+    record = catalog_record(
+        {
+            "_id": "v1",
+            "role": "venue",
+            "venueName": "  Harbour   Deck ",
+            "city": "Hambantota",
+            "capacity": "250-340",
+            "pricing": {"standardRate": "75000"},
+            "minLeadDays": "21 days",
+            "rating": "4.5",
+        }
+    )
+
+    assert record is not None
+    assert record["roles"] == ["venue"]
+    assert record["name_key"] == "harbour deck"
+    assert (record["capacity"], record["min_lead_days"], record["rating"]) == (340, 21, 4.5)
+    assert record["views"]["venue"]["avg_cost_lkr"] == 75000
+    assert record["city_key"] == ["hambantota"]
+
+
+def test_catalog_record_skips_non_providers() -> None:
+    assert catalog_record({"_id": "u1", "role": "user", "name": "Guest"}) is None
+
+
+def test_list_reads_views_from_catalog(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: Dict[str, Any] = {}
+
+    class FakeCursor(list):
+        def sort(self, spec):
+            captured["sort"] = spec
+            return self
+
+        def limit(self, n):
+            captured["limit"] = n
+            return self
+
+    class FakeCatalog:
+        def find(self, query, projection=None):
+            captured["query"] = query
+            captured["projection"] = projection
+            return FakeCursor(
+                [{"_id": "l1", "roles": ["lights"], "sort_rate": 25_000, "views": {"lights": {"name": "Glow", "crew_size": 6}}}]
+            )
+
+    def fail_users_query(*args, **kwargs) -> List[Dict[str, Any]]:
+        raise AssertionError("catalog reads must not hit the users collection")
+
+    monkeypatch.setattr(provider_cache, "_CACHE", ProviderCatalogCache(ttl_seconds=0, max_entries=1))
+    monkeypatch.setattr(provider_repository, "_catalog_ready", lambda: True)
+    monkeypatch.setattr(provider_repository, "get_provider_catalog_collection", lambda: FakeCatalog())
+    monkeypatch.setattr(provider_repository, "_query_users", fail_users_query)
+
+    result = provider_repository.list_lighting(city="Colombo", limit=4, max_budget_lkr=30_000, min_crew_size=4)
+
+    assert result == [{"name": "Glow", "crew_size": 6}]
+    assert captured["query"] == {
+        "roles": "lights",
+        "city_key": "colombo",
+        "price_lkr": {"$lte": 30_000},
+        "crew_size": {"$gte": 4},
+    }
+    assert captured["projection"] == {"roles": 1, "sort_rate": 1, "_id": 1, "views.lights": 1}
+    assert captured["sort"] == [("sort_rate", 1), ("_id", 1)]
+    assert captured["limit"] == 5  # one extra row to detect a next page
+
+
+def test_users_fallback_filters_before_truncating(monkeypatch: pytest.MonkeyPatch) -> None:
+    docs = [
+        {"_id": "l1", "role": "lights", "name": "Pricey", "standardRate": 90_000, "crewSize": 8},
+        {"_id": "l2", "role": "lights", "name": "Small Crew", "standardRate": 10_000, "crewSize": 2},
+        {"_id": "l3", "role": "lights", "name": "Glow", "standardRate": 25_000, "crewSize": 6},
+        {"_id": "l4", "role": "lights", "name": "Beam", "standardRate": 20_000, "crewSize": 5},
+    ]
+
+    monkeypatch.setattr(provider_cache, "_CACHE", ProviderCatalogCache(ttl_seconds=0, max_entries=1))
+    monkeypatch.setattr(provider_repository, "_catalog_ready", lambda: False)
+    monkeypatch.setattr(provider_repository, "_query_users", lambda role_key, city, limit, fields=None, filters=None: docs)
+
+    result = provider_repository.list_lighting(city=None, limit=2, max_budget_lkr=30_000, min_crew_size=4)
+
+    assert [item["name"] for item in result] == ["Beam", "Glow"]
+
+
+class CountingUsers:
+    def __init__(self, docs_by_id: Dict[Any, Dict[str, Any]]) -> None:
+        self.docs_by_id = docs_by_id
+        self.find_one_calls = 0
+
+    def find_one(self, query, projection=None):
+        self.find_one_calls += 1
+        return self.docs_by_id.get(query["_id"])
+
+    def find(self, *args, **kwargs):  # pragma: no cover - must not be used
+        raise AssertionError("venue lookup must not scan the users collection")
+
+
+@pytest.mark.parametrize("catalog_size", [10, 10_000])
+def test_find_venue_by_name_cost_is_independent_of_catalog_size(
+    monkeypatch: pytest.MonkeyPatch, catalog_size: int
+) -> None:
+    names = VenueNameIndex()
+    names.replace({f"venue {i}": f"id-{i}" for i in range(catalog_size)})
+    target_id = f"id-{catalog_size // 2}"
+    users = CountingUsers({target_id: {"_id": target_id, "venueName": f"Venue {catalog_size // 2}"}})
+
+    monkeypatch.setattr(provider_repository, "venue_name_index", lambda: names)
+    monkeypatch.setattr(provider_repository, "get_users_collection", lambda: users)
+    monkeypatch.setattr(provider_repository, "_catalog_ready", lambda: True)
+
+    doc = provider_repository.find_venue_by_name(f"  VENUE   {catalog_size // 2} ")
+
+    assert doc is not None and doc["_id"] == target_id
+    assert users.find_one_calls == 1
+
+
+def test_provider_page_seeks_past_cursor(monkeypatch: pytest.MonkeyPatch) -> None:
+    docs = [
+        {"_id": f"l{i}", "role": "lights", "name": f"Crew {i}", "standardRate": rate, "crewSize": 4}
+        for i, rate in enumerate([30_000, 10_000, 20_000, 10_000, None])
+    ]
+
+    monkeypatch.setattr(provider_cache, "_CACHE", ProviderCatalogCache(ttl_seconds=0, max_entries=1))
+    monkeypatch.setattr(provider_repository, "_catalog_ready", lambda: False)
+    monkeypatch.setattr(provider_repository, "_query_users", lambda role_key, city, limit, fields=None, filters=None: docs)
+
+    names: List[str] = []
+    cursor = None
+    for _ in range(5):
+        page, cursor = provider_repository.provider_page("lights", city="Colombo", limit=2, cursor=cursor)
+        names.extend(item["name"] for item in page)
+        if cursor is None:
+            break
+
+    assert names == ["Crew 1", "Crew 3", "Crew 2", "Crew 0", "Crew 4"]
+    with pytest.raises(pagination.InvalidCursor):
+        provider_repository.provider_page("venue", cursor=pagination.encode_cursor("lights", None, [1, "x"]))
+
+
+def test_keyset_filter_seeks_on_sort_key() -> None:
+    sort = [("sort_rate", 1), ("experience_len", -1), ("_id", 1)]
+    assert pagination.keyset_filter(sort, [100, 7, "x"]) == {
+        "$or": [
+            {"sort_rate": {"$gt": 100}},
+            {"sort_rate": 100, "experience_len": {"$lt": 7}},
+            {"sort_rate": 100, "experience_len": 7, "_id": {"$gt": "x"}},
+        ]
+    }
+
+
+class SyncCursor(list):
+    def sort(self, field, direction):
+        return SyncCursor(sorted(self, key=lambda doc: doc[field], reverse=direction < 0))
+
+
+class SyncUsers:
+    def __init__(self, docs: List[Dict[str, Any]]) -> None:
+        self.docs = docs
+        self.queries: List[Dict[str, Any]] = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        if "_id" in query:
+            return SyncCursor(doc for doc in self.docs if doc["_id"] in query["_id"]["$in"])
+        return SyncCursor(doc for doc in self.docs if doc.get("updatedAt", 0) > query["updatedAt"]["$gt"])
+
+
+class SyncCatalog:
+    def __init__(self, ids: List[Any]) -> None:
+        self.records = {key: {"_id": key} for key in ids}
+
+    def find(self, query, projection=None):
+        return SyncCursor(dict(record) for record in self.records.values())
+
+    def replace_one(self, query, record, upsert=False):
+        self.records[query["_id"]] = record
+
+    def delete_one(self, query):
+        self.records.pop(query["_id"], None)
+
+    def bulk_write(self, *args, **kwargs):  # pragma: no cover - must not be used
+        raise AssertionError("polling changes must not rebuild the whole catalog")
+
+
+def test_polled_changes_are_applied_from_the_watermark(monkeypatch: pytest.MonkeyPatch) -> None:
+    users = SyncUsers(
+        [
+            {"_id": "l1", "role": "lights", "name": "Glow", "standardRate": "20000", "updatedAt": 1},
+            {"_id": "l2", "role": "lights", "name": "Beam", "standardRate": "30000", "updatedAt": 5},
+            {"_id": "u1", "role": "user", "name": "Guest", "updatedAt": 6},
+        ]
+    )
+    catalog = SyncCatalog(["l1", "l2", "u1", "gone"])
+    invalidations: List[None] = []
+    monkeypatch.setattr(provider_catalog, "get_users_collection", lambda: users)
+    monkeypatch.setattr(provider_catalog, "get_provider_catalog_collection", lambda: catalog)
+    monkeypatch.setattr(provider_catalog, "invalidate_provider_cache", lambda: invalidations.append(None))
+    monkeypatch.setattr(provider_catalog, "venue_name_index", lambda: VenueNameIndex())
+    monkeypatch.setattr(provider_catalog, "provider_search_index", lambda: ProviderSearchIndex())
+    monkeypatch.setattr(provider_catalog, "rate_stats", lambda: RateStats())
+
+    sync = ProviderCatalogSync()
+    sync.watermark = 3
+    sync.apply_change(None)
+
+    # Only documents past the watermark are read; a non-provider loses its record
+    assert users.queries == [{"updatedAt": {"$gt": 3}}]
+    assert catalog.records["l2"]["views"]["lights"]["name"] == "Beam"
+    assert catalog.records["l1"] == {"_id": "l1"}
+    assert "u1" not in catalog.records
+    assert sync.watermark == 6
+    assert not sync._reconcile_requested.is_set()
+
+    # Nothing newer: the change was a delete, found by checking ids only
+    sync.apply_change(None)
+    assert users.queries[-1] == {"_id": {"$in": ["l1", "l2", "gone"]}}
+    assert set(catalog.records) == {"l1", "l2"}
+    assert len(invalidations) == 2
+
+
+def test_polled_change_before_first_reconcile_requests_one() -> None:
+    sync = ProviderCatalogSync()
+    sync.apply_change(None)
+    assert sync._reconcile_requested.is_set()
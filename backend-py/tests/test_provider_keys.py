@@ -0,0 +1,78 @@
+"""Normalised provider key derivation and indexed query construction."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+from types import SimpleNamespace
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import provider_keys as provider_keys_module  # noqa: E402
+from utils import provider_queries, provider_repository  # noqa: E402
+from utils.provider_keys import key_filter, provider_keys  # noqa: E402
+
+
+def test_provider_keys_tokenise_role_and_address_fields() -> None:
+    keys = provider_keys(
+        {"role": "Lighting Designer", "city": "Colombo 07", "venueAddress": "12 Galle Road, Colombo"}
+    )
+    assert keys["role_key"] == "lighting_designer"
+    assert keys["city_key"] == ["07", "12", "colombo", "galle", "road"]
+
+
+def test_key_filter_uses_exact_matches() -> None:
+    query = key_filter(("lights", "lighting designer"), "Colombo 07")
+    assert query == {"role_key": {"$in": ["lighting_designer", "lights"]}, "city_key": {"$all": ["colombo", "07"]}}
+    assert key_filter(("venue",), "Kandy")["city_key"] == "kandy"
+
+
+def test_query_users_prefers_keyed_filter_when_index_ready(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured = {}
+
+    class FakeCollection:
+        def find(self, query, *args, **kwargs):
+            captured["query"] = query
+            return []
+
+    monkeypatch.setattr(provider_repository, "get_users_collection", lambda: FakeCollection())
+    monkeypatch.setattr(provider_queries, "keyed_queries_enabled", lambda: True)
+
+    provider_repository._query_users("venue", city="Kandy", limit=None)
+
+    keyed, legacy = captured["query"]["$or"]
+    assert keyed["city_key"] == "kandy"
+    assert "venue" in keyed["role_key"]["$in"]
+    assert legacy["role_key"] == {"$exists": False}
+    assert "$regex" in legacy["role"]
+
+
+def test_missing_key_index_is_rechecked_after_the_ttl(monkeypatch: pytest.MonkeyPatch) -> None:
+    indexes = {}
+    probes = []
+    watched = []
+
+    class FakeUsers:
+        def index_information(self):
+            probes.append(1)
+            return dict(indexes)
+
+    clock = [1000.0]
+    monkeypatch.setattr(provider_keys_module, "_INDEX_STATE", {})
+    monkeypatch.setattr(provider_keys_module, "get_users_collection", lambda: FakeUsers())
+    monkeypatch.setattr(provider_keys_module, "watch_provider_keys", lambda: watched.append(1))
+    monkeypatch.setattr(provider_keys_module, "time", SimpleNamespace(monotonic=lambda: clock[0]))
+
+    assert provider_keys_module.keyed_queries_enabled() is False
+    indexes[provider_keys_module.KEY_INDEX_NAME] = {}  # migration runs
+    assert provider_keys_module.keyed_queries_enabled() is False  # still within the TTL
+    assert len(probes) == 1
+
+    clock[0] += provider_keys_module._INDEX_RECHECK_SECONDS
+    assert provider_keys_module.keyed_queries_enabled() is True
+    assert provider_keys_module.keyed_queries_enabled() is True
+    assert len(probes) == 2 and watched == [1]
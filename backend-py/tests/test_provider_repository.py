@@ -0,0 +1,242 @@
+"""Provider repository query shapes against a fake Mongo collection."""
+
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import sys
+from typing import Any, Dict, List
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import async_provider_repository, provider_cache  # noqa: E402
+from utils import provider_queries, provider_repository  # noqa: E402
+from utils.provider_cache import ProviderCatalogCache  # noqa: E402
+from utils.venue_name_index import VenueNameIndex  # noqa: E402
+
+
+class FakeUsers:
+    def __init__(self, facet_result: Dict[str, List[Dict[str, Any]]]) -> None:
+        self.facet_result = facet_result
+        self.pipelines: List[List[Dict[str, Any]]] = []
+
+    def aggregate(self, pipeline):
+        self.pipelines.append(pipeline)
+        return iter([self.facet_result])
+
+    def find(self, *args, **kwargs):  # pragma: no cover - must not be used
+        raise AssertionError("snapshot should not issue per-role find() calls")
+
+
+@pytest.fixture(autouse=True)
+def isolated_cache(monkeypatch: pytest.MonkeyPatch) -> None:
+    monkeypatch.setattr(provider_cache, "_CACHE", ProviderCatalogCache(ttl_seconds=0, max_entries=1))
+    monkeypatch.setattr(provider_queries, "keyed_queries_enabled", lambda: False)
+
+
+def test_provider_snapshot_uses_single_facet_aggregation(monkeypatch: pytest.MonkeyPatch) -> None:
+    users = FakeUsers(
+        {
+            "venues": [{"_id": "v1", "venueName": "Harbour Deck", "capacity": "250-340", "standardRate": "75000"}],
+            "solo_musicians": [{"_id": "m1", "name": "Aisha", "standardRate": 150000}],
+            "music_ensembles": [],
+            "lighting_designers": [{"name": "Glow", "services": "Stage Lighting", "crewSize": "6"}],
+            "sound_specialists": [{"companyName": "SoundLab", "standardRate": 110000}],
+        }
+    )
+    monkeypatch.setattr(provider_repository, "get_users_collection", lambda: users)
+
+    snapshot = provider_repository.provider_snapshot(city="Colombo", limit=3)
+
+    assert len(users.pipelines) == 1
+    projection = users.pipelines[0][1]["$project"]
+    assert "password" not in projection and "venueName" in projection
+    facet = users.pipelines[0][2]["$facet"]
+    assert set(facet) == set(snapshot)
+    assert all(stages[-1] == {"$limit": 3} for stages in facet.values())
+
+    venue = snapshot["venues"][0]
+    assert venue["name"] == "Harbour Deck"
+    assert venue["capacity"] == 340
+    assert venue["avg_cost_lkr"] == 75000
+    assert snapshot["lighting_designers"][0]["services"] == ["Stage Lighting"]
+    assert snapshot["sound_specialists"][0]["name"] == "SoundLab"
+    assert snapshot["music_ensembles"] == []
+
+
+def test_list_functions_send_field_projection(monkeypatch: pytest.MonkeyPatch) -> None:
+    captured: Dict[str, Any] = {}
+
+    class FakeCursor(list):
+        def sort(self, field, direction):
+            captured["sort"] = (field, direction)
+            return self
+
+        def limit(self, n):
+            captured["limit"] = n
+            return self
+
+    class FakeCollection:
+        def find(self, query, projection=None):
+            captured["projection"] = projection
+            return FakeCursor([{"_id": "s1", "companyName": "SoundLab", "crewSize": "4"}])
+
+    monkeypatch.setattr(provider_repository, "get_users_collection", lambda: FakeCollection())
+
+    result = provider_repository.list_sound_specialists(city=None, limit=5)
+
+    assert result[0]["name"] == "SoundLab"
+    assert result[0]["crew_size"] == 4
+    projection = captured["projection"]
+    assert {"companyName", "crewSize", "standardRate", "website"} <= set(projection)
+    assert "profilePhoto" not in projection
+    assert captured["sort"] == ("_id", 1)
+    assert captured["limit"] == provider_queries.users_scan_limit()
+
+
+class FakeAsyncCursor:
+    def __init__(self, docs: List[Dict[str, Any]], calls: List[str]) -> None:
+        self.docs = docs
+        self.calls = calls
+
+    def sort(self, spec):
+        self.calls.append(f"sort:{spec}")
+        return self
+
+    def limit(self, n):
+        self.calls.append(f"limit:{n}")
+        return self
+
+    async def to_list(self, length=None):
+        await asyncio.sleep(0)
+        return list(self.docs)
+
+
+def test_async_provider_page_awaits_the_catalog(monkeypatch: pytest.MonkeyPatch) -> None:
+    calls: List[str] = []
+    docs = [
+        {"_id": i, "roles": ["venue"], "sort_rate": 1000 * i, "views": {"venue": {"name": f"Hall {i}"}}}
+        for i in range(1, 4)
+    ]
+
+    class FakeCatalog:
+        def find(self, query, projection=None):
+            calls.append(f"find:{query['roles']}")
+            return FakeAsyncCursor(docs, calls)
+
+    monkeypatch.setattr(async_provider_repository, "async_driver_available", lambda: True)
+    monkeypatch.setattr(async_provider_repository, "catalog_known_state", lambda: True)
+    monkeypatch.setattr(async_provider_repository, "get_async_provider_catalog_collection", lambda: FakeCatalog())
+
+    page, cursor = asyncio.run(async_provider_repository.provider_page("venue", limit=2))
+
+    assert [item["name"] for item in page] == ["Hall 1", "Hall 2"]
+    assert cursor is not None
+    assert calls == ["find:venue", "sort:[('sort_rate', 1), ('_id', 1)]", "limit:3"]
+
+
+def test_async_provider_snapshot_awaits_one_facet_aggregation(monkeypatch: pytest.MonkeyPatch) -> None:
+    pipelines: List[List[Dict[str, Any]]] = []
+    facet_result = {
+        "venues": [{"_id": "v1", "venueName": "Harbour Deck", "capacity": "250-340"}],
+        "solo_musicians": [],
+        "music_ensembles": [],
+        "lighting_designers": [],
+        "sound_specialists": [{"companyName": "SoundLab", "standardRate": 110000}],
+    }
+
+    class FakeAsyncUsers:
+        async def aggregate(self, pipeline):
+            pipelines.append(pipeline)
+            return FakeAsyncCursor([facet_result], [])
+
+    monkeypatch.setattr(async_provider_repository, "async_driver_available", lambda: True)
+    monkeypatch.setattr(async_provider_repository, "catalog_known_state", lambda: False)
+    monkeypatch.setattr(async_provider_repository, "get_async_users_collection", lambda: FakeAsyncUsers())
+
+    snapshot = asyncio.run(async_provider_repository.provider_snapshot(city="Colombo", limit=3))
+
+    assert len(pipelines) == 1
+    assert set(pipelines[0][2]["$facet"]) == set(snapshot)
+    assert snapshot["venues"][0]["name"] == "Harbour Deck"
+    assert snapshot["venues"][0]["capacity"] == 340
+    assert snapshot["sound_specialists"][0]["name"] == "SoundLab"
+    assert snapshot["music_ensembles"] == []
+
+
+def test_catalog_probe_records_readiness(monkeypatch: pytest.MonkeyPatch) -> None:
+    probes: List[Dict[str, Any]] = []
+
+    class FakeCatalog:
+        def find_one(self, query, projection=None):
+            probes.append(query)
+            return {"_id": "v1"}
+
+    monkeypatch.setenv("PROVIDER_CATALOG_SOURCE", "catalog")
+    monkeypatch.setattr(provider_queries, "_CATALOG_STATE", {"ready": False, "checked_at": None})
+    monkeypatch.setattr(provider_repository, "get_provider_catalog_collection", lambda: FakeCatalog())
+
+    assert provider_repository._catalog_ready() is True
+    assert provider_repository._catalog_ready() is True
+    assert len(probes) == 1
+    assert provider_queries.catalog_known_state() is True
+
+
+def test_async_find_venue_by_name_awaits_the_catalog_key(monkeypatch: pytest.MonkeyPatch) -> None:
+    lookups: List[Dict[str, Any]] = []
+
+    class FakeCatalog:
+        async def find_one(self, query, projection=None):
+            lookups.append(query)
+            return {"_id": "v7"} if query["name_key"] == "harbour deck" else None
+
+    class FakeUsers:
+        async def find_one(self, query):
+            return {"_id": query["_id"], "venueName": "Harbour Deck"}
+
+    monkeypatch.setattr(async_provider_repository, "async_driver_available", lambda: True)
+    monkeypatch.setattr(async_provider_repository, "catalog_known_state", lambda: True)
+    names = VenueNameIndex()
+    monkeypatch.setattr(async_provider_repository, "venue_name_index", lambda: names)
+    monkeypatch.setattr(async_provider_repository, "get_async_provider_catalog_collection", lambda: FakeCatalog())
+    monkeypatch.setattr(async_provider_repository, "get_async_users_collection", lambda: FakeUsers())
+
+    doc = asyncio.run(async_provider_repository.find_venue_by_name("  Harbour   DECK "))
+
+    assert doc == {"_id": "v7", "venueName": "Harbour Deck"}
+    assert lookups == [{"name_key": "harbour deck", "roles": "venue"}]
+    assert names.get("harbour deck") == "v7"
+    assert asyncio.run(async_provider_repository.find_venue_by_name("Nowhere")) is None
+
+
+def test_async_users_fallback_probes_the_key_index_off_the_loop(monkeypatch: pytest.MonkeyPatch) -> None:
+    probes: List[str] = []
+
+    def probe() -> bool:
+        with pytest.raises(RuntimeError):
+            asyncio.get_running_loop()
+        probes.append("probe")
+        return False
+
+    class FakeUsersCursor(FakeAsyncCursor):
+        def sort(self, field, direction):
+            return self
+
+    class FakeAsyncUsers:
+        def find(self, query, projection=None):
+            return FakeUsersCursor([{"_id": "s1", "companyName": "SoundLab"}], [])
+
+    monkeypatch.setattr(async_provider_repository, "async_driver_available", lambda: True)
+    monkeypatch.setattr(async_provider_repository, "catalog_known_state", lambda: False)
+    monkeypatch.setattr(async_provider_repository, "key_index_known", lambda: bool(probes))
+    monkeypatch.setattr(async_provider_repository, "keyed_queries_enabled", probe)
+    monkeypatch.setattr(async_provider_repository, "get_async_users_collection", lambda: FakeAsyncUsers())
+
+    page = asyncio.run(async_provider_repository.list_sound_specialists(limit=5))
+
+    assert page[0]["name"] == "SoundLab"
+    assert probes == ["probe"]
@@ -0,0 +1,130 @@
+"""In-memory provider search index: fuzzy matching and catalog integration."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils import provider_queries, provider_repository, provider_search  # noqa: E402
+from utils.mongo_client import MongoUnavailable  # noqa: E402
+from utils.provider_search import ProviderSearchIndex, tokens  # noqa: E402
+
+
+def _record(doc_id, name, roles, **view):
+    return {"_id": doc_id, "name": name, "roles": roles, "views": {role: {"name": name, **view} for role in roles}}
+
+
+@pytest.fixture()
+def index() -> ProviderSearchIndex:
+    index = ProviderSearchIndex()
+    index.replace(
+        [
+            _record("a", "Blue Note Trio", ["music_ensemble"], genres=["Jazz", "Blues"]),
+            _record("b", "Beat Lab", ["solo_musician"], genres=["Hip-Hop"]),
+            _record("c", "Lumen Crew", ["lights"], services=["LED Walls", "Stage Lighting"]),
+            _record("d", "ProSound", ["sound_specialist"], services=["Live Sound", "Recording"]),
+            _record("e", "Jazz Garden", ["venue"], type="Garden"),
+        ]
+    )
+    return index
+
+
+def test_tokens_include_compound_form() -> None:
+    assert tokens(["Hip-Hop", "Jazz"]) == {"hip", "hop", "hiphop", "jazz"}
+
+
+def test_fuzzy_genre_and_name_matching(index: ProviderSearchIndex) -> None:
+    music = ["solo_musician", "music_ensemble"]
+    assert index.search(music, genre="jaz") == {"a"}
+    assert index.search(music, genre="hiphop") == {"b"}
+    assert index.search(music, genre="hip hop") == {"b"}
+    assert index.search(music, q="blu note") == {"a"}
+    assert index.search(music, genre="metal") == set()
+
+
+def test_search_is_scoped_to_roles(index: ProviderSearchIndex) -> None:
+    assert index.search(["venue"], q="jazz") == {"e"}
+    assert index.search(["lights"], service="led") == {"c"}
+    assert index.search(["sound_specialist"], service="recordng") == {"d"}
+    assert index.search(["lights"], service="recording") == set()
+
+
+def test_incremental_apply_and_discard(index: ProviderSearchIndex) -> None:
+    index.apply(_record("b", "Beat Lab", ["solo_musician"], genres=["Jazz"]))
+    assert index.search(["solo_musician"], genre="jazz") == {"b"}
+    assert index.search(["solo_musician"], genre="hiphop") == set()
+
+    index.discard("b")
+    assert index.search(["solo_musician"], genre="jazz") == set()
+    assert len(index) == 4
+
+
+def test_failed_load_backs_off_before_retrying(monkeypatch: pytest.MonkeyPatch) -> None:
+    attempts = []
+
+    def unavailable():
+        attempts.append(1)
+        raise MongoUnavailable("server selection timed out")
+
+    monkeypatch.setattr(provider_search, "get_provider_catalog_collection", unavailable)
+    index = ProviderSearchIndex()
+
+    assert not index.ensure_loaded()
+    assert not index.ensure_loaded()
+    assert len(attempts) == 1
+
+    monkeypatch.setattr(provider_search, "_RETRY_SECONDS", 0.0)
+    monkeypatch.setattr(provider_search, "get_provider_catalog_collection", lambda: _Catalog())
+    assert index.ensure_loaded()
+    assert index.search(["solo_musician"], q="beat") == {"b"}
+
+
+class _Catalog:
+    def find(self, query, projection=None):
+        return [_record("b", "Beat Lab", ["solo_musician"], genres=["Hip-Hop"])]
+
+
+def test_catalog_query_seeks_on_search_ids(monkeypatch: pytest.MonkeyPatch, index: ProviderSearchIndex) -> None:
+    monkeypatch.setattr(provider_queries, "provider_search_index", lambda: index)
+    captured = {}
+
+    class FakeCursor:
+        def __init__(self, query):
+            captured["query"] = query
+
+        def sort(self, sort):
+            return self
+
+        def limit(self, limit):
+            return self
+
+        def __iter__(self):
+            return iter([])
+
+    class FakeCollection:
+        def find(self, query, projection=None):
+            return FakeCursor(query)
+
+    monkeypatch.setattr(provider_repository, "get_provider_catalog_collection", lambda: FakeCollection())
+
+    rows = provider_repository._query_catalog(["lights"], None, 5, {"service": "stage"})
+    assert rows == []
+    assert captured["query"]["_id"] == {"$in": ["c"]}
+
+    captured.clear()
+    # No match in the index: Mongo is never asked.
+    assert provider_repository._query_catalog(["lights"], None, 5, {"q": "turntable"}) == []
+    assert captured == {}
+
+
+def test_users_fallback_matches_service_and_text() -> None:
+    view = {"name": "Lumen Crew", "services": ["LED Walls"], "type": "Lighting"}
+    assert provider_queries.matches_filters(view, {"service": "led"})
+    assert provider_queries.matches_filters(view, {"q": "lumen"})
+    assert not provider_queries.matches_filters(view, {"service": "audio"})
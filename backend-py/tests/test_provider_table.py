@@ -0,0 +1,73 @@
+"""Columnar provider table: vectorised predicates and top-k selection."""
+
+from __future__ import annotations
+
+import pathlib
+import random
+import sys
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils.provider_table import ProviderTable  # noqa: E402
+
+
+def _venues(n: int, seed: int = 7):
+    rng = random.Random(seed)
+    return [
+        {
+            "id": str(i),
+            "name": f"Venue {i}",
+            "type": rng.choice(["Concert Hall", "hotel ballroom", None, "Garden", "Arena"]),
+            "capacity": rng.choice([None, 100, 250, 400, 800]),
+            "rating": rng.choice([None, 3.5, 4.0, 4.5, 5.0]),
+            "standard_rate_lkr": rng.choice([None, 50_000, 90_000, 150_000]),
+            "min_lead_days": rng.choice([None, 7, 30, 60]),
+        }
+        for i in range(n)
+    ]
+
+
+@pytest.mark.parametrize("k", [1, 5, 40, 500])
+def test_top_k_matches_stable_python_sort(k: int) -> None:
+    venues = _venues(300)
+    table = ProviderTable.from_records(venues)
+
+    expected = sorted(venues, key=lambda v: (v["rating"] or 0.0, v["capacity"] or 0), reverse=True)[:k]
+    result = table.rows(table.top_k(k, by=("rating", "capacity")))
+
+    assert [v["id"] for v in result] == [v["id"] for v in expected]
+
+
+def test_masks_filter_like_the_record_predicates() -> None:
+    venues = _venues(200)
+    table = ProviderTable.from_records(venues)
+
+    mask = (
+        table.at_least("capacity", 250)
+        & table.at_most("rate", 90_000)
+        & table.where("type", lambda value: "hall" in value or "arena" in value)
+    )
+    expected = [
+        v["id"]
+        for v in venues
+        if (v["capacity"] or 0) >= 250
+        and (v["standard_rate_lkr"] or 0) <= 90_000
+        and any(token in (v["type"] or "").lower() for token in ("hall", "arena"))
+    ]
+
+    assert [v["id"] for v in table.rows(mask.nonzero()[0])] == expected
+
+
+def test_rows_returns_copies_of_selected_records_only() -> None:
+    venues = _venues(10)
+    table = ProviderTable.from_records(venues)
+
+    picked = table.rows([3])
+    picked[0]["name"] = "changed"
+
+    assert venues[3]["name"] == "Venue 3"
+    assert table.top_k(3, by=("rating",), mask=table.all_rows() & False).size == 0
@@ -3,6 +3,7 @@
 from __future__ import annotations
 
 import pathlib
+import re
 import sys
 from typing import Any, Dict, List
 
@@ -20,6 +21,8 @@ os.environ.setdefault("PLANNER_API_KEY", "test-planner-key")
 
 from main import app  # noqa: E402
 import routers.providers as providers  # noqa: E402
+from utils import async_provider_repository, provider_cache, provider_queries, provider_repository  # noqa: E402
+from utils.provider_cache import ProviderCatalogCache  # noqa: E402
 
 
 @pytest.fixture
@@ -29,24 +32,88 @@ def client() -> TestClient:
     return test_client
 
 
-def test_venue_endpoint_falls_back_to_all(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
-    calls: List[Dict[str, Any]] = []
+def _value_matches(value: Any, pattern: re.Pattern) -> bool:
+    values = value if isinstance(value, list) else [value]
+    return any(isinstance(item, str) and pattern.search(item) for item in values)
+
+
+def _matches(doc: Dict[str, Any], query: Dict[str, Any]) -> bool:
+    for field, cond in query.items():
+        if field == "$and":
+            if not all(_matches(doc, clause) for clause in cond):
+                return False
+        elif field == "$or":
+            if not any(_matches(doc, clause) for clause in cond):
+                return False
+        elif isinstance(cond, dict) and "$regex" in cond:
+            if not _value_matches(doc.get(field), cond["$regex"]):
+                return False
+        elif isinstance(cond, re.Pattern):
+            if not _value_matches(doc.get(field), cond):
+                return False
+        elif doc.get(field) != cond:
+            return False
+    return True
+
+
+class FakeUsersCursor(list):
+    def sort(self, field, direction):
+        return FakeUsersCursor(sorted(self, key=lambda doc: str(doc[field]), reverse=direction < 0))
+
+    def limit(self, count):
+        return FakeUsersCursor(self[:count])
+
+    async def to_list(self, length=None):
+        return list(self)
+
+
+class FakeUsers:
+    """Users collection that evaluates the role/city/text regex queries the repository sends."""
+
+    def __init__(self, docs: List[Dict[str, Any]]) -> None:
+        self.docs = docs
+        self.queries: List[Dict[str, Any]] = []
+
+    def find(self, query, projection=None):
+        self.queries.append(query)
+        return FakeUsersCursor(doc for doc in self.docs if _matches(doc, query))
 
-    def fake_list_venues(*, city: str | None, limit: int) -> List[Dict[str, Any]]:
-        calls.append({"city": city, "limit": limit})
-        if city == "Nowhere":
-            return []
-        return [
-            {
-                "id": "1",
-                "name": "Fallback Hall",
-                "capacity": 320,
-                "avg_cost_lkr": 450_000,
-                "standard_rate_lkr": 470_000,
-            }
-        ]
 
-    monkeypatch.setattr(providers, "list_venues", fake_list_venues)
+@pytest.fixture
+def users(monkeypatch: pytest.MonkeyPatch):
+    """Serve listings from the raw users fallback backed by a fake collection."""
+
+    def install(docs: List[Dict[str, Any]]) -> FakeUsers:
+        collection = FakeUsers(docs)
+        monkeypatch.setattr(provider_repository, "get_users_collection", lambda: collection)
+        monkeypatch.setattr(async_provider_repository, "get_async_users_collection", lambda: collection)
+        return collection
+
+    monkeypatch.setattr(provider_cache, "_CACHE", ProviderCatalogCache(ttl_seconds=0, max_entries=1))
+    monkeypatch.setattr(provider_queries, "keyed_queries_enabled", lambda: False)
+    monkeypatch.setattr(async_provider_repository, "key_index_known", lambda: True)
+    monkeypatch.setattr(provider_repository, "_catalog_ready", lambda: False)
+    monkeypatch.setattr(async_provider_repository, "catalog_known_state", lambda: False)
+    return install
+
+
+def _city_clause(query: Dict[str, Any]) -> Dict[str, Any]:
+    role_query = query["$and"][0] if "$and" in query else query
+    return role_query.get("$or")
+
+
+def test_venue_endpoint_falls_back_to_all(client: TestClient, users) -> None:
+    collection = users(
+        [
+            {"_id": "v1", "role": "venue", "venueName": "Fallback Hall", "city": "Galle",
+             "capacity": "320", "avgCost": "450000", "standardRate": "470000"},
+            {"_id": "v2", "role": "venue", "venueName": "Tiny Room", "city": "Galle",
+             "capacity": "80", "standardRate": "90000"},
+            {"_id": "v3", "role": "venue", "venueName": "Grand Ballroom", "city": "Kandy",
+             "capacity": "800", "avgCost": "900000"},
+            {"_id": "m1", "role": "musician", "name": "Not A Venue", "capacity": "500"},
+        ]
+    )
 
     response = client.get(
         "/planner/providers/venue",
@@ -55,61 +122,31 @@ def test_venue_endpoint_falls_back_to_all(monkeypatch: pytest.MonkeyPatch, clien
 
     assert response.status_code == 200
     data = response.json()
-    assert calls == [{"city": "Nowhere", "limit": 5}, {"city": None, "limit": 5}]
+    # One bounded users query for the city, then one for the fallback without it
+    assert len(collection.queries) == 2
+    assert _city_clause(collection.queries[0])[0]["city"].pattern == "Nowhere"
+    assert _city_clause(collection.queries[1]) is None
     assert len(data) == 1
     assert data[0]["name"] == "Fallback Hall"
     assert data[0]["capacity"] >= 300
     assert data[0]["avg_cost_lkr"] <= 500_000
 
 
-def test_music_endpoint_filters_and_fallback(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
-    solo_calls: List[str | None] = []
-    band_calls: List[str | None] = []
-
-    def fake_list_solo_musicians(*, city: str | None, limit: int) -> List[Dict[str, Any]]:
-        solo_calls.append(city)
-        if city == "Nowhere":
-            return []
-        return [
-            {
-                "id": "solo-1",
-                "name": "Fallback Soloist",
-                "genres": ["Jazz", "Soul"],
-                "standard_rate_lkr": 40_000,
-                "experience": "8 years",
-            },
-            {
-                "id": "solo-2",
-                "name": "Rock Hero",
-                "genres": ["Rock"],
-                "standard_rate_lkr": 55_000,
-                "experience": "5 years",
-            },
+def test_music_endpoint_filters_and_fallback(client: TestClient, users) -> None:
+    collection = users(
+        [
+            {"_id": "solo-1", "role": "musician", "name": "Fallback Soloist", "genres": ["Jazz", "Soul"],
+             "standardRate": "40000", "experience": "8 years"},
+            {"_id": "solo-2", "role": "musician", "name": "Rock Hero", "genres": ["Rock"],
+             "standardRate": "55000", "experience": "5 years"},
+            {"_id": "solo-3", "role": "musician", "name": "Pricey Crooner", "genre": "Jazz",
+             "standardRate": "75000"},
+            {"_id": "band-1", "role": "music_band", "bandName": "Colombo Jazz Collective",
+             "genres": ["Jazz", "Funk"], "members": "5", "standardRate": "60000"},
+            {"_id": "band-2", "role": "music_band", "bandName": "Electric Noise", "genres": ["EDM"],
+             "members": "3", "standardRate": "35000"},
         ]
-
-    def fake_list_music_ensembles(*, city: str | None, limit: int) -> List[Dict[str, Any]]:
-        band_calls.append(city)
-        if city == "Nowhere":
-            return []
-        return [
-            {
-                "id": "band-1",
-                "name": "Colombo Jazz Collective",
-                "genres": ["Jazz", "Funk"],
-                "members": 5,
-                "standard_rate_lkr": 60_000,
-            },
-            {
-                "id": "band-2",
-                "name": "Electric Noise",
-                "genres": ["EDM"],
-                "members": 3,
-                "standard_rate_lkr": 35_000,
-            },
-        ]
-
-    monkeypatch.setattr(providers, "list_solo_musicians", fake_list_solo_musicians)
-    monkeypatch.setattr(providers, "list_music_ensembles", fake_list_music_ensembles)
+    )
 
     response = client.get(
         "/planner/providers/music",
@@ -119,36 +156,34 @@ def test_music_endpoint_filters_and_fallback(monkeypatch: pytest.MonkeyPatch, cl
     assert response.status_code == 200
     items = response.json()
 
-    # ensure fallbacks were triggered for both solo and band lookups
-    assert solo_calls == ["Nowhere", None]
-    assert band_calls == ["Nowhere", None]
+    # solo and band roles are queried for the city, then again without it
+    assert len(collection.queries) == 4
+    for query in collection.queries:
+        genre_clause = query["$and"][1]["$or"]
+        assert [list(clause) for clause in genre_clause] == [["genres"], ["genre"]]
+        assert genre_clause[0]["genres"].pattern == "jazz"
+        assert genre_clause[0]["genres"].flags & re.IGNORECASE
 
     # Only the jazz-friendly providers under the budget should remain (one solo, one band)
     assert len(items) == 2
     assert all("Jazz" in "|".join((provider.get("genres") or [])) for provider in items)
-    assert {item["provider_type"] for item in items} == {"solo", "band"}
+    assert [item["provider_type"] for item in items] == ["solo", "band"]
     assert all((item.get("standard_rate_lkr") or 0) <= 60_000 for item in items)
 
 
-def test_lighting_endpoint_applies_filters(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
-    calls: List[str | None] = []
-
-    def fake_list_lighting(*, city: str | None, limit: int) -> List[Dict[str, Any]]:
-        calls.append(city)
-        return [
-            {
-                "name": "Bright Spark Lighting",
-                "standard_rate_lkr": 28_000,
-                "crew_size": 6,
-            },
-            {
-                "name": "Crew Lite",
-                "standard_rate_lkr": 22_000,
-                "crew_size": 3,
-            },
+def test_lighting_endpoint_applies_filters(client: TestClient, users) -> None:
+    collection = users(
+        [
+            {"_id": "l1", "role": "lights", "name": "Bright Spark Lighting", "city": "Colombo",
+             "standardRate": "28000", "crewSize": "6"},
+            {"_id": "l2", "role": "lights", "name": "Crew Lite", "city": "Colombo",
+             "standardRate": "22000", "crewSize": "3"},
+            {"_id": "l3", "role": "lighting", "name": "Pricey Beam", "city": "Colombo 07",
+             "standardRate": "90000", "crewSize": "8"},
+            {"_id": "l4", "role": "lights", "name": "Kandy Glow", "city": "Kandy",
+             "standardRate": "20000", "crewSize": "5"},
         ]
-
-    monkeypatch.setattr(providers, "list_lighting", fake_list_lighting)
+    )
 
     response = client.get(
         "/planner/providers/lighting",
@@ -157,34 +192,23 @@ def test_lighting_endpoint_applies_filters(monkeypatch: pytest.MonkeyPatch, clie
 
     assert response.status_code == 200
     results = response.json()
-    assert calls == ["Colombo"]
+    assert len(collection.queries) == 1
+    assert "$and" not in collection.queries[0]  # numeric filters are applied after parsing
     assert len(results) == 1
     assert results[0]["name"] == "Bright Spark Lighting"
     assert results[0]["standard_rate_lkr"] <= 30_000
     assert results[0]["crew_size"] >= 4
 
 
-def test_sound_endpoint_fallback_and_filters(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
-    calls: List[str | None] = []
-
-    def fake_list_sound_specialists(*, city: str | None, limit: int) -> List[Dict[str, Any]]:
-        calls.append(city)
-        if city == "Nowhere":
-            return []
-        return [
-            {
-                "name": "Audio Masters",
-                "standard_rate_lkr": 45_000,
-                "crew_size": 5,
-            },
-            {
-                "name": "Compact Audio",
-                "standard_rate_lkr": 25_000,
-                "crew_size": 2,
-            },
+def test_sound_endpoint_fallback_and_filters(client: TestClient, users) -> None:
+    collection = users(
+        [
+            {"_id": "s1", "role": "sounds", "companyName": "Audio Masters", "city": "Colombo",
+             "standardRate": "45000", "crewSize": "5"},
+            {"_id": "s2", "role": "sound engineer", "companyName": "Compact Audio", "city": "Colombo",
+             "standardRate": "25000", "crewSize": "2"},
         ]
-
-    monkeypatch.setattr(providers, "list_sound_specialists", fake_list_sound_specialists)
+    )
 
     response = client.get(
         "/planner/providers/sound",
@@ -194,8 +218,74 @@ def test_sound_endpoint_fallback_and_filters(monkeypatch: pytest.MonkeyPatch, cl
     assert response.status_code == 200
     data = response.json()
 
-    assert calls == ["Nowhere", None]
+    assert [_city_clause(query) is None for query in collection.queries] == [False, True]
     assert len(data) == 1
     assert data[0]["name"] == "Audio Masters"
     assert data[0]["standard_rate_lkr"] <= 50_000
     assert data[0]["crew_size"] >= 4
+
+
+def test_users_fallback_reads_a_bounded_window(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient, users
+) -> None:
+    collection = users(
+        [
+            {"_id": f"s{i}", "role": "sounds", "companyName": f"Crew {i}", "standardRate": str(50_000 - i)}
+            for i in range(6)
+        ]
+    )
+    monkeypatch.setenv("PROVIDER_USERS_SCAN_LIMIT", "4")
+
+    response = client.get("/planner/providers/sound", params={"limit": 10, "q": "crew"})
+
+    assert response.status_code == 200
+    # Only the first four documents by _id are read, then ordered by rate
+    assert [item["name"] for item in response.json()] == ["Crew 3", "Crew 2", "Crew 1", "Crew 0"]
+    q_clause = collection.queries[0]["$and"][1]["$or"]
+    assert {"name", "companyName", "services"} <= {field for clause in q_clause for field in clause}
+
+
+def test_listing_pages_through_next_cursor(monkeypatch: pytest.MonkeyPatch, client: TestClient) -> None:
+    calls: List[Dict[str, Any]] = []
+
+    async def fake_provider_page(listing: str, *, city: str | None, limit: int, cursor: str | None = None, **filters):
+        calls.append({"city": city, "cursor": cursor})
+        if cursor is None:
+            return [{"name": "Page One", "standard_rate_lkr": 10_000}], "abc"
+        return [{"name": "Page Two", "standard_rate_lkr": 20_000}], None
+
+    monkeypatch.setattr(providers, "provider_page", fake_provider_page)
+
+    first = client.get("/planner/providers/lighting", params={"city": "Colombo", "limit": 1})
+    assert first.status_code == 200
+    assert first.headers["X-Next-Cursor"] == "abc"
+
+    second = client.get("/planner/providers/lighting", params={"city": "Colombo", "limit": 1, "cursor": "abc"})
+    assert second.status_code == 200
+    assert second.json()[0]["name"] == "Page Two"
+    assert "X-Next-Cursor" not in second.headers
+    assert calls == [{"city": "Colombo", "cursor": None}, {"city": "Colombo", "cursor": "abc"}]
+
+
+def test_listing_rejects_foreign_cursor(client: TestClient) -> None:
+    response = client.get("/planner/providers/venue", params={"cursor": "not-a-cursor"})
+    assert response.status_code == 400
+
+
+def test_venue_near_resolves_point_and_rejects_unknown_places(
+    monkeypatch: pytest.MonkeyPatch, client: TestClient
+) -> None:
+    calls: List[Dict[str, Any]] = []
+
+    async def fake_provider_page(listing: str, *, city: str | None, limit: int, cursor: str | None = None, **filters):
+        calls.append(filters)
+        return [], None
+
+    monkeypatch.setattr(providers, "provider_page", fake_provider_page)
+
+    response = client.get("/planner/providers/venue", params={"near": "6.05,80.22", "radius_km": 10})
+    assert response.status_code == 200
+    assert calls[0]["near"] == (80.22, 6.05)
+    assert calls[0]["radius_km"] == 10
+
+    assert client.get("/planner/providers/venue", params={"near": "Atlantis"}).status_code == 400
@@ -0,0 +1,128 @@
+"""Per-(role, city) rate statistics used for budget estimation."""
+
+from __future__ import annotations
+
+import pathlib
+import sys
+import threading
+import time
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from planner import service  # noqa: E402
+from utils import concept_context  # noqa: E402
+from utils import rate_stats as rate_stats_module  # noqa: E402
+from utils.mongo_client import MongoUnavailable  # noqa: E402
+from utils.rate_stats import PER_SEAT_ROLE, RateStats  # noqa: E402
+
+
+def _venue(doc_id, city, cost, capacity=0):
+    view = {"avg_cost_lkr": cost, "address": None, "capacity": capacity}
+    return {"_id": doc_id, "city": city, "views": {"venue": view}}
+
+
+def _musician(doc_id, city, rate, role="solo_musician"):
+    return {"_id": doc_id, "city": city, "views": {role: {"standard_rate_lkr": rate}}}
+
+
+@pytest.fixture()
+def stats() -> RateStats:
+    stats = RateStats()
+    stats.replace(
+        [
+            _venue(1, "Colombo 07", 400_000, capacity=200),
+            _venue(2, "Colombo", 600_000, capacity=200),
+            _venue(3, "Colombo 03", 800_000, capacity=200),
+            _venue(4, "Galle", 100_000),
+            _musician(5, "Colombo", 50_000),
+            _musician(6, "Kandy", 90_000, role="music_ensemble"),
+            _musician(7, "Kandy", 70_000),
+        ]
+    )
+    return stats
+
+
+def test_city_buckets_and_all_city_fallback(stats: RateStats) -> None:
+    assert stats.median("venue", "Colombo") == 600_000
+    assert stats.summary("venue", "colombo 05") == {"count": 3, "p25": 400_000, "median": 600_000, "p75": 800_000}
+    # Galle has a single venue, below MIN_CITY_SAMPLES: use every city.
+    assert stats.count("venue", "Galle") == 4
+    assert stats.median("lights") is None
+    assert stats.top(["solo_musician", "music_ensemble"], 2) == [90_000, 70_000]
+
+
+def test_incremental_updates_keep_buckets_sorted(stats: RateStats) -> None:
+    stats.apply(_venue(2, "Colombo", 900_000))
+    assert stats.quantile("venue", 1.0, "Colombo") == 900_000
+    stats.discard(3)
+    stats.discard(4)
+    assert stats.count("venue") == 2
+    assert stats.median("venue", "Colombo") == 400_000
+
+
+def test_estimate_and_venue_cost_read_precomputed_stats(monkeypatch: pytest.MonkeyPatch, stats: RateStats) -> None:
+    stats.live = True
+    monkeypatch.setattr(concept_context, "rate_stats", lambda: stats)
+    monkeypatch.setattr(service, "rate_stats", lambda: stats)
+
+    # Empty snapshot: everything comes from the statistics (lighting/sound use defaults).
+    target = concept_context.estimate_target_pp({}, attendees=100, city="Colombo")
+    assert target == (600_000 + 90_000 + 70_000 + 50_000 + 150_000 + 120_000) // 100
+
+    cost = service.calculate_venue_cost({"name": "Unpriced", "type": "Hotel Ballroom", "city": "Colombo"}, 200, None)
+    assert cost == 200 * 3_000
+
+
+def test_unpriced_venue_cost_scales_with_size(monkeypatch: pytest.MonkeyPatch, stats: RateStats) -> None:
+    stats.live = True
+    monkeypatch.setattr(service, "rate_stats", lambda: stats)
+    assert stats.summary(PER_SEAT_ROLE, "Colombo") == {"count": 3, "p25": 2_000, "median": 3_000, "p75": 4_000}
+
+    room = {"name": "Room", "type": "Hotel Ballroom", "city": "Colombo", "capacity": 50}
+    ballroom = dict(room, capacity=1000)
+    assert service.calculate_venue_cost(room, 40, None) == 50 * 3_000
+    assert service.calculate_venue_cost(ballroom, 40, None) == 1000 * 3_000
+    # No capacity: size the venue for the attendees.
+    assert service.calculate_venue_cost(dict(room, capacity=None), 120, None) == 120 * 3_000
+    # The address is not a city: use every city's per-seat rates.
+    unplaced = {"name": "Room", "type": "Hotel Ballroom", "address": "Galle Fort", "capacity": 10}
+    assert service.calculate_venue_cost(unplaced, 40, None) == 10 * stats.median(PER_SEAT_ROLE)
+
+    monkeypatch.setattr(service, "rate_stats", RateStats)
+    monkeypatch.setattr(rate_stats_module, "get_provider_catalog_collection", _unavailable)
+    assert service.calculate_venue_cost(room, 40, None) == 50 * 2_000
+
+
+def _unavailable():
+    raise MongoUnavailable("down")
+
+
+def test_concurrent_cold_loads_share_one_catalog_scan(monkeypatch: pytest.MonkeyPatch) -> None:
+    scans = []
+    release = threading.Event()
+
+    class SlowCatalog:
+        def find(self, query, projection=None):
+            scans.append(projection)
+            release.wait(1)
+            return [_venue(1, "Colombo", 400_000, capacity=200)]
+
+    monkeypatch.setattr(rate_stats_module, "get_provider_catalog_collection", lambda: SlowCatalog())
+    stats = RateStats()
+    results = []
+    threads = [threading.Thread(target=lambda: results.append(stats.ensure_loaded())) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    time.sleep(0.05)
+    release.set()
+    for thread in threads:
+        thread.join()
+
+    assert results == [True] * 4
+    assert len(scans) == 1
+    assert scans[0]["views.venue.capacity"] == 1
+    assert stats.median(PER_SEAT_ROLE) == 2_000
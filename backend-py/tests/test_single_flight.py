@@ -0,0 +1,83 @@
+"""Single-flight de-duplication for blocking and coroutine loaders."""
+
+from __future__ import annotations
+
+import asyncio
+import pathlib
+import sys
+import threading
+import time
+
+import pytest
+
+BACKEND_ROOT = pathlib.Path(__file__).resolve().parents[1]
+if str(BACKEND_ROOT) not in sys.path:
+    sys.path.insert(0, str(BACKEND_ROOT))
+
+from utils.single_flight import AsyncSingleFlight, SingleFlight  # noqa: E402
+
+
+def test_threads_share_one_call_and_its_error() -> None:
+    flight = SingleFlight()
+    calls = {"count": 0}
+
+    def failing():
+        calls["count"] += 1
+        time.sleep(0.05)
+        raise RuntimeError("boom")
+
+    errors = []
+
+    def worker():
+        try:
+            flight.do("k", failing)
+        except RuntimeError as exc:
+            errors.append(exc)
+
+    threads = [threading.Thread(target=worker) for _ in range(4)]
+    for thread in threads:
+        thread.start()
+    for thread in threads:
+        thread.join()
+
+    assert calls["count"] == 1
+    assert len(errors) == 4
+    # The key is released afterwards, so the next call runs again.
+    assert flight.do("k", lambda: 7) == 7
+
+
+def test_coroutines_share_one_call() -> None:
+    flight = AsyncSingleFlight()
+    calls = {"count": 0}
+
+    async def load():
+        calls["count"] += 1
+        await asyncio.sleep(0.01)
+        return "value"
+
+    async def main():
+        return await asyncio.gather(*(flight.do("k", load) for _ in range(5)))
+
+    assert asyncio.run(main()) == ["value"] * 5
+    assert calls["count"] == 1
+    assert flight.shared == 4
+
+
+def test_coroutine_errors_propagate_to_followers() -> None:
+    flight = AsyncSingleFlight()
+
+    async def broken():
+        await asyncio.sleep(0.01)
+        raise ValueError("bad")
+
+    async def main():
+        return await asyncio.gather(flight.do("k", broken), flight.do("k", broken), return_exceptions=True)
+
+    results = asyncio.run(main())
+    assert all(isinstance(result, ValueError) for result in results)
+    with pytest.raises(KeyError):
+        asyncio.run(flight.do("k", _raise_key_error))
+
+
+async def _raise_key_error():
+    raise KeyError("k")
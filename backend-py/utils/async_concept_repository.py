@@ -0,0 +1,239 @@
+"""Asyncio twin of :mod:`utils.concept_repository` with the same API.
+
+Concept and provider reads are awaited on the async Mongo driver; the pool
+claim and any OpenAI seeding block and run in a worker thread. Context
+derivation and concept documents come from :mod:`utils.concept_context` and
+:mod:`utils.concept_documents`, shared with the sync module. Without an async
+driver each call runs the sync implementation in a worker thread.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from models.concept import Concept
+
+from . import async_provider_repository as providers
+from . import concept_repository as sync_repo
+from .concept_context import (
+    CONTEXT_CACHE,
+    context_from_snapshot,
+    context_key,
+    context_overrides,
+    keep_context,
+    layer_context,
+)
+from .concept_documents import (
+    CONCEPT_CACHE,
+    CONCEPT_INDEX_NAME,
+    STAMP_PROJECTION,
+    concept_index_settled,
+    concepts_collection_name,
+    remember_concept,
+    revalidate_concept,
+    settle_concept_index,
+)
+from .concept_pool import LISTABLE
+from .concept_repository import (
+    ai_enabled,
+    concept_notice,
+    fallback_concept,
+    fallback_concepts,
+    fallback_for_id,
+    seed_concept,
+)
+from .mongo_client import MongoUnavailable, async_driver_available, get_async_collection
+from .rate_stats import rate_stats
+from .single_flight import AsyncSingleFlight
+
+try:
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+_CONTEXT_FLIGHT = AsyncSingleFlight()
+
+
+def _collection() -> Any:
+    return get_async_collection(concepts_collection_name())
+
+
+async def _safe_fetch(fn, *args, **kwargs) -> List[Dict[str, Any]]:
+    try:
+        return await fn(*args, **kwargs) or []
+    except Exception as exc:  # pragma: no cover - defensive for optional deps
+        logger.warning("Provider fetch failed for %s: %s", getattr(fn, "__name__", fn), exc)
+        return []
+
+
+async def _provider_snapshot(city: Optional[str] = None, limit: int = 6) -> Dict[str, List[Dict[str, Any]]]:
+    try:
+        return await providers.provider_snapshot(city=city, limit=limit)
+    except Exception as exc:  # pragma: no cover - defensive for optional deps
+        logger.warning("Batched provider snapshot failed, fetching per role: %s", exc)
+    groups = await asyncio.gather(
+        _safe_fetch(providers.list_venues, city=city, limit=limit),
+        _safe_fetch(providers.list_solo_musicians, city=city, limit=limit),
+        _safe_fetch(providers.list_music_ensembles, city=city, limit=limit),
+        _safe_fetch(providers.list_lighting, city=city, limit=limit),
+        _safe_fetch(providers.list_sound_specialists, city=city, limit=limit),
+    )
+    names = ("venues", "solo_musicians", "music_ensembles", "lighting_designers", "sound_specialists")
+    return dict(zip(names, groups))
+
+
+async def _context_for(context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    snapshot = await _provider_snapshot(limit=6)
+    if not rate_stats().ready:
+        # A (re)load scans the catalog; keep it off the event loop.
+        await asyncio.to_thread(rate_stats().ensure_loaded)
+    return context_from_snapshot(context, snapshot)
+
+
+async def _memoized_context(key: Tuple[Hashable, Hashable]) -> Dict[str, Any]:
+    built = await _context_for(context_overrides(key))
+    if keep_context(built):
+        CONTEXT_CACHE.set(key, built)
+    return built
+
+
+async def _build_context(context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    """Async ``_build_context`` of :mod:`utils.concept_repository`; shares its memo."""
+
+    key = context_key(context)
+    if key is None or not CONTEXT_CACHE.enabled:
+        return await _context_for(context)
+    base = CONTEXT_CACHE.get(key)
+    if base is None:
+        base = await _CONTEXT_FLIGHT.do(key, lambda: _memoized_context(key))
+    return layer_context(base, context)
+
+
+async def _load_from_mongo(limit: Optional[int]) -> List[Concept]:
+    try:
+        collection = _collection()
+    except MongoUnavailable as exc:
+        logger.debug("Concept collection unavailable: %s", exc)
+        return []
+
+    try:
+        cursor = collection.find(LISTABLE).sort("updated_at", -1)
+        if limit:
+            cursor = cursor.limit(int(limit))
+        docs = await cursor.to_list(length=None)
+    except PyMongoError as exc:  # pragma: no cover - external io
+        logger.error("Failed to fetch concepts from Mongo: %s", exc)
+        return []
+
+    return [remember_concept(doc) for doc in docs]
+
+
+async def _ensure_concept_index(collection: Any) -> None:
+    if concept_index_settled():
+        return
+    try:
+        await collection.create_index("concept_id", unique=True, name=CONCEPT_INDEX_NAME)
+    except Exception as exc:
+        settle_concept_index(exc)
+        return
+    settle_concept_index()
+
+
+async def _find_concept(concept_id: str) -> Optional[Concept]:
+    try:
+        collection = _collection()
+    except MongoUnavailable as exc:
+        logger.debug("Concept collection unavailable: %s", exc)
+        return None
+
+    await _ensure_concept_index(collection)
+    try:
+        cached = CONCEPT_CACHE.get(concept_id)
+        if cached is not None:
+            stamp = await collection.find_one({"concept_id": concept_id}, projection=STAMP_PROJECTION)
+            fresh = revalidate_concept(concept_id, cached, stamp)
+            if fresh is not None or stamp is None:
+                return fresh
+        doc = await collection.find_one({"concept_id": concept_id})
+    except PyMongoError as exc:  # pragma: no cover - external io
+        logger.error("Failed to fetch concept %s from Mongo: %s", concept_id, exc)
+        return None
+    return remember_concept(doc) if doc is not None else None
+
+
+async def _seed_concept(context: Dict[str, Any]) -> Optional[Concept]:
+    # The OpenAI generator and the seed lease block; the sync single flight
+    # and lease still de-duplicate concurrent seeds across threads and workers.
+    return await asyncio.to_thread(seed_concept, context)
+
+
+async def ensure_seed_concept(context: Optional[Dict] = None) -> Concept:
+    """Async :func:`utils.concept_repository.ensure_seed_concept`."""
+
+    if not async_driver_available():
+        return await asyncio.to_thread(sync_repo.ensure_seed_concept, context)
+
+    context = await _build_context(context)
+    if not ai_enabled():
+        return fallback_concept(context)
+
+    concepts = await _load_from_mongo(limit=1)
+    if concepts:
+        return concepts[0]
+    if sync_repo.concept_pool().enabled:
+        sync_repo.concept_pool().request_refill()
+        return fallback_concept(context)
+    return await _seed_concept(context) or fallback_concept(context)
+
+
+async def list_concepts(limit: Optional[int] = None) -> List[Concept]:
+    """Async :func:`utils.concept_repository.list_concepts`."""
+
+    if not async_driver_available():
+        return await asyncio.to_thread(sync_repo.list_concepts, limit)
+
+    context = await _build_context()
+    if ai_enabled() and sync_repo.concept_pool().enabled:
+        pool = sync_repo.concept_pool()
+        docs = await asyncio.to_thread(pool.take, context.get("city"), context.get("vibe"), limit or 1)
+        concepts = [remember_concept(doc) for doc in docs] or await _load_from_mongo(limit)
+        if concepts:
+            return concepts[:limit] if limit else concepts
+        logger.info("Concept pool still filling; serving provider fallback concepts.")
+        return fallback_concepts(context, limit, disable_ai=False)
+    if ai_enabled():
+        concepts = await _load_from_mongo(limit)
+        if concepts:
+            return concepts[:limit] if limit else concepts
+        seeded = await _seed_concept(context)
+        if seeded is not None:
+            return [seeded]
+
+    return fallback_concepts(context, limit)
+
+
+async def get_concept(concept_id: str) -> Concept:
+    """Async :func:`utils.concept_repository.get_concept`; raises ``KeyError`` when unknown."""
+
+    if not async_driver_available():
+        return await asyncio.to_thread(sync_repo.get_concept, concept_id)
+
+    if ai_enabled():
+        concept = await _find_concept(concept_id)
+        if concept is not None:
+            return concept
+    context = await _build_context({"concept_id": concept_id})
+    if ai_enabled() and not sync_repo.concept_pool().enabled:
+        seeded = await _seed_concept(context)
+        if seeded is not None and seeded.concept_id == concept_id:
+            return seeded
+
+    return fallback_for_id(context, concept_id)
+
+
+__all__ = ["concept_notice", "ensure_seed_concept", "get_concept", "list_concepts"]
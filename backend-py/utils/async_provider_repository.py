@@ -0,0 +1,327 @@
+"""Asyncio twin of :mod:`utils.provider_repository`.
+
+Same functions, same record shapes and the same shared cache, but every
+Mongo round trip is awaited on the async driver so one worker can overlap
+many queries. Query construction and page shaping come from
+:mod:`utils.provider_queries`, record normalisation from
+:mod:`utils.provider_records`. Without an async driver installed each call
+runs the sync implementation in a worker thread instead.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import inspect
+import logging
+from typing import Any, Dict, List, Optional, Tuple
+
+from . import provider_repository as sync_repo
+from .mongo_client import (
+    MongoUnavailable,
+    async_driver_available,
+    get_async_provider_catalog_collection,
+    get_async_users_collection,
+)
+from .pagination import decode_cursor
+from .provider_cache import cache_key, cached_value_async
+from .provider_keys import key_index_known, keyed_queries_enabled, name_key
+from .provider_records import ROLE_RECORDS
+from .provider_search import provider_search_index, search_terms
+from .provider_queries import (
+    PAGE_ROLES,
+    Row,
+    active_filters,
+    catalog_find_args,
+    catalog_known_state,
+    catalog_rows,
+    catalog_snapshot,
+    catalog_snapshot_pipeline,
+    copy_page,
+    copy_snapshot,
+    empty_snapshot,
+    field_projection,
+    keep_page,
+    keep_snapshot,
+    page_cache_key,
+    page_from_rows,
+    record_catalog_state,
+    search_ids,
+    user_rows,
+    users_filter,
+    users_scan_limit,
+    users_snapshot,
+    users_snapshot_pipeline,
+    warn_if_truncated,
+)
+from .venue_name_index import venue_name_index
+
+try:
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+
+async def _catalog_ready() -> bool:
+    known = catalog_known_state()
+    if known is not None:
+        return known
+    try:
+        doc = await get_async_provider_catalog_collection().find_one({}, projection={"_id": 1})
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.debug("Provider catalog unavailable: %s", exc)
+        return False
+    return record_catalog_state(doc is not None)
+
+
+async def _probe_key_index() -> None:
+    # role_filter asks keyed_queries_enabled(), which may inspect the users
+    # indexes; answer it off the loop so the filter reads the cached result.
+    if not key_index_known():
+        await asyncio.to_thread(keyed_queries_enabled)
+
+
+async def _query_users(
+    role_key: str,
+    city: Optional[str],
+    limit: Optional[int],
+    fields: Optional[Tuple[str, ...]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
+    try:
+        collection = get_async_users_collection()
+    except MongoUnavailable as exc:
+        logger.warning("Mongo unavailable for role %s: %s", role_key, exc)
+        return []
+    try:
+        cursor = collection.find(users_filter(role_key, city, filters), projection=field_projection(fields))
+        if limit:
+            cursor = cursor.sort("_id", 1).limit(int(limit))
+        return await cursor.to_list(length=None)
+    except PyMongoError as exc:
+        logger.error("Mongo query failed for role %s: %s", role_key, exc)
+        return []
+
+
+async def _query_catalog(
+    role_keys: List[str],
+    city: Optional[str],
+    limit: Optional[int],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]] = None,
+) -> Optional[List[Row]]:
+    if search_terms(filters) and not provider_search_index().ready:
+        # The (re)load is a blocking catalog scan; keep it off the event loop.
+        await asyncio.to_thread(provider_search_index().ensure_loaded)
+    usable, ids = search_ids(role_keys, filters)
+    if not usable:
+        return None
+    if ids is not None and not ids:
+        return []
+    query, projection, sort = catalog_find_args(role_keys, city, filters, after, ids)
+    try:
+        cursor = get_async_provider_catalog_collection().find(query, projection=projection).sort(sort)
+        if limit:
+            cursor = cursor.limit(int(limit))
+        return catalog_rows(await cursor.to_list(length=None), role_keys, sort)
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Provider catalog read failed for roles %s: %s", role_keys, exc)
+        return None
+
+
+async def _load_records(
+    role_keys: List[str],
+    city: Optional[str],
+    limit: Optional[int],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]] = None,
+) -> List[Row]:
+    if await _catalog_ready():
+        rows = await _query_catalog(role_keys, city, limit, filters, after)
+        if rows is not None:
+            return rows
+    await _probe_key_index()
+    scan_limit = users_scan_limit()
+    results = await asyncio.gather(
+        *(_query_users(role_key, city, scan_limit, ROLE_RECORDS[role_key][1], filters) for role_key in role_keys)
+    )
+    docs_by_role = dict(zip(role_keys, results))
+    warn_if_truncated(docs_by_role, scan_limit)
+    return user_rows(role_keys, docs_by_role, limit, filters, after)
+
+
+async def provider_page(
+    listing: str,
+    city: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Async :func:`utils.provider_repository.provider_page`."""
+
+    if not async_driver_available():
+        return await asyncio.to_thread(sync_repo.provider_page, listing, city, limit, cursor, **filters)
+
+    role_keys = PAGE_ROLES[listing]
+    after: Optional[List[Any]] = None
+    if cursor:
+        city, after = decode_cursor(cursor, listing)
+    active = active_filters(**filters)
+
+    async def load() -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return page_from_rows(listing, city, limit, await _load_records(role_keys, city, limit + 1, active, after))
+
+    return await cached_value_async(
+        page_cache_key(listing, city, limit, active, cursor), load, copy=copy_page, keep=keep_page
+    )
+
+
+async def list_venues(
+    city: Optional[str] = None,
+    limit: int = 20,
+    min_capacity: Optional[int] = None,
+    max_budget_lkr: Optional[int] = None,
+    near: Optional[Tuple[float, float]] = None,
+    radius_km: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    page, _ = await provider_page(
+        "venue",
+        city,
+        limit,
+        min_capacity=min_capacity,
+        max_budget_lkr=max_budget_lkr,
+        near=near,
+        radius_km=radius_km if near else None,
+    )
+    return page
+
+
+async def list_lighting(
+    city: Optional[str],
+    limit: int = 20,
+    max_budget_lkr: Optional[int] = None,
+    min_crew_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    page, _ = await provider_page("lights", city, limit, max_budget_lkr=max_budget_lkr, min_crew_size=min_crew_size)
+    return page
+
+
+async def list_solo_musicians(city: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    page, _ = await provider_page("solo_musician", city, limit)
+    return page
+
+
+async def list_music_ensembles(city: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
+    page, _ = await provider_page("music_ensemble", city, limit)
+    return page
+
+
+async def list_sound_specialists(
+    city: Optional[str] = None,
+    limit: int = 20,
+    max_budget_lkr: Optional[int] = None,
+    min_crew_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    page, _ = await provider_page(
+        "sound_specialist", city, limit, max_budget_lkr=max_budget_lkr, min_crew_size=min_crew_size
+    )
+    return page
+
+
+async def list_music_providers(
+    city: Optional[str] = None,
+    limit: int = 20,
+    genre: Optional[str] = None,
+    max_budget_lkr: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    page, _ = await provider_page("music", city, limit, genre=genre, max_budget_lkr=max_budget_lkr)
+    return page
+
+
+async def find_venue_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """Async :func:`utils.provider_repository.find_venue_by_name`."""
+
+    key = name_key(name) if name else None
+    if not key:
+        return None
+    if not async_driver_available():
+        return await asyncio.to_thread(sync_repo.find_venue_by_name, name)
+
+    doc_id = venue_name_index().get(key)
+    if doc_id is None and await _catalog_ready():
+        try:
+            record = await get_async_provider_catalog_collection().find_one(
+                {"name_key": key, "roles": "venue"},
+                projection={"_id": 1},
+            )
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.warning("Provider catalog name lookup failed: %s", exc)
+            record = None
+        if record is None:
+            return None
+        doc_id = record["_id"]
+        venue_name_index().set(key, doc_id)
+    if doc_id is None:
+        # No catalog yet: the legacy full scan stays on the sync path.
+        return await asyncio.to_thread(sync_repo.find_venue_by_name, name)
+
+    try:
+        return await get_async_users_collection().find_one({"_id": doc_id})
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Venue lookup failed for %s: %s", name, exc)
+        return None
+
+
+async def _aggregate_first(collection: Any, pipeline: List[Dict[str, Any]]) -> Dict[str, Any]:
+    cursor = collection.aggregate(pipeline)
+    if inspect.isawaitable(cursor):  # PyMongo async returns a coroutine, Motor a cursor
+        cursor = await cursor
+    return next(iter(await cursor.to_list(length=1)), {})
+
+
+async def _aggregate_snapshot(city: Optional[str], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+    if await _catalog_ready():
+        try:
+            collection = get_async_provider_catalog_collection()
+            return catalog_snapshot(await _aggregate_first(collection, catalog_snapshot_pipeline(city, limit)))
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.warning("Provider catalog snapshot failed: %s", exc)
+
+    await _probe_key_index()
+    try:
+        result = await _aggregate_first(get_async_users_collection(), users_snapshot_pipeline(city, limit))
+    except MongoUnavailable as exc:
+        logger.warning("Mongo unavailable for provider snapshot: %s", exc)
+        return empty_snapshot()
+    except PyMongoError as exc:
+        logger.error("Mongo provider snapshot aggregation failed: %s", exc)
+        return empty_snapshot()
+    return users_snapshot(result)
+
+
+async def provider_snapshot(city: Optional[str] = None, limit: int = 6) -> Dict[str, List[Dict[str, Any]]]:
+    """Async :func:`utils.provider_repository.provider_snapshot`."""
+
+    if not async_driver_available():
+        return await asyncio.to_thread(sync_repo.provider_snapshot, city, limit)
+    return await cached_value_async(
+        cache_key("snapshot", city, limit),
+        lambda: _aggregate_snapshot(city, limit),
+        copy=copy_snapshot,
+        keep=keep_snapshot,
+    )
+
+
+__all__ = [
+    "find_venue_by_name",
+    "list_lighting",
+    "list_music_ensembles",
+    "list_music_providers",
+    "list_solo_musicians",
+    "list_sound_specialists",
+    "list_venues",
+    "provider_page",
+    "provider_snapshot",
+]
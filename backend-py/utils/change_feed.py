@@ -0,0 +1,150 @@
+"""Change notifications for the Mongo ``users`` collection.
+
+A single daemon thread per process follows the collection and fans events out to
+registered listeners. Change streams are used when the deployment supports them
+(replica sets / Atlas); standalone servers fall back to polling a cheap version
+stamp built from the document count and the newest ``updatedAt`` value.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from .env import env_float
+from .mongo_client import MongoUnavailable, get_users_collection
+
+try:
+    from pymongo.errors import OperationFailure, PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    class PyMongoError(Exception):
+        ...
+
+    class OperationFailure(PyMongoError):
+        ...
+
+logger = logging.getLogger(__name__)
+
+# Listener receives the raw change event, or ``None`` when only a polling
+# stamp changed and the affected documents are unknown.
+ChangeListener = Callable[[Optional[Dict[str, Any]]], None]
+
+_DEFAULT_POLL_SECONDS = 15.0
+_RETRY_SECONDS = 30.0
+
+
+def _poll_interval() -> float:
+    return max(env_float("PROVIDER_CHANGE_POLL_SECONDS", _DEFAULT_POLL_SECONDS), 1.0)
+
+
+def _version_stamp(collection: Any) -> Tuple[int, Any]:
+    count = collection.estimated_document_count()
+    newest = collection.find_one({}, projection={"updatedAt": 1}, sort=[("updatedAt", -1)])
+    return count, (newest or {}).get("updatedAt")
+
+
+class UsersChangeFeed:
+    """Fan out ``users`` collection changes to in-process listeners."""
+
+    def __init__(self) -> None:
+        self._listeners: List[ChangeListener] = []
+        self._lock = threading.Lock()
+        self._thread: Optional[threading.Thread] = None
+        self._stop = threading.Event()
+        self.mode: Optional[str] = None
+
+    def add_listener(self, listener: ChangeListener) -> None:
+        with self._lock:
+            if listener not in self._listeners:
+                self._listeners.append(listener)
+
+    def remove_listener(self, listener: ChangeListener) -> None:
+        with self._lock:
+            if listener in self._listeners:
+                self._listeners.remove(listener)
+
+    def _emit(self, event: Optional[Dict[str, Any]]) -> None:
+        with self._lock:
+            listeners = list(self._listeners)
+        for listener in listeners:
+            try:
+                listener(event)
+            except Exception as exc:  # pragma: no cover - listener bugs must not kill the feed
+                logger.warning("Users change listener %s failed: %s", listener, exc)
+
+    def ensure_started(self) -> bool:
+        """Start the follower thread once; returns ``False`` when Mongo is not configured."""
+
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            try:
+                get_users_collection()
+            except MongoUnavailable as exc:
+                logger.debug("Users change feed not started: %s", exc)
+                return False
+            self._stop.clear()
+            self._thread = threading.Thread(target=self._run, name="users-change-feed", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self) -> None:
+        self._stop.set()
+
+    def _run(self) -> None:
+        use_polling = False
+        while not self._stop.is_set():
+            try:
+                collection = get_users_collection()
+            except MongoUnavailable as exc:
+                logger.debug("Users change feed stopped: %s", exc)
+                return
+            try:
+                if use_polling:
+                    self._poll(collection)
+                else:
+                    self._follow_change_stream(collection)
+            except OperationFailure as exc:
+                if use_polling:
+                    logger.warning("Users collection polling failed: %s", exc)
+                    self._stop.wait(_RETRY_SECONDS)
+                    continue
+                # Standalone servers reject $changeStream; poll instead.
+                logger.info("Change streams unavailable (%s); polling users collection", exc)
+                use_polling = True
+            except PyMongoError as exc:
+                logger.warning("Users change feed error: %s; retrying in %ss", exc, _RETRY_SECONDS)
+                # Anything we missed while disconnected is unknown.
+                self._emit(None)
+                self._stop.wait(_RETRY_SECONDS)
+
+    def _follow_change_stream(self, collection: Any) -> None:
+        with collection.watch(full_document="updateLookup") as stream:
+            self.mode = "change_stream"
+            while not self._stop.is_set():
+                event = stream.try_next()
+                if event is None:
+                    self._stop.wait(0.5)
+                    continue
+                self._emit(event)
+
+    def _poll(self, collection: Any) -> None:
+        self.mode = "polling"
+        interval = _poll_interval()
+        last = _version_stamp(collection)
+        while not self._stop.wait(interval):
+            current = _version_stamp(collection)
+            if current != last:
+                last = current
+                self._emit(None)
+
+
+_FEED = UsersChangeFeed()
+
+
+def users_change_feed() -> UsersChangeFeed:
+    return _FEED
+
+
+__all__ = ["ChangeListener", "UsersChangeFeed", "users_change_feed"]
@@ -0,0 +1,203 @@
+"""Planner context derived from a provider snapshot.
+
+A context carries the provider names, city, attendee count and per-person
+target the concept generator and the fallback concepts are built from. Both
+concept repositories fetch the snapshot their own way (blocking or awaited)
+and derive the context here; ``CONTEXT_CACHE`` memoizes the derived base per
+(city, attendees) for both of them.
+"""
+
+from __future__ import annotations
+
+import copy
+import os
+from statistics import median
+from typing import Any, Dict, Hashable, List, Optional, Tuple
+
+from .env import env_float
+from .provider_cache import ProviderCatalogCache
+from .rate_stats import rate_stats
+
+_DEFAULT_ATTENDEES = 200
+
+
+# Snapshot-derived context per (city, attendees); callers' overrides are layered on a copy.
+CONTEXT_CACHE = ProviderCatalogCache(ttl_seconds=env_float("CONCEPT_CONTEXT_TTL_SECONDS", 15.0), max_entries=32)
+
+
+def _provider_names(items: List[Dict[str, Any]]) -> List[str]:
+    names: List[str] = []
+    for item in items:
+        name = item.get("name") or item.get("companyName") or item.get("bandName")
+        if name:
+            display = str(name).strip()
+            if display and display not in names:
+                names.append(display)
+    return names
+
+
+def _combine_unique(*groups: List[str]) -> List[str]:
+    seen = set()
+    ordered: List[str] = []
+    for group in groups:
+        for value in group:
+            if value not in seen:
+                ordered.append(value)
+                seen.add(value)
+    return ordered
+
+
+def _infer_city(snapshot: Dict[str, List[Dict[str, Any]]]) -> str:
+    for venue in snapshot.get("venues", []):
+        city = venue.get("city") or venue.get("address")
+        if isinstance(city, str) and city.strip():
+            return city.strip()
+    return os.getenv("DEFAULT_CONCEPT_CITY", "Colombo")
+
+
+def _extract_rates(entries: List[Dict[str, Any]], *keys: str) -> List[int]:
+    rates: List[int] = []
+    for entry in entries:
+        for key in keys:
+            value = entry.get(key)
+            if isinstance(value, (int, float)) and value > 0:
+                rates.append(int(value))
+                break
+    return rates
+
+
+def _snapshot_bases(snapshot: Dict[str, List[Dict[str, Any]]]) -> Dict[str, Any]:
+    venue_costs = _extract_rates(snapshot.get("venues", []), "avg_cost_lkr", "standard_rate_lkr")
+    music_rates = _extract_rates(
+        snapshot.get("solo_musicians", []) + snapshot.get("music_ensembles", []),
+        "standard_rate_lkr",
+    )
+    lighting_rates = _extract_rates(snapshot.get("lighting_designers", []), "standard_rate_lkr")
+    sound_rates = _extract_rates(snapshot.get("sound_specialists", []), "standard_rate_lkr")
+    return {
+        "venue": int(median(venue_costs)) if venue_costs else None,
+        "music": sorted(music_rates, reverse=True)[:3],
+        "lighting": int(median(lighting_rates)) if lighting_rates else None,
+        "sound": int(median(sound_rates)) if sound_rates else None,
+    }
+
+
+def _market_bases(city: Optional[str]) -> Optional[Dict[str, Any]]:
+    """Same figures as :func:`_snapshot_bases`, read from the precomputed rate statistics."""
+
+    stats = rate_stats()
+    if not stats.ensure_loaded():
+        return None
+    return {
+        "venue": stats.median("venue", city),
+        "music": stats.top(("solo_musician", "music_ensemble"), 3, city),
+        "lighting": stats.median("lights", city),
+        "sound": stats.median("sound_specialist", city),
+    }
+
+
+def estimate_target_pp(
+    snapshot: Dict[str, List[Dict[str, Any]]],
+    attendees: int,
+    city: Optional[str] = None,
+) -> int:
+    attendees = max(attendees, 50)
+    bases = _market_bases(city) or _snapshot_bases(snapshot)
+
+    venue_base = bases["venue"] or 600_000
+    music_base = sum(bases["music"] or [250_000])
+    lighting_base = bases["lighting"] or 150_000
+    sound_base = bases["sound"] or 120_000
+
+    total_budget = venue_base + music_base + lighting_base + sound_base
+    target_pp = max(int(total_budget / attendees), 1500)
+    return target_pp
+
+
+def context_key(context: Optional[Dict[str, Any]]) -> Optional[Tuple[Hashable, Hashable]]:
+    """Memo key for ``context``: the only overrides the derived values depend on."""
+
+    context = context or {}
+    key = (context.get("city"), context.get("attendees"))
+    try:
+        hash(key)
+    except TypeError:
+        return None
+    return key
+
+
+def context_overrides(key: Tuple[Hashable, Hashable]) -> Dict[str, Any]:
+    return {name: value for name, value in zip(("city", "attendees"), key) if value is not None}
+
+
+def keep_context(context: Dict[str, Any]) -> bool:
+    # A context without providers usually means Mongo was unreachable; rebuild next time.
+    return any(context.get("providers", {}).values())
+
+
+def layer_context(base: Dict[str, Any], context: Optional[Dict[str, Any]]) -> Dict[str, Any]:
+    """``base`` plus the caller's overrides; same result as building with ``context`` directly.
+
+    ``budget_lkr`` is the one base value derived from an override outside the
+    memo key (``target_pp_lkr``), so it is re-derived unless also overridden.
+    """
+
+    context = context or {}
+    layered = copy.deepcopy(base)
+    layered.update(context)
+    if "target_pp_lkr" in context and "budget_lkr" not in context:
+        layered["budget_lkr"] = layered["target_pp_lkr"] * layered["attendees"]
+    return layered
+
+
+def context_from_snapshot(
+    context: Optional[Dict[str, Any]],
+    snapshot: Dict[str, List[Dict[str, Any]]],
+) -> Dict[str, Any]:
+    base_context = dict(context or {})
+    base_context.setdefault("provider_snapshot", snapshot)
+
+    venue_names = _provider_names(snapshot.get("venues", []))
+    solo_names = _provider_names(snapshot.get("solo_musicians", []))
+    ensemble_names = _provider_names(snapshot.get("music_ensembles", []))
+    lighting_names = _provider_names(snapshot.get("lighting_designers", []))
+    sound_names = _provider_names(snapshot.get("sound_specialists", []))
+
+    providers = {
+        "venue": venue_names,
+        "music": _combine_unique(solo_names, ensemble_names),
+        "lighting": lighting_names,
+        "sound": sound_names,
+    }
+
+    talent_lists = {
+        "venues": venue_names,
+        "solo_musicians": solo_names,
+        "music_ensembles": ensemble_names,
+        "lighting_designers": lighting_names,
+        "sound_specialists": sound_names,
+    }
+
+    base_context.setdefault("providers", providers)
+    base_context.setdefault("talent_lists", talent_lists)
+    base_context.setdefault("attendees", _DEFAULT_ATTENDEES)
+    base_context.setdefault("audience", "Live music fans")
+    base_context.setdefault("vibe", "High-energy musical night")
+    base_context.setdefault("city", _infer_city(snapshot))
+
+    target_pp = estimate_target_pp(snapshot, attendees=base_context["attendees"], city=base_context["city"])
+    base_context.setdefault("target_pp_lkr", target_pp)
+    base_context.setdefault("budget_lkr", base_context["target_pp_lkr"] * base_context["attendees"])
+
+    return base_context
+
+
+__all__ = [
+    "CONTEXT_CACHE",
+    "context_from_snapshot",
+    "context_key",
+    "context_overrides",
+    "estimate_target_pp",
+    "keep_context",
+    "layer_context",
+]
@@ -0,0 +1,99 @@
+"""Concept documents as stored in the Mongo concepts collection.
+
+Shared by the sync and async concept repositories: the collection name, the
+conversion of a stored document into a :class:`~models.concept.Concept` and
+the process-wide cache of converted concepts, versioned by ``updated_at``.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+from typing import Any, Dict, Optional, Tuple
+
+from models.concept import Concept
+
+from .env import env_float, env_int
+from .provider_cache import ProviderCatalogCache
+
+logger = logging.getLogger(__name__)
+
+_COLLECTION_ENV = "MONGO_CONCEPTS_COLLECTION"
+_DEFAULT_COLLECTION = "concepts"
+
+
+# concept_id -> (updated_at, Concept); entries are revalidated against updated_at.
+CONCEPT_CACHE = ProviderCatalogCache(
+    ttl_seconds=env_float("CONCEPT_CACHE_TTL_SECONDS", 300.0),
+    max_entries=env_int("CONCEPT_CACHE_MAX_ENTRIES", 256),
+)
+
+
+CONCEPT_INDEX_NAME = "concept_id_unique"
+STAMP_PROJECTION = {"_id": 0, "updated_at": 1}
+_CONCEPT_INDEX_STATE: Dict[str, bool] = {}
+# Duplicate key (legacy duplicate ids), IndexOptionsConflict, IndexKeySpecsConflict.
+_PERMANENT_INDEX_ERROR_CODES = {11000, 85, 86}
+
+
+def concepts_collection_name() -> str:
+    return os.getenv(_COLLECTION_ENV, _DEFAULT_COLLECTION)
+
+
+def document_to_concept(doc: Dict[str, Any]) -> Concept:
+    data = dict(doc)
+    data.pop("_id", None)
+    return Concept(**data)
+
+
+def remember_concept(doc: Dict[str, Any]) -> Concept:
+    """Convert ``doc`` and cache it under its ``concept_id`` and ``updated_at`` version."""
+
+    concept = document_to_concept(doc)
+    CONCEPT_CACHE.set(concept.concept_id, (doc.get("updated_at"), concept))
+    return concept.model_copy(deep=True)
+
+
+def revalidate_concept(
+    concept_id: str, cached: Tuple[Any, Concept], stamp: Optional[Dict[str, Any]]
+) -> Optional[Concept]:
+    """``cached`` when ``stamp`` (the stored ``updated_at``) still matches its version."""
+
+    if stamp is not None and stamp.get("updated_at") == cached[0]:
+        return cached[1].model_copy(deep=True)
+    CONCEPT_CACHE.discard(concept_id)
+    return None
+
+
+def concept_index_settled() -> bool:
+    """Whether the unique ``concept_id`` index no longer needs a ``create_index``."""
+
+    return bool(_CONCEPT_INDEX_STATE.get("settled"))
+
+
+def settle_concept_index(exc: Optional[Exception] = None) -> None:
+    """Record a ``create_index`` outcome.
+
+    Success or a permanent error settles the index; transient failures (e.g.
+    server selection timeouts) leave it to be retried on the next lookup.
+    """
+
+    if exc is not None:
+        if getattr(exc, "code", None) not in _PERMANENT_INDEX_ERROR_CODES:
+            logger.debug("Unique concept_id index not created yet, will retry: %s", exc)
+            return
+        logger.warning("Unable to create unique concept_id index: %s", exc)
+    _CONCEPT_INDEX_STATE["settled"] = True
+
+
+__all__ = [
+    "CONCEPT_CACHE",
+    "CONCEPT_INDEX_NAME",
+    "STAMP_PROJECTION",
+    "concept_index_settled",
+    "concepts_collection_name",
+    "document_to_concept",
+    "remember_concept",
+    "revalidate_concept",
+    "settle_concept_index",
+]
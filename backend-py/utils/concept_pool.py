@@ -0,0 +1,302 @@
+"""Pre-generated AI concepts per (city, vibe) bucket.
+
+Generating a concept is an OpenAI round trip of several seconds, so with
+``USE_AI_CONCEPTS=1`` the request path should only ever read concepts that
+already exist. ``ConceptPool`` keeps ``CONCEPT_POOL_SIZE`` fresh concepts per
+bucket in the concepts collection (tagged with ``pool_bucket`` and
+``pool_state``). Requests reuse them, least recently served first, so
+generation is bounded by the pool size per bucket per
+``CONCEPT_POOL_MAX_AGE_SECONDS`` rather than by traffic. A background thread
+retires concepts older than that, deletes retired ones after
+``CONCEPT_POOL_RETENTION_SECONDS`` (plans made from them keep resolving until
+then) and generates replacements, every ``CONCEPT_POOL_REFRESH_SECONDS`` or
+when a request finds a bucket short. With several API workers, a per-bucket
+lease lets only one of them refill a bucket at a time.
+
+Buckets come from ``CONCEPT_POOL_BUCKETS`` (``"Colombo|Chill rooftop
+sessions;Kandy"``; an omitted vibe means the default one) plus any bucket a
+request asks for. ``CONCEPT_POOL_SIZE=0`` disables the pool, restoring
+inline generation on a miss.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import threading
+from datetime import datetime, timedelta
+from typing import Any, Callable, Dict, List, Optional, Tuple
+
+from agents.concept_generator import ConceptGenerationUnavailable
+
+from .env import env_float, env_int
+from .geo import place_of
+from .mongo_client import MongoUnavailable
+from .mongo_lease import MongoLease, ensure_lease_indexes
+
+try:
+    from pymongo import ASCENDING
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    ASCENDING = 1
+
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+READY = "ready"
+SERVED = "served"
+STALE = "stale"
+DEFAULT_VIBE = "High-energy musical night"
+_DEFAULT_SIZE = 4
+_DEFAULT_MAX_AGE_SECONDS = 6 * 3600.0
+_DEFAULT_REFRESH_SECONDS = 300.0
+_DEFAULT_RETENTION_SECONDS = 24 * 3600.0
+# Demand-registered buckets beyond the configured ones are capped at this many.
+_MAX_BUCKETS = 16
+_POOL_INDEX_NAME = "pool_bucket_1_pool_state_1_updated_at_1"
+# Pool concepts that may still be handed out (never served, or reused).
+_LIVE = {"$in": [READY, SERVED]}
+# Concepts listed outside the pool: everything except retired pool concepts.
+LISTABLE = {"pool_state": {"$ne": STALE}}
+
+# (city, vibe) -> concept payload ready to store; raises ConceptGenerationUnavailable.
+Generator = Callable[[str, str], Dict[str, Any]]
+
+
+def pool_size() -> int:
+    return max(env_int("CONCEPT_POOL_SIZE", _DEFAULT_SIZE), 0)
+
+
+def _max_age() -> timedelta:
+    return timedelta(seconds=env_float("CONCEPT_POOL_MAX_AGE_SECONDS", _DEFAULT_MAX_AGE_SECONDS))
+
+
+def _retention() -> timedelta:
+    return timedelta(seconds=env_float("CONCEPT_POOL_RETENTION_SECONDS", _DEFAULT_RETENTION_SECONDS))
+
+
+def _refresh_interval() -> float:
+    return env_float("CONCEPT_POOL_REFRESH_SECONDS", _DEFAULT_REFRESH_SECONDS)
+
+
+def bucket_key(city: Optional[str], vibe: Optional[str]) -> str:
+    """Stable bucket name: the gazetteer town (else the trimmed city) and the vibe, lowercased."""
+
+    city_text = (city or os.getenv("DEFAULT_CONCEPT_CITY", "Colombo")).strip()
+    city_part = place_of(city_text) or city_text.lower()
+    vibe_part = " ".join((vibe or DEFAULT_VIBE).lower().split())
+    return f"{city_part}|{vibe_part}"
+
+
+def configured_buckets() -> List[Tuple[str, str]]:
+    raw = os.getenv("CONCEPT_POOL_BUCKETS", "")
+    buckets: List[Tuple[str, str]] = []
+    for entry in raw.split(";"):
+        if not entry.strip():
+            continue
+        city, _, vibe = entry.partition("|")
+        buckets.append((city.strip(), vibe.strip() or DEFAULT_VIBE))
+    if not buckets:
+        buckets.append((os.getenv("DEFAULT_CONCEPT_CITY", "Colombo"), DEFAULT_VIBE))
+    return buckets
+
+
+def ensure_pool_indexes(collection: Any) -> None:
+    collection.create_index(
+        [("pool_bucket", ASCENDING), ("pool_state", ASCENDING), ("updated_at", ASCENDING)],
+        name=_POOL_INDEX_NAME,
+    )
+
+
+class ConceptPool:
+    """Claims pooled concepts for requests and refills buckets in a worker thread."""
+
+    def __init__(
+        self,
+        collection: Callable[[], Any],
+        generate: Generator,
+        active: Callable[[], bool] = lambda: True,
+        leases: Optional[Callable[[], Any]] = None,
+    ) -> None:
+        self._collection = collection
+        self._leases = leases
+        self._generate = generate
+        self._active = active
+        self._lock = threading.Lock()
+        self._buckets: Dict[str, Tuple[str, str]] = {
+            bucket_key(city, vibe): (city, vibe) for city, vibe in configured_buckets()
+        }
+        self._configured = set(self._buckets)
+        self._refill_requested = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self._start_failed = False
+        self.generated = 0
+
+    @property
+    def enabled(self) -> bool:
+        return pool_size() > 0
+
+    def want(self, city: Optional[str], vibe: Optional[str]) -> str:
+        """Register demand for a bucket and return its key."""
+
+        key = bucket_key(city, vibe)
+        with self._lock:
+            if key not in self._buckets:
+                extra = [name for name in self._buckets if name not in self._configured]
+                if len(extra) >= _MAX_BUCKETS:
+                    del self._buckets[extra[0]]
+                self._buckets[key] = (city or os.getenv("DEFAULT_CONCEPT_CITY", "Colombo"), vibe or DEFAULT_VIBE)
+        return key
+
+    def buckets(self) -> Dict[str, Tuple[str, str]]:
+        with self._lock:
+            return dict(self._buckets)
+
+    # -- request path -------------------------------------------------------
+
+    def take(self, city: Optional[str], vibe: Optional[str], count: int) -> List[Dict[str, Any]]:
+        """Up to ``count`` fresh concepts for the bucket, never-served then least recently served first.
+
+        Concepts are reused until they age out, so taking never consumes them
+        and never generates; an empty result means the bucket has not been
+        filled yet.
+        """
+
+        key = self.want(city, vibe)
+        count = max(count, 1)
+        try:
+            collection = self._collection()
+            now = datetime.utcnow()
+            docs = list(
+                collection.find({"pool_bucket": key, "pool_state": _LIVE, "updated_at": {"$gte": now - _max_age()}})
+                .sort("served_at", ASCENDING)  # unset (never served) sorts first
+                .limit(count)
+            )
+            if docs:
+                # Rotation bookkeeping only; concurrent requests may share concepts.
+                collection.update_many(
+                    {"concept_id": {"$in": [doc["concept_id"] for doc in docs]}},
+                    {"$set": {"pool_state": SERVED, "served_at": now}},
+                )
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.debug("Concept pool unavailable: %s", exc)
+            return []
+        if len(docs) < count:
+            self.request_refill()
+        return docs
+
+    def request_refill(self) -> None:
+        self._refill_requested.set()
+        self.ensure_started()
+
+    # -- worker -------------------------------------------------------------
+
+    def ensure_started(self) -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            if self._start_failed or not self.enabled:
+                return False
+            try:
+                ensure_pool_indexes(self._collection())
+            except (MongoUnavailable, PyMongoError) as exc:
+                logger.info("Concept pool not started: %s", exc)
+                self._start_failed = True
+                return False
+            self._stop.clear()
+            self._refill_requested.set()  # initial fill
+            self._thread = threading.Thread(target=self._run, name="concept-pool", daemon=True)
+            self._thread.start()
+            return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._refill_requested.set()
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._refill_requested.wait(_refresh_interval())
+            if self._stop.is_set():
+                return
+            self._refill_requested.clear()
+            try:
+                self.refill()
+            except (MongoUnavailable, PyMongoError) as exc:
+                logger.warning("Concept pool refill failed: %s", exc)
+
+    def refill(self) -> int:
+        """Retire aged concepts and generate until every bucket holds the pool size; returns concepts added."""
+
+        if not self._active():
+            return 0
+        collection = self._collection()
+        target = pool_size()
+        fresh_since = datetime.utcnow() - _max_age()
+        added = 0
+        for key, (city, vibe) in self.buckets().items():
+            lease = self._lease(key)
+            if lease is not None and not lease.acquire():
+                continue  # another worker is filling this bucket
+            try:
+                added += self._refill_bucket(collection, key, city, vibe, target, fresh_since)
+            finally:
+                if lease is not None:
+                    lease.release()
+            if self._stop.is_set() or not self._active():
+                break
+        self.generated += added
+        if added:
+            logger.info("Concept pool refilled with %s concept(s)", added)
+        return added
+
+    def _lease(self, key: str) -> Optional[MongoLease]:
+        if self._leases is None:
+            return None
+        try:
+            leases = self._leases()
+            ensure_lease_indexes(leases)
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.debug("Concept pool leases unavailable: %s", exc)
+            return None
+        return MongoLease(leases, f"concept-pool:{key}", _refresh_interval())
+
+    def _refill_bucket(
+        self, collection: Any, key: str, city: str, vibe: str, target: int, fresh_since: datetime
+    ) -> int:
+        added = 0
+        now = datetime.utcnow()
+        collection.update_many(
+            {"pool_bucket": key, "pool_state": _LIVE, "updated_at": {"$lt": fresh_since}},
+            {"$set": {"pool_state": STALE, "retired_at": now}},
+        )
+        collection.delete_many({"pool_bucket": key, "pool_state": STALE, "retired_at": {"$lt": now - _retention()}})
+        live = collection.count_documents({"pool_bucket": key, "pool_state": _LIVE})
+        for _ in range(target - live):
+            if self._stop.is_set() or not self._active():
+                break
+            try:
+                payload = self._generate(city, vibe)
+            except ConceptGenerationUnavailable as exc:
+                logger.warning("Concept pool generation for %s failed: %s", key, exc)
+                break
+            payload.update(pool_bucket=key, pool_state=READY)
+            collection.update_one({"concept_id": payload["concept_id"]}, {"$set": payload}, upsert=True)
+            added += 1
+        return added
+
+
+__all__ = [
+    "ConceptPool",
+    "DEFAULT_VIBE",
+    "LISTABLE",
+    "READY",
+    "SERVED",
+    "STALE",
+    "bucket_key",
+    "configured_buckets",
+    "ensure_pool_indexes",
+    "pool_size",
+]
@@ -2,10 +2,10 @@ from __future__ import annotations
 
 import logging
 import os
+import time
 from datetime import datetime
-from statistics import median
 from uuid import uuid4
-from typing import Any, Dict, List, Optional, TYPE_CHECKING
+from typing import Any, Dict, Hashable, Iterable, List, Optional, Set, Tuple, TYPE_CHECKING
 
 from models.concept import Concept
 from utils.provider_repository import (
@@ -14,9 +14,32 @@ from utils.provider_repository import (
     list_solo_musicians,
     list_sound_specialists,
     list_venues,
+    provider_snapshot,
 )
 
-from .mongo_client import MongoUnavailable, get_collection, mongo_available
+from .concept_context import (
+    CONTEXT_CACHE,
+    context_from_snapshot,
+    context_key,
+    context_overrides,
+    keep_context,
+    layer_context,
+)
+from .concept_documents import (
+    CONCEPT_CACHE,
+    CONCEPT_INDEX_NAME,
+    STAMP_PROJECTION,
+    concept_index_settled,
+    concepts_collection_name,
+    remember_concept,
+    revalidate_concept,
+    settle_concept_index,
+)
+from .concept_pool import LISTABLE, ConceptPool
+from .env import env_float
+from .mongo_client import MongoUnavailable, get_collection, get_leases_collection, mongo_available
+from .mongo_lease import MongoLease, ensure_lease_indexes
+from .single_flight import SingleFlight
 
 if TYPE_CHECKING:  # pragma: no cover - typing only
     try:
@@ -38,8 +61,6 @@ from agents.concept_generator import (
 logger = logging.getLogger(__name__)
 
 _BOOL_TRUE = {"1", "true", "yes", "on"}
-_COLLECTION_ENV = "MONGO_CONCEPTS_COLLECTION"
-_DEFAULT_COLLECTION = "concepts"
 
 _AI_DISABLED = False
 _NOTICE_MESSAGE: Optional[str] = None
@@ -51,14 +72,27 @@ _DEFAULT_COST_SPLIT: Dict[str, float] = {
     "lighting": 0.15,
     "sound": 0.10,
 }
-_DEFAULT_ATTENDEES = 200
+
+
+# Concurrent context builds for one (city, attendees) share a provider snapshot fetch.
+_CONTEXT_FLIGHT = SingleFlight()
+
+_BATCH_STAMP_PROJECTION = {"_id": 0, "concept_id": 1, "updated_at": 1}
+
+# Seeding is de-duplicated per (city, attendees): in process by single flight,
+# across workers by a lease; waiting workers poll for the holder's concept.
+_SEED_FLIGHT = SingleFlight()
+_SEED_LEASE_SECONDS = env_float("CONCEPT_SEED_LEASE_SECONDS", 60.0)
+_SEED_POLL_SECONDS = 0.25
 
 
 def _env_ai_enabled() -> bool:
     return os.getenv("USE_AI_CONCEPTS", "0").strip().lower() in _BOOL_TRUE
 
 
-def _ai_enabled() -> bool:
+def ai_enabled() -> bool:
+    """Whether ``USE_AI_CONCEPTS`` is on and AI has not been switched off this process."""
+
     return _env_ai_enabled() and not _AI_DISABLED
 
 
@@ -87,14 +121,91 @@ def concept_notice() -> Optional[str]:
 
 
 def _collection() -> Any:
-    name = os.getenv(_COLLECTION_ENV, _DEFAULT_COLLECTION)
-    return get_collection(name)
+    return get_collection(concepts_collection_name())
+
+
+def _ensure_concept_index(collection: Any) -> None:
+    """Create the unique ``concept_id`` index once per process."""
+
+    if concept_index_settled():
+        return
+    try:
+        collection.create_index("concept_id", unique=True, name=CONCEPT_INDEX_NAME)
+    except Exception as exc:
+        settle_concept_index(exc)
+        return
+    settle_concept_index()
+
+
+def _find_concept(concept_id: str) -> Optional[Concept]:
+    """One concept by id through the unique index, revalidating the cached copy."""
+
+    if not mongo_available():
+        return None
+    try:
+        collection = _collection()
+    except MongoUnavailable as exc:
+        logger.debug("Concept collection unavailable: %s", exc)
+        return None
+
+    _ensure_concept_index(collection)
+    try:
+        cached = CONCEPT_CACHE.get(concept_id)
+        if cached is not None:
+            stamp = collection.find_one({"concept_id": concept_id}, projection=STAMP_PROJECTION)
+            fresh = revalidate_concept(concept_id, cached, stamp)
+            if fresh is not None or stamp is None:
+                return fresh
+        doc = collection.find_one({"concept_id": concept_id})
+    except PyMongoError as exc:  # pragma: no cover - external io
+        logger.error("Failed to fetch concept %s from Mongo: %s", concept_id, exc)
+        return None
+    return remember_concept(doc) if doc is not None else None
+
+
+def _revalidate_batch(
+    cached: Dict[str, Tuple[Any, Concept]], stamps: Iterable[Dict[str, Any]]
+) -> Tuple[Dict[str, Concept], Set[str]]:
+    """Still-current cached concepts, and the ids whose documents are gone."""
 
+    by_id = {stamp.get("concept_id"): stamp for stamp in stamps}
+    found: Dict[str, Concept] = {}
+    gone: Set[str] = set()
+    for concept_id, entry in cached.items():
+        fresh = revalidate_concept(concept_id, entry, by_id.get(concept_id))
+        if fresh is not None:
+            found[concept_id] = fresh
+        elif concept_id not in by_id:
+            gone.add(concept_id)
+    return found, gone
 
-def _document_to_concept(doc: Dict) -> Concept:
-    data = dict(doc)
-    data.pop("_id", None)
-    return Concept(**data)
+
+def _find_concepts(concept_ids: List[str]) -> Dict[str, Concept]:
+    """Batched :func:`_find_concept`: one stamp query for cached ids, one ``$in`` read for the rest."""
+
+    if not concept_ids or not mongo_available():
+        return {}
+    try:
+        collection = _collection()
+    except MongoUnavailable as exc:
+        logger.debug("Concept collection unavailable: %s", exc)
+        return {}
+
+    _ensure_concept_index(collection)
+    found: Dict[str, Concept] = {}
+    try:
+        cached = {cid: entry for cid in concept_ids if (entry := CONCEPT_CACHE.get(cid)) is not None}
+        gone: Set[str] = set()
+        if cached:
+            stamps = collection.find({"concept_id": {"$in": list(cached)}}, projection=_BATCH_STAMP_PROJECTION)
+            found, gone = _revalidate_batch(cached, stamps)
+        missing = [cid for cid in concept_ids if cid not in found and cid not in gone]
+        if missing:
+            for doc in collection.find({"concept_id": {"$in": missing}}):
+                found[doc["concept_id"]] = remember_concept(doc)
+    except PyMongoError as exc:  # pragma: no cover - external io
+        logger.error("Failed to fetch concepts %s from Mongo: %s", concept_ids, exc)
+    return found
 
 
 def _safe_fetch(fn, *args, **kwargs) -> List[Dict[str, Any]]:
@@ -107,6 +218,11 @@ def _safe_fetch(fn, *args, **kwargs) -> List[Dict[str, Any]]:
 
 
 def _provider_snapshot(city: Optional[str] = None, limit: int = 6) -> Dict[str, List[Dict[str, Any]]]:
+    try:
+        # One $facet aggregation instead of five sequential per-role queries.
+        return provider_snapshot(city=city, limit=limit)
+    except Exception as exc:  # pragma: no cover - defensive for optional deps
+        logger.warning("Batched provider snapshot failed, fetching per role: %s", exc)
     return {
         "venues": _safe_fetch(list_venues, city=city, limit=limit),
         "solo_musicians": _safe_fetch(list_solo_musicians, city=city, limit=limit),
@@ -116,107 +232,27 @@ def _provider_snapshot(city: Optional[str] = None, limit: int = 6) -> Dict[str,
     }
 
 
-def _provider_names(items: List[Dict[str, Any]]) -> List[str]:
-    names: List[str] = []
-    for item in items:
-        name = item.get("name") or item.get("companyName") or item.get("bandName")
-        if name:
-            display = str(name).strip()
-            if display and display not in names:
-                names.append(display)
-    return names
-
-
-def _combine_unique(*groups: List[str]) -> List[str]:
-    seen = set()
-    ordered: List[str] = []
-    for group in groups:
-        for value in group:
-            if value not in seen:
-                ordered.append(value)
-                seen.add(value)
-    return ordered
-
-
-def _infer_city(snapshot: Dict[str, List[Dict[str, Any]]]) -> str:
-    for venue in snapshot.get("venues", []):
-        city = venue.get("city") or venue.get("address")
-        if isinstance(city, str) and city.strip():
-            return city.strip()
-    return os.getenv("DEFAULT_CONCEPT_CITY", "Colombo")
-
-
-def _extract_rates(entries: List[Dict[str, Any]], *keys: str) -> List[int]:
-    rates: List[int] = []
-    for entry in entries:
-        for key in keys:
-            value = entry.get(key)
-            if isinstance(value, (int, float)) and value > 0:
-                rates.append(int(value))
-                break
-    return rates
-
-
-def _estimate_target_pp(snapshot: Dict[str, List[Dict[str, Any]]], attendees: int) -> int:
-    attendees = max(attendees, 50)
-
-    venue_costs = _extract_rates(snapshot.get("venues", []), "avg_cost_lkr", "standard_rate_lkr")
-    music_rates = _extract_rates(
-        snapshot.get("solo_musicians", []) + snapshot.get("music_ensembles", []),
-        "standard_rate_lkr",
-    )
-    lighting_rates = _extract_rates(snapshot.get("lighting_designers", []), "standard_rate_lkr")
-    sound_rates = _extract_rates(snapshot.get("sound_specialists", []), "standard_rate_lkr")
-
-    venue_base = int(median(venue_costs)) if venue_costs else 600_000
-    top_musicians = sorted(music_rates, reverse=True)[:3] or [250_000]
-    music_base = sum(top_musicians)
-    lighting_base = int(median(lighting_rates)) if lighting_rates else 150_000
-    sound_base = int(median(sound_rates)) if sound_rates else 120_000
-
-    total_budget = venue_base + music_base + lighting_base + sound_base
-    target_pp = max(int(total_budget / attendees), 1500)
-    return target_pp
+def _memoized_context(key: Tuple[Hashable, Hashable]) -> Dict[str, Any]:
+    built = context_from_snapshot(context_overrides(key), _provider_snapshot(limit=6))
+    if keep_context(built):
+        CONTEXT_CACHE.set(key, built)
+    return built
 
 
 def _build_context(context: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
-    base_context = dict(context or {})
-    snapshot = _provider_snapshot(limit=6)
-    base_context.setdefault("provider_snapshot", snapshot)
-
-    venue_names = _provider_names(snapshot.get("venues", []))
-    solo_names = _provider_names(snapshot.get("solo_musicians", []))
-    ensemble_names = _provider_names(snapshot.get("music_ensembles", []))
-    lighting_names = _provider_names(snapshot.get("lighting_designers", []))
-    sound_names = _provider_names(snapshot.get("sound_specialists", []))
-
-    providers = {
-        "venue": venue_names,
-        "music": _combine_unique(solo_names, ensemble_names),
-        "lighting": lighting_names,
-        "sound": sound_names,
-    }
-
-    talent_lists = {
-        "venues": venue_names,
-        "solo_musicians": solo_names,
-        "music_ensembles": ensemble_names,
-        "lighting_designers": lighting_names,
-        "sound_specialists": sound_names,
-    }
-
-    base_context.setdefault("providers", providers)
-    base_context.setdefault("talent_lists", talent_lists)
-    base_context.setdefault("attendees", _DEFAULT_ATTENDEES)
-    base_context.setdefault("audience", "Live music fans")
-    base_context.setdefault("vibe", "High-energy musical night")
-    base_context.setdefault("city", _infer_city(snapshot))
+    """Planner context for ``context`` overrides, memoized per (city, attendees).
 
-    target_pp = _estimate_target_pp(snapshot, attendees=base_context["attendees"])
-    base_context.setdefault("target_pp_lkr", target_pp)
-    base_context.setdefault("budget_lkr", target_pp * base_context["attendees"])
+    Contexts are reused for ``CONCEPT_CONTEXT_TTL_SECONDS`` and concurrent
+    builds for the same key share one provider snapshot fetch.
+    """
 
-    return base_context
+    key = context_key(context)
+    if key is None or not CONTEXT_CACHE.enabled:
+        return context_from_snapshot(context, _provider_snapshot(limit=6))
+    base = CONTEXT_CACHE.get(key)
+    if base is None:
+        base = _CONTEXT_FLIGHT.do(key, lambda: _memoized_context(key))
+    return layer_context(base, context)
 
 
 def _fallback_features(providers: Dict[str, List[str]]) -> List[str]:
@@ -232,7 +268,9 @@ def _fallback_features(providers: Dict[str, List[str]]) -> List[str]:
     return features[:3]
 
 
-def _fallback_concept(context: Dict[str, Any]) -> Concept:
+def fallback_concept(context: Dict[str, Any]) -> Concept:
+    """The provider-built concept for ``context``, used whenever AI cannot serve one."""
+
     providers = context.get("providers", {})
     features = _fallback_features(providers)
     if not features:
@@ -294,7 +332,7 @@ def _load_from_mongo(limit: Optional[int]) -> List[Concept]:
         return []
 
     try:
-        cursor = collection.find().sort("updated_at", -1)
+        cursor = collection.find(LISTABLE).sort("updated_at", -1)
         if limit:
             cursor = cursor.limit(int(limit))
         docs = list(cursor)
@@ -302,21 +340,110 @@ def _load_from_mongo(limit: Optional[int]) -> List[Concept]:
         logger.error("Failed to fetch concepts from Mongo: %s", exc)
         return []
 
-    return [_document_to_concept(doc) for doc in docs]
+    return [remember_concept(doc) for doc in docs]
+
 
+def _seed_key(context_data: Dict[str, Any]) -> Tuple[Any, Any]:
+    return (context_data.get("city"), context_data.get("attendees"))
+
+
+def _seed_via_ai(context: Optional[Dict] = None) -> Concept:
+    """Generate and store one concept; concurrent seeds for the same context share one."""
 
-def _seed_via_ai(context: Optional[Dict] = None) -> List[Concept]:
     if context is None or "providers" not in context:
         context_data = _build_context(context)
     else:
         context_data = dict(context)
 
+    key = _seed_key(context_data)
+    return _SEED_FLIGHT.do(key, lambda: _seed_leased(context_data, key))
+
+
+def seed_concept(context: Dict[str, Any]) -> Optional[Concept]:
+    """Seed one AI concept for ``context``; ``None`` when generation is unavailable.
+
+    Quota exhaustion switches AI concepts off for the rest of the process.
+    """
+
+    try:
+        return _seed_via_ai(context)
+    except ConceptGenerationQuotaExceeded as exc:
+        _disable_ai(str(exc))
+        logger.warning("AI quota exhausted; reverting to fallback concept.")
+    except ConceptGenerationUnavailable as exc:
+        logger.warning("AI generation unavailable; using fallback concept (%s)", exc)
+    return None
+
+
+def _seed_lease(key: Tuple[Any, Any]) -> Optional[MongoLease]:
+    try:
+        leases = get_leases_collection()
+        ensure_lease_indexes(leases)
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.debug("Seed leases unavailable, de-duplicating in process only: %s", exc)
+        return None
+    return MongoLease(leases, "concept-seed:%s:%s" % key, _SEED_LEASE_SECONDS)
+
+
+def _seeded_since(collection: Any, key: Tuple[Any, Any], since: datetime) -> Optional[Dict[str, Any]]:
+    return collection.find_one(
+        {"context_city": key[0], "context_attendees": key[1], "updated_at": {"$gte": since}},
+        sort=[("updated_at", -1)],
+    )
+
+
+def _seed_leased(context_data: Dict[str, Any], key: Tuple[Any, Any]) -> Concept:
+    """Seed under the cross-worker lease, or wait for the worker holding it."""
+
     try:
         collection = _collection()
     except MongoUnavailable as exc:
         raise ConceptGenerationUnavailable(str(exc)) from exc
 
-    payload = generate_concept(context_data)
+    lease = _seed_lease(key)
+    if lease is None:
+        return _generate_and_store(collection, context_data)
+
+    deadline = time.monotonic() + _SEED_LEASE_SECONDS
+    since: Optional[datetime] = None
+    try:
+        while True:
+            if since is not None:
+                doc = _seeded_since(collection, key, since)
+                if doc is not None:
+                    return remember_concept(doc)
+            if lease.acquire():
+                try:
+                    return _generate_and_store(collection, context_data)
+                finally:
+                    lease.release()
+            holder = lease.holder()
+            if holder is not None:
+                since = holder.get("acquired_at") or since
+            if time.monotonic() >= deadline:
+                raise ConceptGenerationUnavailable("Timed out waiting for another worker to seed a concept")
+            time.sleep(_SEED_POLL_SECONDS)
+    except PyMongoError as exc:  # pragma: no cover - external io
+        raise ConceptGenerationUnavailable(f"Concept seed lease failed: {exc}") from exc
+
+
+def _generate_and_store(collection: Any, context_data: Dict[str, Any]) -> Concept:
+    payload = _prepare_ai_payload(generate_concept(context_data), context_data)
+
+    try:
+        collection.update_one(
+            {"concept_id": payload["concept_id"]},
+            {"$set": payload},
+            upsert=True,
+        )
+    except PyMongoError as exc:  # pragma: no cover
+        logger.error("Failed to store AI concept: %s", exc)
+        raise ConceptGenerationUnavailable("Unable to persist generated concept") from exc
+
+    return remember_concept(payload)
+
+
+def _prepare_ai_payload(payload: Dict[str, Any], context_data: Dict[str, Any]) -> Dict[str, Any]:
     concept_id = payload.get("concept_id") or f"ai-concept-{uuid4().hex[:8]}"
     payload["concept_id"] = concept_id
     payload["cost_split"] = _sanitize_cost_split(payload.get("cost_split"))
@@ -337,18 +464,7 @@ def _seed_via_ai(context: Optional[Dict] = None) -> List[Concept]:
     payload["context_city"] = context_data.get("city")
     payload["context_attendees"] = context_data.get("attendees")
     payload["updated_at"] = datetime.utcnow()
-
-    try:
-        collection.update_one(
-            {"concept_id": concept_id},
-            {"$set": payload},
-            upsert=True,
-        )
-    except PyMongoError as exc:  # pragma: no cover
-        logger.error("Failed to store AI concept: %s", exc)
-        raise ConceptGenerationUnavailable("Unable to persist generated concept") from exc
-
-    return _load_from_mongo(limit=None)
+    return payload
 
 
 def ensure_seed_concept(context: Optional[Dict] = None) -> Concept:
@@ -356,142 +472,170 @@ def ensure_seed_concept(context: Optional[Dict] = None) -> Concept:
 
     context = _build_context(context)
 
-    if not _ai_enabled():
-        return _fallback_concept(context)
+    if not ai_enabled():
+        return fallback_concept(context)
 
     concepts = _load_from_mongo(limit=1)
     if concepts:
         return concepts[0]
+    if _POOL.enabled:
+        # Pool mode: requests only read pre-generated concepts; the pool generates.
+        _POOL.request_refill()
+        return fallback_concept(context)
+
+    return seed_concept(context) or fallback_concept(context)
 
+
+def _pool_payload(city: str, vibe: str) -> Dict[str, Any]:
+    context = _build_context({"city": city, "vibe": vibe})
     try:
-        seeded = _seed_via_ai(context)
+        return _prepare_ai_payload(generate_concept(context), context)
     except ConceptGenerationQuotaExceeded as exc:
         _disable_ai(str(exc))
-        return _fallback_concept(context)
-    except ConceptGenerationUnavailable as exc:
-        logger.warning("AI seeding failed, using fallback concept: %s", exc)
-        return _fallback_concept(context)
+        raise
+
+
+_POOL = ConceptPool(
+    lambda: _collection(),
+    lambda city, vibe: _pool_payload(city, vibe),
+    active=lambda: ai_enabled(),
+    leases=get_leases_collection,
+)
+
 
-    if not seeded:
-        raise ConceptGenerationUnavailable("AI seeding returned no concepts")
-    return seeded[0]
+def concept_pool() -> ConceptPool:
+    return _POOL
+
+
+def start_concept_pool() -> bool:
+    """Start filling the concept pool when AI concepts are enabled."""
+
+    if not ai_enabled() or not mongo_available():
+        return False
+    return _POOL.ensure_started()
+
+
+def _pooled_concepts(context: Dict[str, Any], limit: Optional[int]) -> List[Concept]:
+    """Pre-generated concepts for the context's bucket, else any stored ones; never generates."""
+
+    docs = _POOL.take(context.get("city"), context.get("vibe"), limit or 1) if mongo_available() else []
+    concepts = [remember_concept(doc) for doc in docs] or _load_from_mongo(limit)
+    return concepts[:limit] if limit else concepts
 
 
 def list_concepts(limit: Optional[int] = None) -> List[Concept]:
     context = _build_context()
-    if _ai_enabled():
+    if ai_enabled() and _POOL.enabled:
+        concepts = _pooled_concepts(context, limit)
+        if concepts:
+            return concepts
+        logger.info("Concept pool still filling; serving provider fallback concepts.")
+        return fallback_concepts(context, limit, disable_ai=False)
+    if ai_enabled():
         concepts = _load_from_mongo(limit)
         if concepts:
             return concepts[:limit] if limit else concepts
-        try:
-            seeded = _seed_via_ai(context)
-            if limit:
-                return seeded[:limit]
-            return seeded
-        except ConceptGenerationQuotaExceeded as exc:
-            _disable_ai(str(exc))
-            logger.warning("AI quota exhausted; reverting to fallback concept.")
-        except ConceptGenerationUnavailable as exc:
-            logger.warning("AI generation unavailable; using fallback concept (%s)", exc)
-    
+        seeded = seed_concept(context)
+        if seeded is not None:
+            return [seeded]
+
+    return fallback_concepts(context, limit)
+
+
+# Four cost distribution strategies used by the numbered fallback concepts
+_FALLBACK_SPLITS = [
+    {"venue": 0.40, "music": 0.35, "lighting": 0.15, "sound": 0.10},  # Venue-focused
+    {"venue": 0.30, "music": 0.45, "lighting": 0.15, "sound": 0.10},  # Music-heavy
+    {"venue": 0.35, "music": 0.30, "lighting": 0.25, "sound": 0.10},  # Lighting showcase
+    {"venue": 0.30, "music": 0.35, "lighting": 0.15, "sound": 0.20},  # Premium sound
+]
+
+
+def _fallback_variant(base: Concept, index: int, concept_id: Optional[str] = None) -> Concept:
+    return Concept(
+        concept_id=concept_id or f"{base.concept_id}-{index+1}",
+        title=f"{base.title} #{index+1}",
+        tagline=base.tagline,
+        venue_preference=base.venue_preference,
+        music_focus=base.music_focus,
+        lighting_style=base.lighting_style,
+        sound_profile=base.sound_profile,
+        experience_notes=base.experience_notes,
+        target_pp_lkr=base.target_pp_lkr,
+        cost_split=dict(_FALLBACK_SPLITS[index % len(_FALLBACK_SPLITS)]),
+        assumption_prompts=base.assumption_prompts,
+        default_features=list(base.default_features),
+        providers=dict(base.providers),
+        catering_style=base.catering_style,
+    )
+
+
+def fallback_concepts(context: Dict[str, Any], limit: Optional[int], disable_ai: bool = True) -> List[Concept]:
+    """``limit`` numbered provider-built concepts for ``context``."""
+
     # Generate multiple unique fallback concepts when requested
-    fallback_base = _fallback_concept(context)
+    fallback_base = fallback_concept(context)
     requested = limit if limit and limit > 0 else 1
-    fallbacks = []
-    
-    # Define 4 unique cost distribution strategies
-    split_variations = [
-        {"venue": 0.40, "music": 0.35, "lighting": 0.15, "sound": 0.10},  # Venue-focused
-        {"venue": 0.30, "music": 0.45, "lighting": 0.15, "sound": 0.10},  # Music-heavy
-        {"venue": 0.35, "music": 0.30, "lighting": 0.25, "sound": 0.10},  # Lighting showcase
-        {"venue": 0.30, "music": 0.35, "lighting": 0.15, "sound": 0.20},  # Premium sound
-    ]
-    
-    if _env_ai_enabled():
+
+    # An empty (still filling) concept pool is not a reason to give up on AI.
+    if disable_ai and _env_ai_enabled():
         global _AI_DISABLED
         if not _AI_DISABLED:
             _AI_DISABLED = True
         if not _NOTICE_MESSAGE:
             _set_notice("OpenAI concept generation unavailable; using provider fallback.")
 
-    for i in range(requested):
-        split_idx = i % len(split_variations)
-        variant = Concept(
-            concept_id=f"{fallback_base.concept_id}-{i+1}",
-            title=f"{fallback_base.title} #{i+1}",
-            tagline=fallback_base.tagline,
-            venue_preference=fallback_base.venue_preference,
-            music_focus=fallback_base.music_focus,
-            lighting_style=fallback_base.lighting_style,
-            sound_profile=fallback_base.sound_profile,
-            experience_notes=fallback_base.experience_notes,
-            target_pp_lkr=fallback_base.target_pp_lkr,
-            cost_split=dict(split_variations[split_idx]),
-            assumption_prompts=fallback_base.assumption_prompts,
-            default_features=list(fallback_base.default_features),
-            providers=dict(fallback_base.providers),
-            catering_style=fallback_base.catering_style,
-        )
-        fallbacks.append(variant)
-    return fallbacks
+    return [_fallback_variant(fallback_base, i) for i in range(requested)]
 
 
 def get_concept(concept_id: str) -> Concept:
+    if ai_enabled():
+        concept = _find_concept(concept_id)
+        if concept is not None:
+            return concept
     context = _build_context({"concept_id": concept_id})
-    if _ai_enabled():
-        for concept in _load_from_mongo(limit=None):
-            if concept.concept_id == concept_id:
-                return concept
-        try:
-            seeded = _seed_via_ai(context)
-            for concept in seeded:
-                if concept.concept_id == concept_id:
-                    return concept
-        except ConceptGenerationQuotaExceeded as exc:
-            _disable_ai(str(exc))
-            logger.warning("AI quota exhausted while fetching %s; using fallback", concept_id)
-        except ConceptGenerationUnavailable as exc:
-            logger.warning("Unable to generate concept %s via AI, using fallback (%s)", concept_id, exc)
+    if ai_enabled() and not _POOL.enabled:
+        seeded = seed_concept(context)
+        if seeded is not None and seeded.concept_id == concept_id:
+            return seeded
+
+    return fallback_for_id(context, concept_id)
+
+
+def get_concepts(concept_ids: Iterable[str]) -> List[Concept]:
+    """Concepts for ``concept_ids`` in order, read in one batch; unknown ids are left out.
+
+    Same lookup as :func:`get_concept` per id, except that a miss never seeds
+    a new concept (a freshly generated one cannot carry the requested id).
+    """
+
+    ids = list(dict.fromkeys(cid for cid in concept_ids if cid))
+    found = _find_concepts(ids) if ai_enabled() else {}
+    for concept_id in ids:
+        if concept_id not in found:
+            try:
+                found[concept_id] = fallback_for_id(_build_context({"concept_id": concept_id}), concept_id)
+            except KeyError:
+                continue
+    return [found[cid] for cid in ids if cid in found]
+
+
+def fallback_for_id(context: Dict[str, Any], concept_id: str) -> Concept:
+    """The fallback concept (or numbered variant) named ``concept_id``; ``KeyError`` otherwise."""
 
     # Check if this is a numbered fallback concept (e.g., fallback-live-showcase-2)
-    fallback_base = _fallback_concept(context)
+    fallback_base = fallback_concept(context)
     if concept_id == fallback_base.concept_id:
         return fallback_base
-    
+
     # Check for numbered variations (fallback-live-showcase-1, fallback-live-showcase-2, etc.)
     if concept_id.startswith(fallback_base.concept_id + "-"):
         try:
             # Extract the number from the concept_id
-            suffix = concept_id.split("-")[-1]
-            index = int(suffix) - 1  # Convert to 0-based index
-            
-            # Define 4 unique cost distribution strategies
-            split_variations = [
-                {"venue": 0.40, "music": 0.35, "lighting": 0.15, "sound": 0.10},  # Venue-focused
-                {"venue": 0.30, "music": 0.45, "lighting": 0.15, "sound": 0.10},  # Music-heavy
-                {"venue": 0.35, "music": 0.30, "lighting": 0.25, "sound": 0.10},  # Lighting showcase
-                {"venue": 0.30, "music": 0.35, "lighting": 0.15, "sound": 0.20},  # Premium sound
-            ]
-            
-            if 0 <= index < len(split_variations):
-                variant = Concept(
-                    concept_id=concept_id,
-                    title=f"{fallback_base.title} #{index+1}",
-                    tagline=fallback_base.tagline,
-                    venue_preference=fallback_base.venue_preference,
-                    music_focus=fallback_base.music_focus,
-                    lighting_style=fallback_base.lighting_style,
-                    sound_profile=fallback_base.sound_profile,
-                    experience_notes=fallback_base.experience_notes,
-                    target_pp_lkr=fallback_base.target_pp_lkr,
-                    cost_split=dict(split_variations[index % len(split_variations)]),
-                    assumption_prompts=fallback_base.assumption_prompts,
-                    default_features=list(fallback_base.default_features),
-                    providers=dict(fallback_base.providers),
-                    catering_style=fallback_base.catering_style,
-                )
-                return variant
+            index = int(concept_id.split("-")[-1]) - 1  # Convert to 0-based index
+            if 0 <= index < len(_FALLBACK_SPLITS):
+                return _fallback_variant(fallback_base, index, concept_id=concept_id)
         except (ValueError, IndexError):
             pass
-    
+
     raise KeyError(f"Unknown concept_id '{concept_id}'")
@@ -0,0 +1,23 @@
+"""Numeric settings read from environment variables."""
+
+from __future__ import annotations
+
+import os
+
+
+def env_float(name: str, default: float) -> float:
+    """``name`` parsed as a number, ``default`` when unset or malformed."""
+
+    try:
+        return float(os.getenv(name, default))
+    except ValueError:
+        return default
+
+
+def env_int(name: str, default: int) -> int:
+    """:func:`env_float` truncated to an integer."""
+
+    return int(env_float(name, default))
+
+
+__all__ = ["env_float", "env_int"]
@@ -0,0 +1,209 @@
+"""Offline geocoding for provider addresses and proximity filters.
+
+Provider documents only carry free-form city/address strings. ``geo_point``
+turns them into GeoJSON points using explicit coordinates when a document has
+them and a small gazetteer of Sri Lankan towns otherwise, so the catalog can
+hold an indexable ``location`` and venue searches can ask for "within 20 km
+of Galle" instead of matching address text.
+"""
+
+from __future__ import annotations
+
+import math
+import re
+from typing import Any, Dict, Iterable, Optional, Tuple
+
+LOCATION_FIELD = "location"
+EARTH_RADIUS_KM = 6378.1
+DEFAULT_RADIUS_KM = 25.0
+# Address-like fields in priority order: a dedicated city beats a street address.
+_PLACE_FIELDS = ("city", "base_city", "venueAddress", "address", "companyAddress")
+_TOKEN_RE = re.compile(r"[a-z]+")
+_LAT_LON_RE = re.compile(r"^\s*(-?\d+(?:\.\d+)?)\s*,\s*(-?\d+(?:\.\d+)?)\s*$")
+
+# Place name (lowercase words) -> (longitude, latitude).
+GAZETTEER: Dict[str, Tuple[float, float]] = {
+    "ampara": (81.6724, 7.2912),
+    "anuradhapura": (80.4037, 8.3114),
+    "arugam bay": (81.8360, 6.8400),
+    "avissawella": (80.2046, 6.9543),
+    "badulla": (81.0550, 6.9934),
+    "bandarawela": (80.9982, 6.8259),
+    "battaramulla": (79.9180, 6.9000),
+    "batticaloa": (81.6747, 7.7310),
+    "bentota": (80.0000, 6.4258),
+    "beruwala": (79.9828, 6.4788),
+    "chilaw": (79.7953, 7.5758),
+    "colombo": (79.8612, 6.9271),
+    "dambulla": (80.6517, 7.8600),
+    "dehiwala": (79.8659, 6.8511),
+    "ella": (81.0466, 6.8667),
+    "embilipitiya": (80.8489, 6.3439),
+    "galle": (80.2210, 6.0535),
+    "gampaha": (79.9990, 7.0873),
+    "habarana": (80.7486, 8.0372),
+    "hambantota": (81.1185, 6.1241),
+    "haputale": (80.9580, 6.7682),
+    "hatton": (80.5955, 6.8916),
+    "hikkaduwa": (80.1063, 6.1395),
+    "homagama": (80.0022, 6.8441),
+    "horana": (80.0626, 6.7159),
+    "ja ela": (79.8919, 7.0744),
+    "jaffna": (80.0255, 9.6615),
+    "kadawatha": (79.9533, 7.0016),
+    "kalmunai": (81.8167, 7.4167),
+    "kalutara": (79.9607, 6.5854),
+    "kandy": (80.6337, 7.2906),
+    "kataragama": (81.3346, 6.4134),
+    "katunayake": (79.8853, 7.1725),
+    "kegalle": (80.3464, 7.2513),
+    "kelaniya": (79.9220, 6.9553),
+    "kilinochchi": (80.3770, 9.3803),
+    "kotte": (79.9187, 6.8868),
+    "kurunegala": (80.3623, 7.4863),
+    "maharagama": (79.9265, 6.8480),
+    "mannar": (79.9044, 8.9810),
+    "matale": (80.6234, 7.4675),
+    "matara": (80.5550, 5.9549),
+    "mirissa": (80.4716, 5.9483),
+    "monaragala": (81.3507, 6.8728),
+    "moratuwa": (79.8816, 6.7730),
+    "mount lavinia": (79.8653, 6.8389),
+    "mullaitivu": (80.8142, 9.2671),
+    "negombo": (79.8358, 7.2083),
+    "nilaveli": (81.1880, 8.6980),
+    "nugegoda": (79.8997, 6.8649),
+    "nuwara eliya": (80.7891, 6.9497),
+    "panadura": (79.9026, 6.7132),
+    "pasikudah": (81.5610, 7.9270),
+    "peradeniya": (80.5942, 7.2690),
+    "piliyandala": (79.9227, 6.8018),
+    "point pedro": (80.2333, 9.8167),
+    "polonnaruwa": (81.0188, 7.9403),
+    "puttalam": (79.8283, 8.0362),
+    "rajagiriya": (79.8960, 6.9094),
+    "ratnapura": (80.3992, 6.6828),
+    "sigiriya": (80.7603, 7.9570),
+    "tangalle": (80.7941, 6.0243),
+    "tissamaharama": (81.2876, 6.2785),
+    "trincomalee": (81.2152, 8.5874),
+    "unawatuna": (80.2497, 6.0100),
+    "vavuniya": (80.4982, 8.7542),
+    "wattala": (79.8917, 6.9897),
+    "weligama": (80.4297, 5.9747),
+}
+_MAX_PLACE_WORDS = max(len(name.split()) for name in GAZETTEER)
+
+
+class UnknownLocation(ValueError):
+    """Raised when a ``near`` value is neither coordinates nor a known place."""
+
+
+def place_of(text: Any) -> Optional[str]:
+    """Gazetteer name of the last place mentioned in ``text``.
+
+    Addresses end with the town ("Galle Road, Colombo 03"), so later mentions
+    win over earlier ones; multi-word names win over their single words.
+    """
+
+    if not isinstance(text, str):
+        return None
+    words = _TOKEN_RE.findall(text.lower())
+    for end in range(len(words), 0, -1):
+        for size in range(min(_MAX_PLACE_WORDS, end), 0, -1):
+            name = " ".join(words[end - size : end])
+            if name in GAZETTEER:
+                return name
+    return None
+
+
+def locate_text(text: Any) -> Optional[Tuple[float, float]]:
+    """``(lon, lat)`` of the place :func:`place_of` finds in ``text``."""
+
+    name = place_of(text)
+    return GAZETTEER[name] if name else None
+
+
+def _valid(lon: Any, lat: Any) -> Optional[Tuple[float, float]]:
+    try:
+        lon, lat = float(lon), float(lat)
+    except (TypeError, ValueError):
+        return None
+    if -180.0 <= lon <= 180.0 and -90.0 <= lat <= 90.0:
+        return lon, lat
+    return None
+
+
+def _explicit_point(doc: Dict[str, Any]) -> Optional[Tuple[float, float]]:
+    location = doc.get(LOCATION_FIELD)
+    if isinstance(location, dict) and isinstance(location.get("coordinates"), (list, tuple)):
+        coordinates = location["coordinates"]
+        if len(coordinates) == 2:
+            return _valid(*coordinates)
+    lat = doc.get("latitude", doc.get("lat"))
+    lon = doc.get("longitude", doc.get("lng", doc.get("lon")))
+    if lat is not None and lon is not None:
+        return _valid(lon, lat)
+    return None
+
+
+def geo_point(doc: Dict[str, Any], fields: Iterable[str] = _PLACE_FIELDS) -> Optional[Dict[str, Any]]:
+    """GeoJSON point for a provider document, or ``None`` when it cannot be placed."""
+
+    point = _explicit_point(doc)
+    if point is None:
+        for field in fields:
+            point = locate_text(doc.get(field))
+            if point is not None:
+                break
+    if point is None:
+        return None
+    return {"type": "Point", "coordinates": [point[0], point[1]]}
+
+
+# Raw-document fields ``geo_point`` reads, for query projections.
+GEO_FIELDS: Tuple[str, ...] = (LOCATION_FIELD, "latitude", "longitude", "lat", "lng", "lon", *_PLACE_FIELDS)
+
+
+def parse_near(value: str) -> Tuple[float, float]:
+    """``(lon, lat)`` for a ``near=`` value: ``"lat,lon"`` or a place name."""
+
+    match = _LAT_LON_RE.match(value or "")
+    if match:
+        point = _valid(match.group(2), match.group(1))
+        if point is None:
+            raise UnknownLocation(f"Coordinates out of range: {value!r}.")
+        return point
+    point = GAZETTEER.get(" ".join(_TOKEN_RE.findall((value or "").lower())))
+    if point is None:
+        raise UnknownLocation(f"Unknown location {value!r}; pass 'lat,lon' or a Sri Lankan town name.")
+    return point
+
+
+def within_filter(point: Tuple[float, float], radius_km: float) -> Dict[str, Any]:
+    """Mongo predicate for ``location`` inside a circle (served by the 2dsphere index)."""
+
+    return {LOCATION_FIELD: {"$geoWithin": {"$centerSphere": [list(point), radius_km / EARTH_RADIUS_KM]}}}
+
+
+def distance_km(a: Tuple[float, float], b: Tuple[float, float]) -> float:
+    """Great-circle distance between two ``(lon, lat)`` points."""
+
+    lon1, lat1, lon2, lat2 = map(math.radians, (*a, *b))
+    h = math.sin((lat2 - lat1) / 2) ** 2 + math.cos(lat1) * math.cos(lat2) * math.sin((lon2 - lon1) / 2) ** 2
+    return 2 * EARTH_RADIUS_KM * math.asin(min(1.0, math.sqrt(h)))
+
+
+__all__ = [
+    "DEFAULT_RADIUS_KM",
+    "GAZETTEER",
+    "GEO_FIELDS",
+    "LOCATION_FIELD",
+    "UnknownLocation",
+    "distance_km",
+    "geo_point",
+    "locate_text",
+    "parse_near",
+    "place_of",
+    "within_filter",
+]
@@ -1,7 +1,9 @@
+import asyncio
 import logging
 import os
+import weakref
 from functools import lru_cache
-from typing import Any
+from typing import Any, Dict, Optional
 
 try:
     from pymongo import MongoClient
@@ -19,13 +21,53 @@ except Exception:  # pragma: no cover - pymongo optional during tests
     class PyMongoError(Exception):
         ...
 
+# Async driver: PyMongo's native asyncio client (4.9+), else Motor. When neither
+# is installed the async repositories run the sync client in worker threads.
+try:
+    from pymongo import AsyncMongoClient as _AsyncClient  # type: ignore
+    ASYNC_DRIVER: Optional[str] = "pymongo"
+except Exception:  # pragma: no cover - depends on installed driver
+    try:
+        from motor.motor_asyncio import AsyncIOMotorClient as _AsyncClient  # type: ignore
+        ASYNC_DRIVER = "motor"
+    except Exception:
+        _AsyncClient = None  # type: ignore
+        ASYNC_DRIVER = None
+
+from .mongo_metrics import listeners as _metric_listeners
+
 logger = logging.getLogger(__name__)
 
+# Env var -> MongoClient pool option. Unset vars keep the driver defaults.
+_POOL_OPTIONS = {
+    "MONGO_MAX_POOL_SIZE": "maxPoolSize",
+    "MONGO_MIN_POOL_SIZE": "minPoolSize",
+    "MONGO_MAX_IDLE_TIME_MS": "maxIdleTimeMS",
+    "MONGO_WAIT_QUEUE_TIMEOUT_MS": "waitQueueTimeoutMS",
+}
+
 
 class MongoUnavailable(RuntimeError):
     """Raised when MongoDB is not configured or dependencies are missing."""
 
 
+def _client_options() -> Dict[str, Any]:
+    """Keyword arguments shared by the sync and async clients."""
+    options: Dict[str, Any] = {"serverSelectionTimeoutMS": int(os.getenv("MONGO_TIMEOUT_MS", "5000"))}
+    for env_name, option in _POOL_OPTIONS.items():
+        raw = os.getenv(env_name, "").strip()
+        if not raw:
+            continue
+        try:
+            options[option] = int(raw)
+        except ValueError:
+            logger.warning("Ignoring non-integer %s=%r", env_name, raw)
+    event_listeners = _metric_listeners()
+    if event_listeners:
+        options["event_listeners"] = event_listeners
+    return options
+
+
 def _require_client() -> Any:
     if MongoClient is None:
         raise MongoUnavailable(
@@ -35,9 +77,8 @@ def _require_client() -> Any:
     if not uri:
         raise MongoUnavailable("MONGO_URI environment variable is not set.")
 
-    timeout_ms = int(os.getenv("MONGO_TIMEOUT_MS", "5000"))
     try:
-        client = MongoClient(uri, serverSelectionTimeoutMS=timeout_ms)
+        client = MongoClient(uri, **_client_options())
         return client
     except ConfigurationError as exc:
         raise MongoUnavailable(f"Invalid MONGO_URI configuration: {exc}") from exc
@@ -87,6 +128,56 @@ def get_users_collection() -> Any:
     return get_collection(collection_name)
 
 
+def get_provider_catalog_collection() -> Any:
+    collection_name = os.getenv("MONGO_PROVIDER_CATALOG_COLLECTION", "provider_catalog")
+    return get_collection(collection_name)
+
+
+def get_leases_collection() -> Any:
+    collection_name = os.getenv("MONGO_LEASES_COLLECTION", "leases")
+    return get_collection(collection_name)
+
+
+# Async clients are bound to the event loop that first used them.
+_ASYNC_CLIENTS: "weakref.WeakKeyDictionary[asyncio.AbstractEventLoop, Any]" = weakref.WeakKeyDictionary()
+
+
+def async_driver_available() -> bool:
+    return _AsyncClient is not None
+
+
+def get_async_client() -> Any:
+    """Return the async client for the running event loop."""
+    if _AsyncClient is None:
+        raise MongoUnavailable("No async Mongo driver installed (pymongo>=4.9 or motor).")
+    uri = os.getenv("MONGO_URI")
+    if not uri:
+        raise MongoUnavailable("MONGO_URI environment variable is not set.")
+
+    loop = asyncio.get_running_loop()
+    client = _ASYNC_CLIENTS.get(loop)
+    if client is None:
+        try:
+            client = _AsyncClient(uri, **_client_options())
+        except ConfigurationError as exc:
+            raise MongoUnavailable(f"Invalid MONGO_URI configuration: {exc}") from exc
+        _ASYNC_CLIENTS[loop] = client
+    return client
+
+
+def get_async_collection(name: str) -> Any:
+    # Database resolution reads only the parsed URI, so it never blocks.
+    return _resolve_database(get_async_client())[name]
+
+
+def get_async_users_collection() -> Any:
+    return get_async_collection(os.getenv("MONGO_USERS_COLLECTION", "users"))
+
+
+def get_async_provider_catalog_collection() -> Any:
+    return get_async_collection(os.getenv("MONGO_PROVIDER_CATALOG_COLLECTION", "provider_catalog"))
+
+
 def mongo_available() -> bool:
     try:
         get_client()
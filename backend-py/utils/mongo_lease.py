@@ -0,0 +1,75 @@
+"""Cross-process leases stored as Mongo documents.
+
+``SingleFlight`` only de-duplicates within one process. When several API
+workers may start the same expensive job, ``MongoLease`` lets exactly one of
+them hold ``name`` at a time: acquiring upserts ``{_id: name}`` only when the
+current lease has expired, so the unique ``_id`` turns a concurrent second
+acquire into a duplicate-key error. Leases expire after ``ttl_seconds`` in
+case the holder dies, and a TTL index removes the leftovers.
+"""
+
+from __future__ import annotations
+
+import os
+import socket
+from datetime import datetime, timedelta
+from typing import Any, Dict, Optional
+from uuid import uuid4
+
+try:
+    from pymongo.errors import DuplicateKeyError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    class DuplicateKeyError(Exception):  # type: ignore[no-redef]
+        ...
+
+_LEASE_INDEX_NAME = "expires_at_ttl"
+_INDEXED: set = set()
+
+
+def lease_owner() -> str:
+    """Identifier unique to this process (and call site, via the random suffix)."""
+
+    return f"{socket.gethostname()}:{os.getpid()}:{uuid4().hex[:8]}"
+
+
+def ensure_lease_indexes(collection: Any) -> None:
+    """TTL index on ``expires_at``, created once per collection per process."""
+
+    name = getattr(collection, "full_name", id(collection))
+    if name in _INDEXED:
+        return
+    collection.create_index("expires_at", expireAfterSeconds=0, name=_LEASE_INDEX_NAME)
+    _INDEXED.add(name)
+
+
+class MongoLease:
+    """One named lease; ``acquire`` never blocks."""
+
+    def __init__(self, collection: Any, name: str, ttl_seconds: float, owner: Optional[str] = None) -> None:
+        self._collection = collection
+        self.name = name
+        self.ttl = timedelta(seconds=ttl_seconds)
+        self.owner = owner or lease_owner()
+
+    def acquire(self) -> bool:
+        now = datetime.utcnow()
+        try:
+            self._collection.update_one(
+                {"_id": self.name, "expires_at": {"$lte": now}},
+                {"$set": {"owner": self.owner, "acquired_at": now, "expires_at": now + self.ttl}},
+                upsert=True,
+            )
+        except DuplicateKeyError:
+            return False
+        return True
+
+    def holder(self) -> Optional[Dict[str, Any]]:
+        """The current lease document (owner, acquired_at, expires_at), if any."""
+
+        return self._collection.find_one({"_id": self.name})
+
+    def release(self) -> None:
+        self._collection.delete_one({"_id": self.name, "owner": self.owner})
+
+
+__all__ = ["DuplicateKeyError", "MongoLease", "ensure_lease_indexes", "lease_owner"]
@@ -0,0 +1,248 @@
+"""Driver-level Mongo metrics: command latency per collection and pool waits.
+
+PyMongo publishes command and connection-pool events to registered
+listeners. ``listeners()`` returns the pair the Mongo clients are built with;
+they aggregate per-``(collection, command)`` latency and per-pool checkout
+counts and wait times in process memory. ``mongo_metrics()`` snapshots the
+counters for the metrics endpoint. Set ``MONGO_METRICS_ENABLED=0`` to build
+clients without listeners.
+"""
+
+from __future__ import annotations
+
+import os
+import threading
+from collections import defaultdict, deque
+from typing import Any, Deque, Dict, List, Optional, Tuple
+
+try:
+    from pymongo import monitoring
+except Exception:  # pragma: no cover - pymongo optional during tests
+    monitoring = None  # type: ignore
+
+_BOOL_FALSE = {"0", "false", "no", "off"}
+# Recent samples kept per series for percentiles.
+_SAMPLE_SIZE = 512
+
+
+def metrics_enabled() -> bool:
+    return monitoring is not None and os.getenv("MONGO_METRICS_ENABLED", "1").strip().lower() not in _BOOL_FALSE
+
+
+def _percentile(samples: Deque[float], q: float) -> Optional[float]:
+    if not samples:
+        return None
+    ordered = sorted(samples)
+    return round(ordered[min(len(ordered) - 1, int(q * len(ordered)))], 3)
+
+
+class _Series:
+    """Count, total, max and a sample window of durations in milliseconds."""
+
+    __slots__ = ("count", "failures", "total_ms", "max_ms", "samples")
+
+    def __init__(self) -> None:
+        self.count = 0
+        self.failures = 0
+        self.total_ms = 0.0
+        self.max_ms = 0.0
+        self.samples: Deque[float] = deque(maxlen=_SAMPLE_SIZE)
+
+    def add(self, duration_ms: float, failed: bool = False) -> None:
+        self.count += 1
+        self.failures += int(failed)
+        self.total_ms += duration_ms
+        self.max_ms = max(self.max_ms, duration_ms)
+        self.samples.append(duration_ms)
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "count": self.count,
+            "failures": self.failures,
+            "avg_ms": round(self.total_ms / self.count, 3) if self.count else None,
+            "p50_ms": _percentile(self.samples, 0.5),
+            "p95_ms": _percentile(self.samples, 0.95),
+            "max_ms": round(self.max_ms, 3),
+        }
+
+
+class _Pool:
+    __slots__ = ("checkouts_started", "checked_out", "checked_in", "checkout_failures", "in_use",
+                 "peak_in_use", "created", "closed", "wait")
+
+    def __init__(self) -> None:
+        self.checkouts_started = 0
+        self.checked_out = 0
+        self.checked_in = 0
+        self.checkout_failures: Dict[str, int] = defaultdict(int)
+        self.in_use = 0
+        self.peak_in_use = 0
+        self.created = 0
+        self.closed = 0
+        self.wait = _Series()
+
+    def snapshot(self) -> Dict[str, Any]:
+        return {
+            "checkouts_started": self.checkouts_started,
+            "checked_out": self.checked_out,
+            "checked_in": self.checked_in,
+            "checkout_failures": dict(self.checkout_failures),
+            # Started but not yet served: requests queuing for a connection now.
+            "waiting": max(self.checkouts_started - self.checked_out - sum(self.checkout_failures.values()), 0),
+            "in_use": self.in_use,
+            "peak_in_use": self.peak_in_use,
+            "connections_created": self.created,
+            "connections_closed": self.closed,
+            "wait": self.wait.snapshot(),
+        }
+
+
+class MongoMetrics:
+    """Thread-safe aggregation shared by the command and pool listeners."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._commands: Dict[Tuple[str, str], _Series] = defaultdict(_Series)
+        self._pools: Dict[str, _Pool] = defaultdict(_Pool)
+        # (connection, request id) -> collection, between started and finished events.
+        self._inflight: Dict[Tuple[Any, int], str] = {}
+
+    def reset(self) -> None:
+        with self._lock:
+            self._commands.clear()
+            self._pools.clear()
+            self._inflight.clear()
+
+    # -- commands -----------------------------------------------------------
+
+    def command_started(self, connection_id: Any, request_id: int, command_name: str, command: Dict[str, Any]) -> None:
+        target = command.get(command_name)
+        if command_name == "getMore":
+            target = command.get("collection")
+        collection = target if isinstance(target, str) else "-"
+        with self._lock:
+            self._inflight[(connection_id, request_id)] = collection
+
+    def command_finished(
+        self, connection_id: Any, request_id: int, command_name: str, duration_micros: int, failed: bool
+    ) -> None:
+        with self._lock:
+            collection = self._inflight.pop((connection_id, request_id), "-")
+            self._commands[(collection, command_name)].add(duration_micros / 1000.0, failed)
+
+    # -- pool ---------------------------------------------------------------
+
+    def pool_event(self, address: Any, kind: str, duration_s: Optional[float] = None, reason: Any = None) -> None:
+        key = "%s:%s" % tuple(address) if isinstance(address, tuple) else str(address)
+        with self._lock:
+            pool = self._pools[key]
+            if kind == "checkout_started":
+                pool.checkouts_started += 1
+            elif kind == "checked_out":
+                pool.checked_out += 1
+                pool.in_use += 1
+                pool.peak_in_use = max(pool.peak_in_use, pool.in_use)
+                if duration_s is not None:
+                    pool.wait.add(duration_s * 1000.0)
+            elif kind == "checkout_failed":
+                pool.checkout_failures[str(reason)] += 1
+                if duration_s is not None:
+                    pool.wait.add(duration_s * 1000.0, failed=True)
+            elif kind == "checked_in":
+                pool.checked_in += 1
+                pool.in_use = max(pool.in_use - 1, 0)
+            elif kind == "created":
+                pool.created += 1
+            elif kind == "closed":
+                pool.closed += 1
+
+    def snapshot(self) -> Dict[str, Any]:
+        with self._lock:
+            commands: List[Dict[str, Any]] = [
+                {"collection": collection, "command": command, **series.snapshot()}
+                for (collection, command), series in sorted(self._commands.items())
+            ]
+            pools = {address: pool.snapshot() for address, pool in self._pools.items()}
+        return {"enabled": metrics_enabled(), "commands": commands, "pools": pools}
+
+
+_METRICS = MongoMetrics()
+
+
+def mongo_metrics() -> Dict[str, Any]:
+    return _METRICS.snapshot()
+
+
+def reset_mongo_metrics() -> None:
+    _METRICS.reset()
+
+
+if monitoring is not None:
+
+    class CommandMetricsListener(monitoring.CommandListener):
+        def __init__(self, metrics: MongoMetrics) -> None:
+            self._metrics = metrics
+
+        def started(self, event: Any) -> None:
+            self._metrics.command_started(event.connection_id, event.request_id, event.command_name, event.command)
+
+        def succeeded(self, event: Any) -> None:
+            self._metrics.command_finished(
+                event.connection_id, event.request_id, event.command_name, event.duration_micros, False
+            )
+
+        def failed(self, event: Any) -> None:
+            self._metrics.command_finished(
+                event.connection_id, event.request_id, event.command_name, event.duration_micros, True
+            )
+
+    class PoolMetricsListener(monitoring.ConnectionPoolListener):
+        def __init__(self, metrics: MongoMetrics) -> None:
+            self._metrics = metrics
+
+        def pool_created(self, event: Any) -> None:
+            pass
+
+        def pool_ready(self, event: Any) -> None:
+            pass
+
+        def pool_cleared(self, event: Any) -> None:
+            pass
+
+        def pool_closed(self, event: Any) -> None:
+            pass
+
+        def connection_ready(self, event: Any) -> None:
+            pass
+
+        def connection_created(self, event: Any) -> None:
+            self._metrics.pool_event(event.address, "created")
+
+        def connection_closed(self, event: Any) -> None:
+            self._metrics.pool_event(event.address, "closed")
+
+        def connection_check_out_started(self, event: Any) -> None:
+            self._metrics.pool_event(event.address, "checkout_started")
+
+        def connection_checked_out(self, event: Any) -> None:
+            # ``duration`` (seconds spent waiting) is reported by PyMongo 4.7+.
+            self._metrics.pool_event(event.address, "checked_out", getattr(event, "duration", None))
+
+        def connection_check_out_failed(self, event: Any) -> None:
+            self._metrics.pool_event(
+                event.address, "checkout_failed", getattr(event, "duration", None), event.reason
+            )
+
+        def connection_checked_in(self, event: Any) -> None:
+            self._metrics.pool_event(event.address, "checked_in")
+
+
+def listeners() -> List[Any]:
+    """Listeners to pass as ``event_listeners`` when building a client."""
+
+    if not metrics_enabled():
+        return []
+    return [CommandMetricsListener(_METRICS), PoolMetricsListener(_METRICS)]
+
+
+__all__ = ["MongoMetrics", "listeners", "metrics_enabled", "mongo_metrics", "reset_mongo_metrics"]
@@ -0,0 +1,65 @@
+"""Opaque keyset cursors for the provider listing endpoints.
+
+A cursor is the sort key of the last row on a page, so the next page seeks
+straight past it on the ``(sort_rate, _id)`` index instead of skipping rows.
+"""
+
+from __future__ import annotations
+
+import base64
+import binascii
+import json
+from typing import Any, Dict, List, Optional, Sequence, Tuple
+
+try:
+    from bson import json_util as _json
+except Exception:  # pragma: no cover - pymongo optional during tests
+    _json = json  # type: ignore
+
+
+class InvalidCursor(ValueError):
+    """Raised when a cursor cannot be decoded or belongs to another listing."""
+
+
+def encode_cursor(scope: str, city: Optional[str], values: Sequence[Any]) -> str:
+    payload = _json.dumps({"s": scope, "c": city, "v": list(values)})
+    return base64.urlsafe_b64encode(payload.encode("utf-8")).decode("ascii").rstrip("=")
+
+
+def decode_cursor(token: str, scope: str) -> Tuple[Optional[str], List[Any]]:
+    """Return ``(city, sort values)`` stored in ``token``."""
+
+    try:
+        raw = base64.urlsafe_b64decode(token + "=" * (-len(token) % 4))
+        payload = _json.loads(raw.decode("utf-8"))
+    except (binascii.Error, UnicodeDecodeError, ValueError, TypeError) as exc:
+        raise InvalidCursor("Malformed cursor.") from exc
+    if not isinstance(payload, dict) or payload.get("s") != scope or not isinstance(payload.get("v"), list):
+        raise InvalidCursor("Cursor does not belong to this listing.")
+    return payload.get("c"), payload["v"]
+
+
+def keyset_filter(sort: Sequence[Tuple[str, int]], values: Sequence[Any]) -> Dict[str, Any]:
+    """Mongo predicate matching rows strictly after ``values`` in ``sort`` order.
+
+    ``[(a, 1), (b, 1)]`` after ``(x, y)`` becomes
+    ``{"$or": [{a: {"$gt": x}}, {a: x, b: {"$gt": y}}]}``.
+    """
+
+    if len(values) != len(sort):
+        raise InvalidCursor("Cursor does not match the listing sort.")
+    clauses: List[Dict[str, Any]] = []
+    for position, (field, direction) in enumerate(sort):
+        clause = {prefix: values[index] for index, (prefix, _) in enumerate(sort[:position])}
+        clause[field] = {"$gt" if direction > 0 else "$lt": values[position]}
+        clauses.append(clause)
+    return {"$or": clauses}
+
+
+def sort_tuple(sort: Sequence[Tuple[str, int]], values: Sequence[Any]) -> Tuple[Any, ...]:
+    """Python sort key equivalent to ``sort`` (descending fields must be numeric)."""
+
+    return tuple(value if direction > 0 else -value for (_, direction), value in zip(sort, values))
+
+
+__all__ = ["InvalidCursor", "decode_cursor", "encode_cursor", "keyset_filter", "sort_tuple"]
@@ -0,0 +1,202 @@
+"""Process-wide TTL/LRU cache for normalised provider catalog reads."""
+
+from __future__ import annotations
+
+import asyncio
+import logging
+import threading
+import time
+from collections import OrderedDict
+from typing import Any, Awaitable, Callable, Dict, Hashable, List, Optional, Tuple, TypeVar
+
+from .change_feed import users_change_feed
+from .env import env_float, env_int
+
+logger = logging.getLogger(__name__)
+
+T = TypeVar("T")
+
+_DEFAULT_TTL_SECONDS = 60.0
+_DEFAULT_MAX_ENTRIES = 256
+
+
+class ProviderCatalogCache:
+    """Thread-safe LRU cache whose entries also expire after ``ttl_seconds``."""
+
+    def __init__(self, ttl_seconds: float, max_entries: int) -> None:
+        self.ttl_seconds = ttl_seconds
+        self.max_entries = max(max_entries, 1)
+        self._entries: "OrderedDict[Hashable, Tuple[float, Any]]" = OrderedDict()
+        self._lock = threading.Lock()
+        self.hits = 0
+        self.misses = 0
+        self.evictions = 0
+        self.invalidations = 0
+
+    @property
+    def enabled(self) -> bool:
+        return self.ttl_seconds > 0
+
+    def get(self, key: Hashable) -> Optional[Any]:
+        now = time.monotonic()
+        with self._lock:
+            entry = self._entries.get(key)
+            if entry is None:
+                self.misses += 1
+                return None
+            expires_at, value = entry
+            if expires_at <= now:
+                del self._entries[key]
+                self.misses += 1
+                return None
+            self._entries.move_to_end(key)
+            self.hits += 1
+            return value
+
+    def set(self, key: Hashable, value: Any) -> None:
+        expires_at = time.monotonic() + self.ttl_seconds
+        with self._lock:
+            self._entries[key] = (expires_at, value)
+            self._entries.move_to_end(key)
+            while len(self._entries) > self.max_entries:
+                self._entries.popitem(last=False)
+                self.evictions += 1
+
+    def discard(self, key: Hashable) -> None:
+        with self._lock:
+            self._entries.pop(key, None)
+
+    def invalidate(self) -> None:
+        with self._lock:
+            self._entries.clear()
+            self.invalidations += 1
+
+    def stats(self) -> Dict[str, Any]:
+        with self._lock:
+            lookups = self.hits + self.misses
+            return {
+                "enabled": self.enabled,
+                "entries": len(self._entries),
+                "max_entries": self.max_entries,
+                "ttl_seconds": self.ttl_seconds,
+                "hits": self.hits,
+                "misses": self.misses,
+                "hit_ratio": round(self.hits / lookups, 4) if lookups else 0.0,
+                "evictions": self.evictions,
+                "invalidations": self.invalidations,
+            }
+
+
+_CACHE = ProviderCatalogCache(
+    ttl_seconds=env_float("PROVIDER_CACHE_TTL_SECONDS", _DEFAULT_TTL_SECONDS),
+    max_entries=env_int("PROVIDER_CACHE_MAX_ENTRIES", _DEFAULT_MAX_ENTRIES),
+)
+_WATCH_LOCK = threading.Lock()
+_WATCHING = False
+
+
+def _on_users_changed(_event: Optional[Dict[str, Any]]) -> None:
+    _CACHE.invalidate()
+
+
+def _ensure_invalidation() -> None:
+    global _WATCHING
+    if _WATCHING:
+        return
+    with _WATCH_LOCK:
+        if _WATCHING:
+            return
+        feed = users_change_feed()
+        feed.add_listener(_on_users_changed)
+        _WATCHING = feed.ensure_started()
+
+
+def start_provider_cache_invalidation() -> bool:
+    """Start the users change feed that invalidates the cache; ``False`` without Mongo."""
+
+    _ensure_invalidation()
+    return _WATCHING
+
+
+def provider_cache() -> ProviderCatalogCache:
+    return _CACHE
+
+
+def cache_key(role_key: str, city: Optional[str], limit: Optional[int], *extra: Hashable) -> Tuple[Hashable, ...]:
+    normalized_city = city.strip().lower() if isinstance(city, str) and city.strip() else None
+    return (role_key, normalized_city, int(limit) if limit else None, *extra)
+
+
+def cached_value(
+    key: Tuple[Hashable, ...],
+    loader: Callable[[], T],
+    copy: Callable[[T], T],
+    keep: Callable[[T], bool] = bool,
+) -> T:
+    """Return ``loader()`` through the shared cache.
+
+    ``copy`` is applied to every returned value so callers can annotate results
+    (e.g. ``provider_type``) without mutating the shared entry. Values for which
+    ``keep`` is false are returned but not stored.
+    """
+
+    if not _CACHE.enabled:
+        return loader()
+
+    cached = _CACHE.get(key)
+    if cached is None:
+        _ensure_invalidation()
+        cached = loader()
+        # Empty results usually mean Mongo is unreachable; do not pin them.
+        if keep(cached):
+            _CACHE.set(key, cached)
+    return copy(cached)
+
+
+async def cached_value_async(
+    key: Tuple[Hashable, ...],
+    loader: Callable[[], Awaitable[T]],
+    copy: Callable[[T], T],
+    keep: Callable[[T], bool] = bool,
+) -> T:
+    """:func:`cached_value` for coroutine loaders; shares the same cache entries."""
+
+    if not _CACHE.enabled:
+        return await loader()
+
+    cached = _CACHE.get(key)
+    if cached is None:
+        if not _WATCHING:
+            # Starting the change feed touches Mongo; keep it off the event loop.
+            await asyncio.to_thread(_ensure_invalidation)
+        cached = await loader()
+        if keep(cached):
+            _CACHE.set(key, cached)
+    return copy(cached)
+
+
+def cached_list(key: Tuple[Hashable, ...], loader: Callable[[], List[Dict[str, Any]]]) -> List[Dict[str, Any]]:
+    return cached_value(key, loader, copy=lambda items: [dict(item) for item in items])
+
+
+def invalidate_provider_cache() -> None:
+    _CACHE.invalidate()
+
+
+def provider_cache_stats() -> Dict[str, Any]:
+    stats = _CACHE.stats()
+    stats["invalidation_mode"] = users_change_feed().mode
+    return stats
+
+
+__all__ = [
+    "ProviderCatalogCache",
+    "cache_key",
+    "cached_list",
+    "cached_value",
+    "cached_value_async",
+    "invalidate_provider_cache",
+    "provider_cache",
+    "provider_cache_stats",
+    "start_provider_cache_invalidation",
+]
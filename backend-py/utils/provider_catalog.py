@@ -0,0 +1,326 @@
+"""Materialised ``provider_catalog`` collection of pre-normalised provider records.
+
+Each provider user document is parsed once (rates, capacities, lead days,
+rating, canonical name/city) and stored alongside the exact record shape every
+``list_*`` function returns under ``views.<role_key>``. The repository reads
+those views directly, so the request path does no per-document parsing.
+
+``ProviderCatalogSync`` keeps the collection current: users change events are
+applied incrementally (in polling mode, documents whose ``updatedAt`` is past
+the last synced value) and a full reconcile runs on start-up and every
+``PROVIDER_CATALOG_RECONCILE_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import threading
+from datetime import datetime
+from typing import Any, Dict, List, Optional
+
+from .change_feed import users_change_feed
+from .env import env_float
+from .mongo_client import MongoUnavailable, get_provider_catalog_collection, get_users_collection
+from .provider_cache import invalidate_provider_cache
+from .provider_search import ProviderSearchIndex, provider_search_index
+from .rate_stats import RateStats, rate_stats
+from .geo import LOCATION_FIELD, geo_point
+from .venue_name_index import venue_name_index
+from .provider_keys import name_key, provider_keys, role_token
+from .provider_records import (
+    CAPACITY_FIELDS,
+    MIN_LEAD_FIELDS,
+    RATING_FIELDS,
+    ROLE_ALIASES,
+    ROLE_RECORDS,
+    coalesce,
+    experience_len,
+    normalise_name,
+    price,
+    sort_rate,
+    to_float,
+    to_int,
+)
+
+try:
+    from pymongo import ASCENDING, GEOSPHERE, ReplaceOne
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    ASCENDING = 1
+    GEOSPHERE = "2dsphere"
+    ReplaceOne = None  # type: ignore
+
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_RECONCILE_SECONDS = 900.0
+_BATCH_SIZE = 500
+
+# Role key -> normalised role tokens that map onto it (e.g. "lighting designer").
+_ROLE_TOKENS: Dict[str, frozenset] = {
+    role_key: frozenset(role_token(alias) for alias in ROLE_ALIASES[role_key])
+    for role_key in ROLE_RECORDS
+}
+
+
+def _reconcile_interval() -> float:
+    return max(env_float("PROVIDER_CATALOG_RECONCILE_SECONDS", _DEFAULT_RECONCILE_SECONDS), 30.0)
+
+
+def _matching_roles(doc: Dict[str, Any]) -> List[str]:
+    token = role_token(doc.get("role"))
+    if not token:
+        return []
+    return [role_key for role_key, tokens in _ROLE_TOKENS.items() if token in tokens]
+
+
+def catalog_record(doc: Dict[str, Any]) -> Optional[Dict[str, Any]]:
+    """Normalise a raw users document; returns ``None`` for non-provider users."""
+
+    roles = _matching_roles(doc)
+    if not roles:
+        return None
+
+    views = {role_key: ROLE_RECORDS[role_key][0](doc) for role_key in roles}
+    primary = views[roles[0]]
+    name = normalise_name(doc) or primary.get("name")
+    record: Dict[str, Any] = {
+        "_id": doc["_id"],
+        "roles": roles,
+        "name": name,
+        "name_key": name_key(name),
+        "city": coalesce(doc, ("city", "base_city")),
+        "rate": primary.get("standard_rate_lkr"),
+        "capacity": to_int(coalesce(doc, CAPACITY_FIELDS)),
+        "min_lead_days": to_int(coalesce(doc, MIN_LEAD_FIELDS)),
+        "rating": to_float(coalesce(doc, RATING_FIELDS)),
+        # Numeric filter/sort fields the endpoints push down to Mongo.
+        "price_lkr": price(primary),
+        "sort_rate": sort_rate(primary),
+        "crew_size": primary.get("crew_size") or 0,
+        "experience_len": experience_len(primary),
+        "views": views,
+        "source_updated_at": doc.get("updatedAt"),
+        "synced_at": datetime.utcnow(),
+    }
+    record.update(provider_keys(doc))
+    location = geo_point(doc)
+    if location is not None:
+        # Left out rather than null so unplaced providers stay out of the geo index.
+        record[LOCATION_FIELD] = location
+    return record
+
+
+def ensure_catalog_indexes(collection: Any) -> None:
+    collection.create_index([("roles", ASCENDING), ("city_key", ASCENDING)], name="roles_1_city_key_1")
+    collection.create_index([("name_key", ASCENDING), ("roles", ASCENDING)], name="name_key_1_roles_1")
+    collection.create_index(
+        [("roles", ASCENDING), ("sort_rate", ASCENDING), ("_id", ASCENDING)],
+        name="roles_1_sort_rate_1__id_1",
+    )
+    collection.create_index(
+        [("roles", ASCENDING), ("city_key", ASCENDING), ("sort_rate", ASCENDING)],
+        name="roles_1_city_key_1_sort_rate_1",
+    )
+    collection.create_index([(LOCATION_FIELD, GEOSPHERE), ("roles", ASCENDING)], name="location_2dsphere_roles_1")
+
+
+class ProviderCatalogSync:
+    """Incremental + scheduled full normalisation of users into the catalog."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._reconcile_requested = threading.Event()
+        self._stop = threading.Event()
+        self._thread: Optional[threading.Thread] = None
+        self.last_reconciled_at: Optional[datetime] = None
+        # Newest users ``updatedAt`` already reflected in the catalog.
+        self.watermark: Optional[Any] = None
+
+    def start(self) -> bool:
+        with self._lock:
+            if self._thread is not None and self._thread.is_alive():
+                return True
+            try:
+                ensure_catalog_indexes(get_provider_catalog_collection())
+            except (MongoUnavailable, PyMongoError) as exc:
+                logger.info("Provider catalog sync not started: %s", exc)
+                return False
+            self._stop.clear()
+            self._reconcile_requested.set()  # initial full build
+            self._thread = threading.Thread(target=self._run, name="provider-catalog-sync", daemon=True)
+            self._thread.start()
+        feed = users_change_feed()
+        feed.add_listener(self.apply_change)
+        feed.ensure_started()
+        return True
+
+    def stop(self) -> None:
+        self._stop.set()
+        self._reconcile_requested.set()
+        users_change_feed().remove_listener(self.apply_change)
+
+    def _run(self) -> None:
+        while not self._stop.is_set():
+            self._reconcile_requested.wait(_reconcile_interval())
+            if self._stop.is_set():
+                return
+            self._reconcile_requested.clear()
+            try:
+                self.reconcile()
+            except (MongoUnavailable, PyMongoError) as exc:
+                logger.warning("Provider catalog reconcile failed: %s", exc)
+
+    def apply_change(self, event: Optional[Dict[str, Any]]) -> None:
+        """Users change-feed listener: upsert/delete one record per event."""
+
+        if event is None:
+            # Polling mode only knows *something* changed; catch up from the watermark.
+            try:
+                self.catch_up()
+            except (MongoUnavailable, PyMongoError) as exc:
+                logger.warning("Provider catalog catch-up failed: %s", exc)
+                self._reconcile_requested.set()
+            return
+
+        operation = event.get("operationType")
+        key = (event.get("documentKey") or {}).get("_id")
+        try:
+            collection = get_provider_catalog_collection()
+            if operation == "delete" and key is not None:
+                self._remove(collection, key)
+            elif operation in {"insert", "update", "replace"} and event.get("fullDocument"):
+                self._apply_document(collection, event["fullDocument"])
+            elif operation in {"drop", "rename", "invalidate"}:
+                self._reconcile_requested.set()
+                return
+            else:
+                return
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.warning("Provider catalog incremental update failed: %s", exc)
+            self._reconcile_requested.set()
+            return
+        invalidate_provider_cache()
+
+    def _apply_document(self, collection: Any, doc: Dict[str, Any]) -> None:
+        record = catalog_record(doc)
+        if record is None:
+            self._remove(collection, doc["_id"])
+            return
+        collection.replace_one({"_id": record["_id"]}, record, upsert=True)
+        venue_name_index().apply(record)
+        provider_search_index().apply(record)
+        rate_stats().apply(record)
+
+    def _remove(self, collection: Any, key: Any) -> None:
+        collection.delete_one({"_id": key})
+        venue_name_index().discard(key)
+        provider_search_index().discard(key)
+        rate_stats().discard(key)
+
+    def catch_up(self) -> int:
+        """Apply users changed since the last sync; returns records touched.
+
+        Upserts carry a newer ``updatedAt`` and are read past the watermark.
+        A change that left no newer document behind was a delete, so catalog
+        ids are checked against users instead. Documents without
+        ``updatedAt`` wait for the scheduled reconcile.
+        """
+
+        watermark = self.watermark
+        if watermark is None:
+            self._reconcile_requested.set()
+            return 0
+        users = get_users_collection()
+        catalog = get_provider_catalog_collection()
+        touched = 0
+        for doc in users.find({"updatedAt": {"$gt": watermark}}).sort("updatedAt", ASCENDING):
+            self._apply_document(catalog, doc)
+            self.watermark = doc["updatedAt"]
+            touched += 1
+        if not touched:
+            touched = self._prune_deleted(users, catalog)
+        if touched:
+            invalidate_provider_cache()
+        return touched
+
+    def _prune_deleted(self, users: Any, catalog: Any) -> int:
+        ids = [doc["_id"] for doc in catalog.find({}, projection={"_id": 1})]
+        removed = 0
+        for start in range(0, len(ids), _BATCH_SIZE):
+            batch = ids[start : start + _BATCH_SIZE]
+            alive = {doc["_id"] for doc in users.find({"_id": {"$in": batch}}, projection={"_id": 1})}
+            for key in batch:
+                if key not in alive:
+                    self._remove(catalog, key)
+                    removed += 1
+        return removed
+
+    def reconcile(self) -> int:
+        """Rebuild every record from the users collection; returns records written."""
+
+        users = get_users_collection()
+        catalog = get_provider_catalog_collection()
+        # Records carry ``synced_at``; anything older than this pass afterwards
+        # was deleted or stopped being a provider. Incremental writes racing the
+        # pass (or another worker's pass) are newer and survive the sweep.
+        started_at = datetime.utcnow()
+        # Anything written during the pass is newer than this and is re-read
+        # by the next catch-up; re-applying a record is idempotent.
+        newest = users.find_one(
+            {"updatedAt": {"$exists": True}}, projection={"updatedAt": 1}, sort=[("updatedAt", -1)]
+        )
+
+        written = 0
+        pending: List[Any] = []
+        venue_names: Dict[str, Any] = {}
+        search_index = ProviderSearchIndex()
+        stats = RateStats()
+        for doc in users.find({"role": {"$exists": True}}):
+            record = catalog_record(doc)
+            if record is None:
+                continue
+            if "venue" in record["roles"] and record["name_key"]:
+                venue_names.setdefault(record["name_key"], record["_id"])
+            search_index.apply(record)
+            stats.apply(record)
+            pending.append(ReplaceOne({"_id": record["_id"]}, record, upsert=True))
+            if len(pending) >= _BATCH_SIZE:
+                catalog.bulk_write(pending, ordered=False)
+                written += len(pending)
+                pending = []
+        if pending:
+            catalog.bulk_write(pending, ordered=False)
+            written += len(pending)
+
+        catalog.delete_many({"synced_at": {"$lt": started_at}})
+        venue_name_index().replace(venue_names)
+        provider_search_index().adopt(search_index, live=True)
+        rate_stats().adopt(stats, live=True)
+        self.last_reconciled_at = started_at
+        self.watermark = (newest or {}).get("updatedAt")
+        invalidate_provider_cache()
+        logger.info("Provider catalog reconciled: %s record(s)", written)
+        return written
+
+
+_SYNC = ProviderCatalogSync()
+
+
+def provider_catalog_sync() -> ProviderCatalogSync:
+    return _SYNC
+
+
+def start_provider_catalog_sync() -> bool:
+    return _SYNC.start()
+
+
+__all__ = [
+    "ProviderCatalogSync",
+    "catalog_record",
+    "ensure_catalog_indexes",
+    "provider_catalog_sync",
+    "start_provider_catalog_sync",
+]
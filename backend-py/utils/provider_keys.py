@@ -0,0 +1,220 @@
+"""Normalised, indexable lookup keys stored on provider user documents.
+
+The Node backend writes free-form ``role`` and address strings. Matching them
+case-insensitively needs ``$regex`` which Mongo cannot serve from an index, so
+this module derives two canonical fields that can be matched exactly:
+
+* ``role_key`` – lowercased role with spaces/hyphens collapsed to ``_``
+* ``city_key`` – lowercased alphanumeric tokens of every address-like field
+
+``migrate_provider_keys`` backfills existing documents and creates the compound
+index; ``watch_provider_keys`` keeps new/updated documents in sync via the
+users change feed.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from typing import Any, Dict, Iterable, List, Optional
+
+from .change_feed import users_change_feed
+from .mongo_client import MongoUnavailable, get_users_collection
+
+try:
+    from pymongo import ASCENDING, UpdateOne
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    ASCENDING = 1
+    UpdateOne = None  # type: ignore
+
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+ROLE_KEY_FIELD = "role_key"
+CITY_KEY_FIELD = "city_key"
+KEY_INDEX_NAME = "role_key_1_city_key_1"
+
+CITY_FIELDS = ("city", "venueAddress", "address", "companyAddress", "base_city")
+_TOKEN_RE = re.compile(r"[a-z0-9]+")
+_WHITESPACE = re.compile(r"\s+")
+_ROLE_SEPARATORS = re.compile(r"[\s\-]+")
+
+_INDEX_RECHECK_SECONDS = 60.0
+_INDEX_STATE: Dict[str, Any] = {}
+_STATE_LOCK = threading.Lock()
+_WATCHING = False
+
+
+def role_token(value: Any) -> Optional[str]:
+    if not isinstance(value, str) or not value.strip():
+        return None
+    return _ROLE_SEPARATORS.sub("_", value.strip().lower())
+
+
+def city_tokens(value: Any) -> List[str]:
+    if not isinstance(value, str):
+        return []
+    return _TOKEN_RE.findall(value.lower())
+
+
+def name_key(name: Any) -> Optional[str]:
+    """Lowercased, whitespace-collapsed name used for exact lookups."""
+
+    if not isinstance(name, str) or not name.strip():
+        return None
+    return _WHITESPACE.sub(" ", name.strip().lower())
+
+
+def provider_keys(doc: Dict[str, Any]) -> Dict[str, Any]:
+    tokens = set()
+    for field in CITY_FIELDS:
+        tokens.update(city_tokens(doc.get(field)))
+    return {
+        ROLE_KEY_FIELD: role_token(doc.get("role")),
+        CITY_KEY_FIELD: sorted(tokens),
+    }
+
+
+def _needs_update(doc: Dict[str, Any], keys: Dict[str, Any]) -> bool:
+    return any(doc.get(field) != value for field, value in keys.items())
+
+
+def ensure_key_index(collection: Any) -> None:
+    collection.create_index(
+        [(ROLE_KEY_FIELD, ASCENDING), (CITY_KEY_FIELD, ASCENDING)],
+        name=KEY_INDEX_NAME,
+    )
+    with _STATE_LOCK:
+        _INDEX_STATE["ready"] = True
+
+
+def key_index_known() -> bool:
+    """Whether :func:`keyed_queries_enabled` can answer without querying Mongo."""
+
+    with _STATE_LOCK:
+        if _INDEX_STATE.get("ready"):
+            return True
+        checked_at = _INDEX_STATE.get("checked_at")
+        return checked_at is not None and time.monotonic() - checked_at < _INDEX_RECHECK_SECONDS
+
+
+def keyed_queries_enabled() -> bool:
+    """Return ``True`` once the key index exists.
+
+    A missing index (migration not run yet) is re-checked at most once a
+    minute, so workers pick up ``migrate_provider_keys`` without a restart.
+    """
+
+    now = time.monotonic()
+    with _STATE_LOCK:
+        if _INDEX_STATE.get("ready"):
+            return True
+        checked_at = _INDEX_STATE.get("checked_at")
+        if checked_at is not None and now - checked_at < _INDEX_RECHECK_SECONDS:
+            return False
+        _INDEX_STATE["checked_at"] = now
+    try:
+        ready = KEY_INDEX_NAME in get_users_collection().index_information()
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.debug("Unable to inspect users indexes: %s", exc)
+        return False
+    if ready:
+        with _STATE_LOCK:
+            _INDEX_STATE["ready"] = True
+        watch_provider_keys()
+    return ready
+
+
+def migrate_provider_keys(collection: Any = None, batch_size: int = 500) -> int:
+    """Backfill ``role_key``/``city_key`` on every user document; returns docs updated."""
+
+    if collection is None:
+        collection = get_users_collection()
+    if UpdateOne is None:
+        raise MongoUnavailable("pymongo is not installed.")
+
+    projection = {field: 1 for field in ("role", ROLE_KEY_FIELD, CITY_KEY_FIELD, *CITY_FIELDS)}
+    pending: List[Any] = []
+    updated = 0
+    for doc in collection.find({}, projection=projection):
+        keys = provider_keys(doc)
+        if not _needs_update(doc, keys):
+            continue
+        pending.append(UpdateOne({"_id": doc["_id"]}, {"$set": keys}))
+        if len(pending) >= batch_size:
+            updated += collection.bulk_write(pending, ordered=False).modified_count
+            pending = []
+    if pending:
+        updated += collection.bulk_write(pending, ordered=False).modified_count
+
+    ensure_key_index(collection)
+    return updated
+
+
+def _sync_keys(event: Optional[Dict[str, Any]]) -> None:
+    if not event or event.get("operationType") not in {"insert", "update", "replace"}:
+        return
+    doc = event.get("fullDocument")
+    if not doc:
+        return
+    keys = provider_keys(doc)
+    # Writing identical keys would emit another change event; skip no-ops.
+    if not _needs_update(doc, keys):
+        return
+    try:
+        get_users_collection().update_one({"_id": doc["_id"]}, {"$set": keys})
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Failed to sync provider keys for %s: %s", doc.get("_id"), exc)
+
+
+def watch_provider_keys() -> None:
+    global _WATCHING
+    with _STATE_LOCK:
+        if _WATCHING:
+            return
+        _WATCHING = True
+    feed = users_change_feed()
+    feed.add_listener(_sync_keys)
+    feed.ensure_started()
+
+
+def key_filter(role_aliases: Iterable[str], city: Optional[str]) -> Dict[str, Any]:
+    """Exact-match filter on the normalised key fields."""
+
+    roles = sorted({token for token in (role_token(alias) for alias in role_aliases) if token})
+    query: Dict[str, Any] = {ROLE_KEY_FIELD: {"$in": roles}}
+    query.update(city_filter(city))
+    return query
+
+
+def city_filter(city: Optional[str]) -> Dict[str, Any]:
+    """Exact-match filter on ``city_key`` (every query token must be present)."""
+
+    tokens = city_tokens(city) if city else []
+    if not tokens:
+        return {}
+    return {CITY_KEY_FIELD: tokens[0] if len(tokens) == 1 else {"$all": tokens}}
+
+
+__all__ = [
+    "CITY_FIELDS",
+    "CITY_KEY_FIELD",
+    "KEY_INDEX_NAME",
+    "ROLE_KEY_FIELD",
+    "city_filter",
+    "city_tokens",
+    "ensure_key_index",
+    "key_filter",
+    "key_index_known",
+    "keyed_queries_enabled",
+    "migrate_provider_keys",
+    "name_key",
+    "provider_keys",
+    "role_token",
+    "watch_provider_keys",
+]
@@ -0,0 +1,448 @@
+"""Provider query building and page shaping shared by both repositories.
+
+:mod:`utils.provider_repository` and :mod:`utils.async_provider_repository`
+differ only in how they talk to Mongo. Everything around the round trips
+lives here: the users and catalog filters, the raw-document fallback
+(predicates, ordering, keyset seek), page and snapshot shaping, and the
+process-wide catalog readiness state.
+"""
+
+from __future__ import annotations
+
+import logging
+import os
+import re
+import time
+from typing import Any, Dict, Iterable, List, Optional, Set, Tuple
+
+from .env import env_int
+from .geo import DEFAULT_RADIUS_KM, distance_km, within_filter
+from .pagination import encode_cursor, keyset_filter, sort_tuple
+from .provider_cache import cache_key
+from .provider_keys import (
+    CITY_FIELDS,
+    CITY_KEY_FIELD,
+    ROLE_KEY_FIELD,
+    city_filter,
+    key_filter,
+    keyed_queries_enabled,
+)
+from .provider_records import (
+    NAME_FIELDS,
+    ROLE_ALIASES,
+    ROLE_RECORDS,
+    ROLE_SORTS,
+    experience_len,
+    genre_keys,
+    price,
+    sort_rate,
+)
+from .provider_search import provider_search_index, search_terms
+
+logger = logging.getLogger(__name__)
+
+
+def _role_regex(role_key: str) -> re.Pattern:
+    aliases = ROLE_ALIASES.get(role_key, (role_key,))
+    escaped = "|".join(re.escape(alias) for alias in aliases)
+    return re.compile(f"^(?:{escaped})$", re.IGNORECASE)
+
+
+def _city_regex(city: str) -> re.Pattern:
+    return re.compile(re.escape(city), re.IGNORECASE)
+
+
+def regex_filter(role_key: str, city: Optional[str]) -> Dict[str, Any]:
+    query: Dict[str, Any] = {"role": {"$regex": _role_regex(role_key)}}
+    if city:
+        regex = _city_regex(city)
+        query["$or"] = [{field: regex} for field in CITY_FIELDS]
+    return query
+
+
+def role_filter(role_key: str, city: Optional[str]) -> Dict[str, Any]:
+    query = regex_filter(role_key, city)
+    if keyed_queries_enabled():
+        # Documents written since the last key migration have no role_key yet;
+        # the $exists branch still walks the index and regex-filters only those.
+        legacy = dict(query, **{ROLE_KEY_FIELD: {"$exists": False}})
+        keyed = key_filter(ROLE_ALIASES.get(role_key, (role_key,)), city)
+        query = {"$or": [keyed, legacy]}
+    return query
+
+
+def _text_regex(value: Any) -> Optional[re.Pattern]:
+    needle = str(value).strip()
+    return re.compile(re.escape(needle), re.IGNORECASE) if needle else None
+
+
+def _text_filters(filters: Optional[Dict[str, Any]]) -> List[Dict[str, Any]]:
+    """Users-collection clauses for the text criteria in ``filters``.
+
+    Raw documents keep numbers as unparsed strings, so only the substring
+    criteria can be pushed down; each clause may match a superset of what
+    :func:`matches_filters` keeps, never less.
+    """
+
+    filters = filters or {}
+    clauses: List[Dict[str, Any]] = []
+    genre = _text_regex(filters["genre"]) if filters.get("genre") else None
+    if genre:
+        clauses.append({"$or": [{"genres": genre}, {"genre": genre}]})
+    service = _text_regex(filters["service"]) if filters.get("service") else None
+    if service:
+        clauses.append({"services": service})
+    q = _text_regex(filters["q"]) if filters.get("q") else None
+    if q:
+        fields = (*NAME_FIELDS, "venueType", "type", "role", "genres", "genre", "services")
+        clauses.append({"$or": [{field: q} for field in fields]})
+    return clauses
+
+
+def users_filter(role_key: str, city: Optional[str], filters: Optional[Dict[str, Any]] = None) -> Dict[str, Any]:
+    query = role_filter(role_key, city)
+    clauses = _text_filters(filters)
+    return {"$and": [query, *clauses]} if clauses else query
+
+
+def field_projection(fields: Optional[Iterable[str]]) -> Optional[Dict[str, int]]:
+    if not fields:
+        return None
+    return {field: 1 for field in fields}
+
+
+# Upper bound on raw users documents read per role when a listing cannot be
+# served from the catalog. Ordering by ``_id`` keeps the window stable, so
+# cursors issued from it stay consistent across pages.
+_DEFAULT_USERS_SCAN_LIMIT = 500
+
+
+def users_scan_limit() -> int:
+    return max(env_int("PROVIDER_USERS_SCAN_LIMIT", _DEFAULT_USERS_SCAN_LIMIT), 1)
+
+
+_CATALOG_RECHECK_SECONDS = 60.0
+_CATALOG_STATE: Dict[str, Any] = {"ready": False, "checked_at": None}
+
+
+def _catalog_enabled() -> bool:
+    return os.getenv("PROVIDER_CATALOG_SOURCE", "catalog").strip().lower() == "catalog"
+
+
+def catalog_known_state() -> Optional[bool]:
+    """Cached catalog readiness, or ``None`` when the catalog should be probed now.
+
+    An empty catalog (sync not run yet) is re-probed at most once a minute so
+    reads keep falling back to the raw users collection without extra queries.
+    """
+
+    if not _catalog_enabled():
+        return False
+    if _CATALOG_STATE["ready"]:
+        return True
+    now = time.monotonic()
+    checked_at = _CATALOG_STATE["checked_at"]
+    if checked_at is not None and now - checked_at < _CATALOG_RECHECK_SECONDS:
+        return False
+    _CATALOG_STATE["checked_at"] = now
+    return None
+
+
+def record_catalog_state(ready: bool) -> bool:
+    """Remember the outcome of a catalog probe; returns ``ready``."""
+
+    _CATALOG_STATE["ready"] = ready
+    return ready
+
+
+def catalog_filter(
+    role_keys: Iterable[str],
+    city: Optional[str],
+    filters: Optional[Dict[str, Any]] = None,
+) -> Dict[str, Any]:
+    role_keys = list(role_keys)
+    query: Dict[str, Any] = {"roles": role_keys[0] if len(role_keys) == 1 else {"$in": role_keys}}
+    query.update(city_filter(city))
+    filters = filters or {}
+    if filters.get("min_capacity"):
+        query["capacity"] = {"$gte": int(filters["min_capacity"])}
+    if filters.get("max_budget_lkr"):
+        query["price_lkr"] = {"$lte": int(filters["max_budget_lkr"])}
+    if filters.get("min_crew_size"):
+        query["crew_size"] = {"$gte": int(filters["min_crew_size"])}
+    if filters.get("near"):
+        query.update(within_filter(filters["near"], filters.get("radius_km") or DEFAULT_RADIUS_KM))
+    # Text criteria (q/genre/service) resolve to ``_id`` sets via the search index.
+    return query
+
+
+def matches_filters(view: Dict[str, Any], filters: Dict[str, Any]) -> bool:
+    """Python twin of :func:`catalog_filter` for records built from raw users."""
+
+    if filters.get("min_capacity") and (view.get("capacity") or 0) < filters["min_capacity"]:
+        return False
+    if filters.get("max_budget_lkr") and price(view) > filters["max_budget_lkr"]:
+        return False
+    if filters.get("min_crew_size") and (view.get("crew_size") or 0) < filters["min_crew_size"]:
+        return False
+    if filters.get("near"):
+        location = view.get("location")
+        if not location:
+            return False
+        radius_km = filters.get("radius_km") or DEFAULT_RADIUS_KM
+        if distance_km(tuple(location["coordinates"]), filters["near"]) > radius_km:
+            return False
+    if filters.get("genre"):
+        needle = str(filters["genre"]).strip().lower()
+        if not any(needle in genre for genre in genre_keys(view)):
+            return False
+    if filters.get("service"):
+        needle = str(filters["service"]).strip().lower()
+        if not any(needle in service.lower() for service in view.get("services") or [] if isinstance(service, str)):
+            return False
+    if filters.get("q"):
+        needle = str(filters["q"]).strip().lower()
+        haystack = [view.get("name"), view.get("type"), *genre_keys(view), *(view.get("services") or [])]
+        if not any(isinstance(value, str) and needle in value.lower() for value in haystack):
+            return False
+    return True
+
+
+def search_ids(role_keys: List[str], filters: Dict[str, Any]) -> Tuple[bool, Optional[Set[Any]]]:
+    """``(usable, ids)`` for the text criteria in ``filters``.
+
+    ``ids`` is ``None`` when there are no text criteria; ``usable`` is false
+    when there are but the search index cannot be loaded.
+    """
+
+    terms = search_terms(filters)
+    if not terms:
+        return True, None
+    index = provider_search_index()
+    if not index.ensure_loaded():
+        return False, None
+    return True, index.search(role_keys, **terms)
+
+
+# A page row: (role key, normalised record, sort key values).
+Row = Tuple[str, Dict[str, Any], Tuple[Any, ...]]
+
+
+def catalog_find_args(
+    role_keys: List[str],
+    city: Optional[str],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]],
+    ids: Optional[Set[Any]] = None,
+) -> Tuple[Dict[str, Any], Dict[str, int], List[Tuple[str, int]]]:
+    """``(query, projection, sort)`` for one catalog page read."""
+
+    sort = ROLE_SORTS[role_keys[0]]
+    query = catalog_filter(role_keys, city, filters)
+    if ids is not None:
+        query["_id"] = {"$in": list(ids)}
+    if after is not None:
+        query = {"$and": [query, keyset_filter(sort, after)]}
+    projection: Dict[str, int] = {"roles": 1}
+    projection.update({field: 1 for field, _ in sort})
+    projection.update({f"views.{role_key}": 1 for role_key in role_keys})
+    return query, projection, sort
+
+
+def catalog_rows(docs: Iterable[Dict[str, Any]], role_keys: List[str], sort: List[Tuple[str, int]]) -> List[Row]:
+    rows: List[Row] = []
+    for doc in docs:
+        role_key = next(role for role in doc["roles"] if role in role_keys)
+        rows.append((role_key, dict(doc["views"][role_key]), tuple(doc.get(field) for field, _ in sort)))
+    return rows
+
+
+def user_rows(
+    role_keys: List[str],
+    docs_by_role: Dict[str, List[Dict[str, Any]]],
+    limit: Optional[int],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]] = None,
+) -> List[Row]:
+    """Normalise raw users documents into ordered page rows.
+
+    Raw documents hold unparsed strings, so predicates, ordering and the
+    cursor seek all run after normalisation.
+    """
+
+    sort = ROLE_SORTS[role_keys[0]]
+    after_key = sort_tuple(sort, after) if after is not None else None
+    rows: List[Row] = []
+    for role_key in role_keys:
+        record = ROLE_RECORDS[role_key][0]
+        for doc in docs_by_role.get(role_key, []):
+            view = record(doc)
+            if not matches_filters(view, filters):
+                continue
+            values = {"sort_rate": sort_rate(view), "experience_len": experience_len(view), "_id": doc.get("_id")}
+            key = tuple(values[field] for field, _ in sort)
+            if after_key is not None and sort_tuple(sort, key) <= after_key:
+                continue
+            rows.append((role_key, view, key))
+    rows.sort(key=lambda row: sort_tuple(sort, row[2]))
+    return rows[: int(limit)] if limit else rows
+
+
+def warn_if_truncated(docs_by_role: Dict[str, List[Dict[str, Any]]], scan_limit: int) -> None:
+    for role_key, docs in docs_by_role.items():
+        if len(docs) >= scan_limit:
+            logger.warning(
+                "Users fallback for role %s hit the %d document scan limit; "
+                "listings are incomplete until the provider catalog is ready",
+                role_key,
+                scan_limit,
+            )
+
+
+def active_filters(**filters: Any) -> Dict[str, Any]:
+    return {key: value for key, value in filters.items() if value}
+
+
+_MUSIC_PROVIDER_TYPES: Dict[str, str] = {"solo_musician": "solo", "music_ensemble": "band"}
+
+
+# Listing name -> role keys it reads; ``music`` merges soloists and bands.
+PAGE_ROLES: Dict[str, List[str]] = {
+    **{role_key: [role_key] for role_key in ROLE_RECORDS},
+    "music": list(_MUSIC_PROVIDER_TYPES),
+}
+
+
+def _page_item(listing: str, role_key: str, view: Dict[str, Any]) -> Dict[str, Any]:
+    if listing == "music":
+        return dict(view, provider_type=_MUSIC_PROVIDER_TYPES[role_key])
+    return view
+
+
+def page_cache_key(
+    listing: str,
+    city: Optional[str],
+    limit: int,
+    active: Dict[str, Any],
+    cursor: Optional[str],
+) -> Tuple[Any, ...]:
+    return cache_key(listing, city, limit, *sorted(active.items()), cursor)
+
+
+def page_from_rows(
+    listing: str,
+    city: Optional[str],
+    limit: int,
+    rows: List[Row],
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    # Loaders fetch one extra row to tell whether another page exists.
+    next_cursor = encode_cursor(listing, city, rows[limit - 1][2]) if len(rows) > limit else None
+    return [_page_item(listing, role_key, view) for role_key, view, _ in rows[:limit]], next_cursor
+
+
+def copy_page(page: Tuple[List[Dict[str, Any]], Optional[str]]) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    return [dict(item) for item in page[0]], page[1]
+
+
+def keep_page(page: Tuple[List[Dict[str, Any]], Optional[str]]) -> bool:
+    return bool(page[0])
+
+
+# Snapshot group name -> role key; mirrors the list_* API.
+_SNAPSHOT_GROUPS: Dict[str, str] = {
+    "venues": "venue",
+    "solo_musicians": "solo_musician",
+    "music_ensembles": "music_ensemble",
+    "lighting_designers": "lights",
+    "sound_specialists": "sound_specialist",
+}
+
+
+def empty_snapshot() -> Dict[str, List[Dict[str, Any]]]:
+    return {group: [] for group in _SNAPSHOT_GROUPS}
+
+
+def catalog_snapshot_pipeline(city: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    return [
+        {"$match": catalog_filter(_SNAPSHOT_GROUPS.values(), city)},
+        {
+            "$facet": {
+                group: [
+                    {"$match": {"roles": role_key}},
+                    {"$limit": int(limit)},
+                    {"$project": {"_id": 0, "view": f"$views.{role_key}"}},
+                ]
+                for group, role_key in _SNAPSHOT_GROUPS.items()
+            }
+        },
+    ]
+
+
+def catalog_snapshot(result: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    return {group: [doc["view"] for doc in result.get(group, [])] for group in _SNAPSHOT_GROUPS}
+
+
+def users_snapshot_pipeline(city: Optional[str], limit: int) -> List[Dict[str, Any]]:
+    filters = {group: role_filter(role_key, city) for group, role_key in _SNAPSHOT_GROUPS.items()}
+    # The facet branches re-match on role and address fields, so keep those too.
+    fields = {"role", ROLE_KEY_FIELD, CITY_KEY_FIELD, *CITY_FIELDS}
+    for role_key in _SNAPSHOT_GROUPS.values():
+        fields.update(ROLE_RECORDS[role_key][1])
+    return [
+        # Narrow to provider documents first so $facet only sees candidates.
+        {"$match": {"$or": list(filters.values())}},
+        {"$project": field_projection(sorted(fields))},
+        {
+            "$facet": {
+                group: [{"$match": query}, {"$limit": int(limit)}]
+                for group, query in filters.items()
+            }
+        },
+    ]
+
+
+def users_snapshot(result: Dict[str, Any]) -> Dict[str, List[Dict[str, Any]]]:
+    return {
+        group: [ROLE_RECORDS[role_key][0](doc) for doc in result.get(group, [])]
+        for group, role_key in _SNAPSHOT_GROUPS.items()
+    }
+
+
+def copy_snapshot(snapshot: Dict[str, List[Dict[str, Any]]]) -> Dict[str, List[Dict[str, Any]]]:
+    return {group: [dict(item) for item in items] for group, items in snapshot.items()}
+
+
+def keep_snapshot(snapshot: Dict[str, List[Dict[str, Any]]]) -> bool:
+    return any(snapshot.values())
+
+
+__all__ = [
+    "PAGE_ROLES",
+    "Row",
+    "active_filters",
+    "catalog_filter",
+    "catalog_find_args",
+    "catalog_known_state",
+    "catalog_rows",
+    "catalog_snapshot",
+    "catalog_snapshot_pipeline",
+    "copy_page",
+    "copy_snapshot",
+    "empty_snapshot",
+    "field_projection",
+    "keep_page",
+    "keep_snapshot",
+    "matches_filters",
+    "page_cache_key",
+    "page_from_rows",
+    "record_catalog_state",
+    "regex_filter",
+    "role_filter",
+    "search_ids",
+    "user_rows",
+    "users_filter",
+    "users_scan_limit",
+    "users_snapshot",
+    "users_snapshot_pipeline",
+    "warn_if_truncated",
+]
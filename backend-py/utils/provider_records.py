@@ -0,0 +1,297 @@
+"""Normalisation of raw ``users`` provider documents into listing records.
+
+Provider documents are free-form (rates as strings, ranges like "100-200",
+several spellings of the name and contact fields). The record functions here
+turn one document into the exact shape each ``list_*`` function returns, and
+are shared by the repositories, their asyncio twins and the provider catalog.
+"""
+
+from __future__ import annotations
+
+import re
+from typing import Any, Callable, Dict, Iterable, List, Optional, Tuple
+
+from .geo import GEO_FIELDS, geo_point
+from .provider_keys import CITY_FIELDS
+
+ROLE_ALIASES: Dict[str, Tuple[str, ...]] = {
+    "venue": ("venue", "venues", "venue host", "venue_host"),
+    "lights": ("lights", "lighting", "light_provider", "lighting designer"),
+    "music": ("musician", "music_band", "band", "dj"),
+    "solo_musician": ("musician", "solo musician", "solo_musician", "solo-musician"),
+    "music_ensemble": ("music_band", "music ensemble", "music_ensemble", "ensemble", "band"),
+    "lighting_designer": ("lights", "lighting designer", "lighting", "light_provider", "lighting_designer"),
+    "sound_specialist": ("sounds", "sound specialist", "sound", "audio", "sound engineer", "sound_engineer"),
+}
+
+
+NAME_FIELDS = ("name", "companyName", "venueName", "bandName")
+CONTACT_FIELDS = ("phone", "contact", "contactPerson")
+WEBSITE_FIELDS = ("website", "spotifyLink", "youtubeLink", "facebookLink", "instagramLink")
+CAPACITY_FIELDS = ("capacity", "maxCapacity", "capacityRange")
+MIN_LEAD_FIELDS = ("minLeadDays", "leadTimeDays", "leadDays")
+RATING_FIELDS = ("rating", "avgRating", "averageRating")
+_BOOL_TRUE = {"1", "true", "yes", "y", "on"}
+
+# Fields each record normaliser reads; sent to Mongo as the query projection so
+# profile blobs, photos and auth fields never leave the server.
+_COMMON_FIELDS = ("role", *NAME_FIELDS, *WEBSITE_FIELDS, *CONTACT_FIELDS)
+_VENUE_FIELDS = (
+    *_COMMON_FIELDS,
+    *CITY_FIELDS,
+    *GEO_FIELDS,
+    *CAPACITY_FIELDS,
+    *MIN_LEAD_FIELDS,
+    *RATING_FIELDS,
+    "venueType",
+    "type",
+    "standardRate",
+    "avg_cost_lkr",
+    "avgCostLkr",
+    "avgCost",
+    "pricing.standardRate",
+    "pricing.avg_cost_lkr",
+    "pricing.avgCostLkr",
+    "pricing.avgCost",
+)
+_LIGHTING_FIELDS = (*_COMMON_FIELDS, "address", "city", "services", "crewSize", "standardRate")
+_SOLO_MUSICIAN_FIELDS = (*_COMMON_FIELDS, "genres", "genre", "experience", "standardRate")
+_MUSIC_ENSEMBLE_FIELDS = (*_COMMON_FIELDS, "genres", "members", "experience", "standardRate")
+_SOUND_SPECIALIST_FIELDS = (*_COMMON_FIELDS, "services", "crewSize", "standardRate")
+
+
+def coalesce(doc: Dict[str, Any], fields: Iterable[str]) -> Optional[Any]:
+    for key in fields:
+        value = doc.get(key)
+        if value not in (None, "", []):
+            return value
+    return None
+
+
+def to_int(value: Any) -> Optional[int]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, bool):  # guard against True -> 1
+        return None
+    if isinstance(value, (int, float)):
+        return int(value)
+    if isinstance(value, str):
+        digits = re.findall(r"\d+", value)
+        if digits:
+            # Prefer the largest number in ranges like "100-200"
+            return int(digits[-1])
+    return None
+
+
+def to_float(value: Any) -> Optional[float]:
+    if value in (None, ""):
+        return None
+    if isinstance(value, bool):
+        return None
+    if isinstance(value, (int, float)):
+        return float(value)
+    if isinstance(value, str):
+        try:
+            return float(value)
+        except ValueError:
+            return None
+    return None
+
+
+def to_bool(value: Any) -> Optional[bool]:
+    if value is None:
+        return None
+    if isinstance(value, bool):
+        return value
+    if isinstance(value, (int, float)):
+        return bool(value)
+    if isinstance(value, str):
+        normalized = value.strip().lower()
+        if normalized in _BOOL_TRUE:
+            return True
+        if normalized == "0" or normalized in {"false", "no", "n", "off"}:
+            return False
+    return None
+
+
+
+def normalise_name(doc: Dict[str, Any]) -> Optional[str]:
+    return coalesce(doc, NAME_FIELDS)
+
+
+
+def as_list(value: Any) -> Optional[List[Any]]:
+    # Ensure services is always a list
+    if isinstance(value, str):
+        return [value]
+    if isinstance(value, list):
+        return value
+    return None
+
+
+def venue_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    pricing = doc.get("pricing") if isinstance(doc.get("pricing"), dict) else {}
+    standard_rate = to_int(doc.get("standardRate"))
+    if standard_rate is None:
+        standard_rate = to_int(pricing.get("standardRate"))
+
+    raw_cost = (
+        doc.get("avg_cost_lkr")
+        or doc.get("avgCostLkr")
+        or doc.get("avgCost")
+        or pricing.get("avg_cost_lkr")
+        or pricing.get("avgCostLkr")
+        or pricing.get("avgCost")
+    )
+    avg_cost = to_int(raw_cost)
+    if (avg_cost is None or avg_cost == 0) and standard_rate:
+        avg_cost = standard_rate
+
+    return {
+        "id": str(doc.get("_id")) if doc.get("_id") is not None else None,
+        "name": normalise_name(doc),
+        "address": coalesce(doc, ("venueAddress", "address")),
+        "type": doc.get("venueType") or doc.get("type") or doc.get("role"),
+        "capacity": to_int(coalesce(doc, CAPACITY_FIELDS)) or 0,
+        "avg_cost_lkr": avg_cost or 0,
+        "standard_rate_lkr": standard_rate,
+        "rating": to_float(coalesce(doc, RATING_FIELDS)),
+        "website": coalesce(doc, WEBSITE_FIELDS),
+        "min_lead_days": to_int(coalesce(doc, MIN_LEAD_FIELDS)) or 0,
+        "phone": coalesce(doc, CONTACT_FIELDS),
+        "city": coalesce(doc, ("city",)),
+        "location": geo_point(doc),
+        "source": "mongo_users",
+    }
+
+
+def lighting_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": normalise_name(doc),
+        "address": coalesce(doc, ("address", "city")),
+        "services": as_list(doc.get("services")),
+        "crew_size": to_int(doc.get("crewSize")),
+        "website": coalesce(doc, WEBSITE_FIELDS),
+        "contact": coalesce(doc, CONTACT_FIELDS),
+        "standard_rate_lkr": to_int(doc.get("standardRate")),
+        "source": "mongo_users",
+    }
+
+
+def solo_musician_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc.get("_id")) if doc.get("_id") is not None else None,
+        "name": normalise_name(doc),
+        "genres": doc.get("genres") or doc.get("genre"),
+        "experience": doc.get("experience"),
+        "standard_rate_lkr": to_int(doc.get("standardRate")),
+        "spotify": doc.get("spotifyLink"),
+        "instagram": doc.get("instagramLink"),
+        "website": coalesce(doc, WEBSITE_FIELDS),
+        "contact": coalesce(doc, CONTACT_FIELDS),
+        "source": "mongo_users",
+    }
+
+
+def music_ensemble_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "id": str(doc.get("_id")) if doc.get("_id") is not None else None,
+        "name": normalise_name(doc) or doc.get("bandName"),
+        "genres": doc.get("genres"),
+        "members": to_int(doc.get("members")),
+        "experience": doc.get("experience"),
+        "standard_rate_lkr": to_int(doc.get("standardRate")),
+        "youtube": doc.get("youtubeLink"),
+        "instagram": doc.get("instagramLink"),
+        "website": coalesce(doc, WEBSITE_FIELDS),
+        "contact": coalesce(doc, CONTACT_FIELDS),
+        "source": "mongo_users",
+    }
+
+
+def sound_specialist_record(doc: Dict[str, Any]) -> Dict[str, Any]:
+    return {
+        "name": normalise_name(doc) or doc.get("companyName"),
+        "services": as_list(doc.get("services")),
+        "crew_size": to_int(doc.get("crewSize")),
+        "standard_rate_lkr": to_int(doc.get("standardRate")),
+        "website": coalesce(doc, WEBSITE_FIELDS),
+        "contact": coalesce(doc, CONTACT_FIELDS),
+        "source": "mongo_users",
+    }
+
+
+# Role key -> (record normaliser, projected fields) for every listable provider role.
+ROLE_RECORDS: Dict[str, Tuple[Callable[[Dict[str, Any]], Dict[str, Any]], Tuple[str, ...]]] = {
+    "venue": (venue_record, _VENUE_FIELDS),
+    "lights": (lighting_record, _LIGHTING_FIELDS),
+    "solo_musician": (solo_musician_record, _SOLO_MUSICIAN_FIELDS),
+    "music_ensemble": (music_ensemble_record, _MUSIC_ENSEMBLE_FIELDS),
+    "sound_specialist": (sound_specialist_record, _SOUND_SPECIALIST_FIELDS),
+}
+
+
+# Ordering used by the provider endpoints: cheapest first, then the longer
+# experience blurb. Records without a rate sort last; ``_id`` makes the order
+# total so it doubles as the keyset pagination key.
+MISSING_RATE_SORT = 999_999
+ROLE_SORTS: Dict[str, List[Tuple[str, int]]] = {
+    "venue": [("sort_rate", 1), ("_id", 1)],
+    "lights": [("sort_rate", 1), ("_id", 1)],
+    "sound_specialist": [("sort_rate", 1), ("_id", 1)],
+    "solo_musician": [("sort_rate", 1), ("experience_len", -1), ("_id", 1)],
+    "music_ensemble": [("sort_rate", 1), ("experience_len", -1), ("_id", 1)],
+}
+
+
+def price(view: Dict[str, Any]) -> int:
+    """Price compared against ``max_budget_lkr`` (venues prefer the average cost)."""
+
+    return view.get("avg_cost_lkr") or view.get("standard_rate_lkr") or 0
+
+
+def sort_rate(view: Dict[str, Any]) -> int:
+    return view.get("standard_rate_lkr") or MISSING_RATE_SORT
+
+
+def experience_len(view: Dict[str, Any]) -> int:
+    experience = view.get("experience")
+    return len(experience) if isinstance(experience, str) else 0
+
+
+def genre_keys(view: Dict[str, Any]) -> List[str]:
+    genres = view.get("genres")
+    if not genres:
+        return []
+    if not isinstance(genres, list):
+        genres = [genres]
+    return [genre.lower() for genre in genres if isinstance(genre, str) and genre]
+
+
+__all__ = [
+    "CAPACITY_FIELDS",
+    "CONTACT_FIELDS",
+    "MIN_LEAD_FIELDS",
+    "MISSING_RATE_SORT",
+    "NAME_FIELDS",
+    "RATING_FIELDS",
+    "ROLE_ALIASES",
+    "ROLE_RECORDS",
+    "ROLE_SORTS",
+    "WEBSITE_FIELDS",
+    "as_list",
+    "coalesce",
+    "experience_len",
+    "genre_keys",
+    "lighting_record",
+    "music_ensemble_record",
+    "normalise_name",
+    "price",
+    "solo_musician_record",
+    "sort_rate",
+    "sound_specialist_record",
+    "to_bool",
+    "to_float",
+    "to_int",
+    "venue_record",
+]
@@ -1,8 +1,38 @@
 import logging
-import re
 from typing import Any, Dict, Iterable, List, Optional, Tuple
 
-from .mongo_client import MongoUnavailable, get_users_collection
+from .mongo_client import MongoUnavailable, get_provider_catalog_collection, get_users_collection
+from .pagination import decode_cursor
+from .provider_cache import cache_key, cached_value
+from .provider_keys import name_key
+from .provider_queries import (
+    PAGE_ROLES,
+    Row,
+    active_filters,
+    catalog_find_args,
+    catalog_known_state,
+    catalog_rows,
+    catalog_snapshot,
+    catalog_snapshot_pipeline,
+    copy_page,
+    copy_snapshot,
+    empty_snapshot,
+    field_projection,
+    keep_page,
+    keep_snapshot,
+    page_cache_key,
+    page_from_rows,
+    record_catalog_state,
+    search_ids,
+    user_rows,
+    users_filter,
+    users_scan_limit,
+    users_snapshot,
+    users_snapshot_pipeline,
+    warn_if_truncated,
+)
+from .provider_records import ROLE_RECORDS, normalise_name
+from .venue_name_index import venue_name_index
 
 try:
     from pymongo.errors import PyMongoError
@@ -12,261 +42,297 @@ except Exception:  # pragma: no cover - pymongo optional during tests
 
 logger = logging.getLogger(__name__)
 
-_ROLE_ALIASES: Dict[str, Tuple[str, ...]] = {
-    "venue": ("venue", "venues", "venue host", "venue_host"),
-    "lights": ("lights", "lighting", "light_provider", "lighting designer"),
-    "music": ("musician", "music_band", "band", "dj"),
-    "solo_musician": ("musician", "solo musician", "solo_musician", "solo-musician"),
-    "music_ensemble": ("music_band", "music ensemble", "music_ensemble", "ensemble", "band"),
-    "lighting_designer": ("lights", "lighting designer", "lighting", "light_provider", "lighting_designer"),
-    "sound_specialist": ("sounds", "sound specialist", "sound", "audio", "sound engineer", "sound_engineer"),
-}
-
-_CITY_FIELDS = ("city", "venueAddress", "address", "companyAddress", "base_city")
-_NAME_FIELDS = ("name", "companyName", "venueName", "bandName")
-_CONTACT_FIELDS = ("phone", "contact", "contactPerson")
-_WEBSITE_FIELDS = ("website", "spotifyLink", "youtubeLink", "facebookLink", "instagramLink")
-_CAPACITY_FIELDS = ("capacity", "maxCapacity", "capacityRange")
-_MIN_LEAD_FIELDS = ("minLeadDays", "leadTimeDays", "leadDays")
-_RATING_FIELDS = ("rating", "avgRating", "averageRating")
-_BOOL_TRUE = {"1", "true", "yes", "y", "on"}
-
-
-def _coalesce(doc: Dict[str, Any], fields: Iterable[str]) -> Optional[Any]:
-    for key in fields:
-        value = doc.get(key)
-        if value not in (None, "", []):
-            return value
-    return None
-
-
-def _to_int(value: Any) -> Optional[int]:
-    if value in (None, ""):
-        return None
-    if isinstance(value, bool):  # guard against True -> 1
-        return None
-    if isinstance(value, (int, float)):
-        return int(value)
-    if isinstance(value, str):
-        digits = re.findall(r"\d+", value)
-        if digits:
-            # Prefer the largest number in ranges like "100-200"
-            return int(digits[-1])
-    return None
-
-
-def _to_float(value: Any) -> Optional[float]:
-    if value in (None, ""):
-        return None
-    if isinstance(value, bool):
-        return None
-    if isinstance(value, (int, float)):
-        return float(value)
-    if isinstance(value, str):
-        try:
-            return float(value)
-        except ValueError:
-            return None
-    return None
-
-
-def _to_bool(value: Any) -> Optional[bool]:
-    if value is None:
-        return None
-    if isinstance(value, bool):
-        return value
-    if isinstance(value, (int, float)):
-        return bool(value)
-    if isinstance(value, str):
-        normalized = value.strip().lower()
-        if normalized in _BOOL_TRUE:
-            return True
-        if normalized == "0" or normalized in {"false", "no", "n", "off"}:
-            return False
-    return None
-
-
-def _normalise_name(doc: Dict[str, Any]) -> Optional[str]:
-    return _coalesce(doc, _NAME_FIELDS)
-
-
-def _role_regex(role_key: str) -> re.Pattern:
-    aliases = _ROLE_ALIASES.get(role_key, (role_key,))
-    escaped = "|".join(re.escape(alias) for alias in aliases)
-    return re.compile(f"^(?:{escaped})$", re.IGNORECASE)
-
 
-def _city_regex(city: str) -> re.Pattern:
-    return re.compile(re.escape(city), re.IGNORECASE)
-
-
-def _query_users(role_key: str, city: Optional[str], limit: Optional[int]) -> List[Dict[str, Any]]:
+def _query_users(
+    role_key: str,
+    city: Optional[str],
+    limit: Optional[int],
+    fields: Optional[Iterable[str]] = None,
+    filters: Optional[Dict[str, Any]] = None,
+) -> List[Dict[str, Any]]:
     try:
         collection = get_users_collection()
     except MongoUnavailable as exc:
         logger.warning("Mongo unavailable for role %s: %s", role_key, exc)
         return []
 
-    query: Dict[str, Any] = {"role": {"$regex": _role_regex(role_key)}}
-    if city:
-        regex = _city_regex(city)
-        query["$or"] = [{field: regex} for field in _CITY_FIELDS]
+    query = users_filter(role_key, city, filters)
 
     try:
-        cursor = collection.find(query)
+        cursor = collection.find(query, projection=field_projection(fields))
         if limit:
-            cursor = cursor.limit(int(limit))
+            cursor = cursor.sort("_id", 1).limit(int(limit))
         return list(cursor)
     except PyMongoError as exc:
         logger.error("Mongo query failed for role %s: %s", role_key, exc)
         return []
 
 
-def list_venues(city: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
-    docs = _query_users("venue", city=city, limit=limit)
-    venues: List[Dict[str, Any]] = []
-    for doc in docs:
-        pricing = doc.get("pricing") if isinstance(doc.get("pricing"), dict) else {}
-        standard_rate = _to_int(doc.get("standardRate"))
-        if standard_rate is None:
-            standard_rate = _to_int(pricing.get("standardRate"))
-
-        raw_cost = (
-            doc.get("avg_cost_lkr")
-            or doc.get("avgCostLkr")
-            or doc.get("avgCost")
-            or pricing.get("avg_cost_lkr")
-            or pricing.get("avgCostLkr")
-            or pricing.get("avgCost")
+def _catalog_ready() -> bool:
+    """Return ``True`` once the materialised catalog holds records."""
+
+    known = catalog_known_state()
+    if known is not None:
+        return known
+    try:
+        ready = get_provider_catalog_collection().find_one({}, projection={"_id": 1}) is not None
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.debug("Provider catalog unavailable: %s", exc)
+        return False
+    return record_catalog_state(ready)
+
+
+def _query_catalog(
+    role_keys: List[str],
+    city: Optional[str],
+    limit: Optional[int],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]] = None,
+) -> Optional[List[Row]]:
+    """Read pre-normalised rows with filters, order and the keyset seek pushed down.
+
+    ``None`` means the caller should use the users path.
+    """
+
+    usable, ids = search_ids(role_keys, filters)
+    if not usable:
+        return None
+    if ids is not None and not ids:
+        return []
+    query, projection, sort = catalog_find_args(role_keys, city, filters, after, ids)
+    try:
+        cursor = get_provider_catalog_collection().find(query, projection=projection).sort(sort)
+        if limit:
+            cursor = cursor.limit(int(limit))
+        return catalog_rows(cursor, role_keys, sort)
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Provider catalog read failed for roles %s: %s", role_keys, exc)
+        return None
+
+
+def _query_user_records(
+    role_keys: List[str],
+    city: Optional[str],
+    limit: Optional[int],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]] = None,
+) -> List[Row]:
+    scan_limit = users_scan_limit()
+    docs_by_role = {
+        role_key: _query_users(
+            role_key, city=city, limit=scan_limit, fields=ROLE_RECORDS[role_key][1], filters=filters
         )
-        avg_cost = _to_int(raw_cost)
-        if (avg_cost is None or avg_cost == 0) and standard_rate:
-            avg_cost = standard_rate
-
-        venues.append(
-            {
-                "id": str(doc.get("_id")) if doc.get("_id") is not None else None,
-                "name": _normalise_name(doc),
-                "address": _coalesce(doc, ("venueAddress", "address")),
-                "type": doc.get("venueType") or doc.get("type") or doc.get("role"),
-                "capacity": _to_int(_coalesce(doc, _CAPACITY_FIELDS)) or 0,
-                "avg_cost_lkr": avg_cost or 0,
-                "standard_rate_lkr": standard_rate,
-                "rating": _to_float(_coalesce(doc, _RATING_FIELDS)),
-                "website": _coalesce(doc, _WEBSITE_FIELDS),
-                "min_lead_days": _to_int(_coalesce(doc, _MIN_LEAD_FIELDS)) or 0,
-                "phone": _coalesce(doc, _CONTACT_FIELDS),
-                "city": _coalesce(doc, ("city",)),
-                "source": "mongo_users",
-            }
+        for role_key in role_keys
+    }
+    warn_if_truncated(docs_by_role, scan_limit)
+    return user_rows(role_keys, docs_by_role, limit, filters, after)
+
+
+def _load_records(
+    role_keys: List[str],
+    city: Optional[str],
+    limit: Optional[int],
+    filters: Dict[str, Any],
+    after: Optional[List[Any]] = None,
+) -> List[Row]:
+    if _catalog_ready():
+        rows = _query_catalog(role_keys, city, limit, filters, after)
+        if rows is not None:
+            return rows
+    return _query_user_records(role_keys, city, limit, filters, after)
+
+
+def provider_page(
+    listing: str,
+    city: Optional[str] = None,
+    limit: int = 20,
+    cursor: Optional[str] = None,
+    **filters: Any,
+) -> Tuple[List[Dict[str, Any]], Optional[str]]:
+    """Return one page of ``listing`` and the cursor for the next page (``None`` at the end).
+
+    ``listing`` is a role key from ``ROLE_RECORDS`` or ``"music"``. A cursor
+    carries the city it was issued for, so later pages stay in the same scope
+    even if the first page was a city fallback. Raises :class:`InvalidCursor`.
+    """
+
+    role_keys = PAGE_ROLES[listing]
+    after: Optional[List[Any]] = None
+    if cursor:
+        city, after = decode_cursor(cursor, listing)
+    active = active_filters(**filters)
+
+    def load() -> Tuple[List[Dict[str, Any]], Optional[str]]:
+        return page_from_rows(listing, city, limit, _load_records(role_keys, city, limit + 1, active, after))
+
+    return cached_value(page_cache_key(listing, city, limit, active, cursor), load, copy=copy_page, keep=keep_page)
+
+
+def _list_role(role_key: str, city: Optional[str], limit: int, **filters: Any) -> List[Dict[str, Any]]:
+    return provider_page(role_key, city, limit, **filters)[0]
+
+
+def list_venues(
+    city: Optional[str] = None,
+    limit: int = 20,
+    min_capacity: Optional[int] = None,
+    max_budget_lkr: Optional[int] = None,
+    near: Optional[Tuple[float, float]] = None,
+    radius_km: Optional[float] = None,
+) -> List[Dict[str, Any]]:
+    """Venues, optionally within ``radius_km`` of a ``(lon, lat)`` point."""
+
+    return _list_role(
+        "venue",
+        city,
+        limit,
+        min_capacity=min_capacity,
+        max_budget_lkr=max_budget_lkr,
+        near=near,
+        radius_km=radius_km if near else None,
+    )
+
+
+def _catalog_venue_id(key: str) -> Optional[Any]:
+    try:
+        record = get_provider_catalog_collection().find_one(
+            {"name_key": key, "roles": "venue"},
+            projection={"_id": 1},
         )
-    return venues
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Provider catalog name lookup failed: %s", exc)
+        return None
+    if record is None:
+        return None
+    venue_name_index().set(key, record["_id"])
+    return record["_id"]
 
 
-def find_venue_by_name(name: str) -> Optional[Dict[str, Any]]:
-    if not name:
-        return None
+def _scan_venue_by_name(name: str) -> Optional[Dict[str, Any]]:
     docs = _query_users("venue", city=None, limit=None)
     target = name.strip().lower()
     for doc in docs:
-        candidate = (_normalise_name(doc) or "").strip().lower()
+        candidate = (normalise_name(doc) or "").strip().lower()
         if candidate == target:
             return doc
     return None
 
 
-def list_lighting(city: Optional[str], limit: int = 20) -> List[Dict[str, Any]]:
-    docs = _query_users("lights", city=city, limit=limit)
-    providers: List[Dict[str, Any]] = []
-    for doc in docs:
-        # Ensure services is always a list
-        services = doc.get("services")
-        if isinstance(services, str):
-            services = [services]
-        elif not isinstance(services, list):
-            services = None
-            
-        providers.append(
-            {
-                "name": _normalise_name(doc),
-                "address": _coalesce(doc, ("address", "city")),
-                "services": services,
-                "crew_size": _to_int(doc.get("crewSize")),
-                "website": _coalesce(doc, _WEBSITE_FIELDS),
-                "contact": _coalesce(doc, _CONTACT_FIELDS),
-                "standard_rate_lkr": _to_int(doc.get("standardRate")),
-                "source": "mongo_users",
-            }
-        )
-    return providers
+def find_venue_by_name(name: str) -> Optional[Dict[str, Any]]:
+    """Return the raw users document for a venue by (normalised) name.
+
+    Resolves the id through the in-memory name map, then the indexed
+    ``provider_catalog.name_key``; only without a catalog does it scan venues.
+    """
+
+    if not name:
+        return None
+    key = name_key(name)
+    if not key:
+        return None
+
+    doc_id = venue_name_index().get(key)
+    if doc_id is None and _catalog_ready():
+        doc_id = _catalog_venue_id(key)
+        if doc_id is None:
+            return None
+    if doc_id is None:
+        return _scan_venue_by_name(name)
+
+    try:
+        return get_users_collection().find_one({"_id": doc_id})
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Venue lookup failed for %s: %s", name, exc)
+        return None
+
+
+def list_lighting(
+    city: Optional[str],
+    limit: int = 20,
+    max_budget_lkr: Optional[int] = None,
+    min_crew_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    return _list_role("lights", city, limit, max_budget_lkr=max_budget_lkr, min_crew_size=min_crew_size)
 
 
 def list_solo_musicians(city: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
-    docs = _query_users("solo_musician", city=city, limit=limit)
-    artists: List[Dict[str, Any]] = []
-    for doc in docs:
-        artists.append(
-            {
-                "id": str(doc.get("_id")) if doc.get("_id") is not None else None,
-                "name": _normalise_name(doc),
-                "genres": doc.get("genres") or doc.get("genre"),
-                "experience": doc.get("experience"),
-                "standard_rate_lkr": _to_int(doc.get("standardRate")),
-                "spotify": doc.get("spotifyLink"),
-                "instagram": doc.get("instagramLink"),
-                "website": _coalesce(doc, _WEBSITE_FIELDS),
-                "contact": _coalesce(doc, _CONTACT_FIELDS),
-                "source": "mongo_users",
-            }
-        )
-    return artists
+    return _list_role("solo_musician", city, limit)
 
 
 def list_music_ensembles(city: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
-    docs = _query_users("music_ensemble", city=city, limit=limit)
-    ensembles: List[Dict[str, Any]] = []
-    for doc in docs:
-        ensembles.append(
-            {
-                "id": str(doc.get("_id")) if doc.get("_id") is not None else None,
-                "name": _normalise_name(doc) or doc.get("bandName"),
-                "genres": doc.get("genres"),
-                "members": _to_int(doc.get("members")),
-                "experience": doc.get("experience"),
-                "standard_rate_lkr": _to_int(doc.get("standardRate")),
-                "youtube": doc.get("youtubeLink"),
-                "instagram": doc.get("instagramLink"),
-                "website": _coalesce(doc, _WEBSITE_FIELDS),
-                "contact": _coalesce(doc, _CONTACT_FIELDS),
-                "source": "mongo_users",
-            }
-        )
-    return ensembles
+    return _list_role("music_ensemble", city, limit)
 
 
-def list_sound_specialists(city: Optional[str] = None, limit: int = 20) -> List[Dict[str, Any]]:
-    docs = _query_users("sound_specialist", city=city, limit=limit)
-    specialists: List[Dict[str, Any]] = []
-    for doc in docs:
-        # Ensure services is always a list
-        services = doc.get("services")
-        if isinstance(services, str):
-            services = [services]
-        elif not isinstance(services, list):
-            services = None
-            
-        specialists.append(
-            {
-                "name": _normalise_name(doc) or doc.get("companyName"),
-                "services": services,
-                "crew_size": _to_int(doc.get("crewSize")),
-                "standard_rate_lkr": _to_int(doc.get("standardRate")),
-                "website": _coalesce(doc, _WEBSITE_FIELDS),
-                "contact": _coalesce(doc, _CONTACT_FIELDS),
-                "source": "mongo_users",
-            }
-        )
-    return specialists
+def list_sound_specialists(
+    city: Optional[str] = None,
+    limit: int = 20,
+    max_budget_lkr: Optional[int] = None,
+    min_crew_size: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    return _list_role(
+        "sound_specialist",
+        city,
+        limit,
+        max_budget_lkr=max_budget_lkr,
+        min_crew_size=min_crew_size,
+    )
+
+
+def list_music_providers(
+    city: Optional[str] = None,
+    limit: int = 20,
+    genre: Optional[str] = None,
+    max_budget_lkr: Optional[int] = None,
+) -> List[Dict[str, Any]]:
+    """Solo musicians and bands as one ranked list, tagged with ``provider_type``."""
+
+    return provider_page("music", city, limit, genre=genre, max_budget_lkr=max_budget_lkr)[0]
+
+
+def _aggregate_catalog_snapshot(city: Optional[str], limit: int) -> Optional[Dict[str, List[Dict[str, Any]]]]:
+    try:
+        result = next(iter(get_provider_catalog_collection().aggregate(catalog_snapshot_pipeline(city, limit))), {})
+    except (MongoUnavailable, PyMongoError) as exc:
+        logger.warning("Provider catalog snapshot failed: %s", exc)
+        return None
+    return catalog_snapshot(result)
+
+
+def _aggregate_snapshot(city: Optional[str], limit: int) -> Dict[str, List[Dict[str, Any]]]:
+    if _catalog_ready():
+        snapshot = _aggregate_catalog_snapshot(city, limit)
+        if snapshot is not None:
+            return snapshot
+
+    try:
+        collection = get_users_collection()
+    except MongoUnavailable as exc:
+        logger.warning("Mongo unavailable for provider snapshot: %s", exc)
+        return empty_snapshot()
+
+    try:
+        result = next(iter(collection.aggregate(users_snapshot_pipeline(city, limit))), {})
+    except PyMongoError as exc:
+        logger.error("Mongo provider snapshot aggregation failed: %s", exc)
+        return empty_snapshot()
+
+    return users_snapshot(result)
+
+
+def provider_snapshot(city: Optional[str] = None, limit: int = 6) -> Dict[str, List[Dict[str, Any]]]:
+    """Fetch up to ``limit`` providers of every role in a single aggregation round trip.
+
+    Returns the same record shapes as the individual ``list_*`` functions, keyed by
+    snapshot group (``venues``, ``solo_musicians``, ``music_ensembles``,
+    ``lighting_designers``, ``sound_specialists``).
+    """
+
+    return cached_value(
+        cache_key("snapshot", city, limit),
+        lambda: _aggregate_snapshot(city, limit),
+        copy=copy_snapshot,
+        keep=keep_snapshot,
+    )
 
 
 __all__ = [
@@ -276,4 +342,7 @@ __all__ = [
     "list_solo_musicians",
     "list_music_ensembles",
     "list_sound_specialists",
+    "list_music_providers",
+    "provider_page",
+    "provider_snapshot",
 ]
@@ -0,0 +1,268 @@
+"""In-memory inverted index for provider name/genre/services/type search.
+
+Every catalog record is tokenised once into per-field posting lists
+(token -> provider ids). Query tokens that are not in the vocabulary are
+matched fuzzily through a character-trigram index over the vocabulary, so
+``jaz`` finds ``jazz`` and ``hiphop`` finds ``Hip-Hop``. A query never
+touches the records themselves, so lookups cost the same for ten providers
+or a whole city.
+
+The provider catalog sync applies single-record updates and replaces the
+index after every full reconcile. Processes that do not run the sync load it
+lazily from ``provider_catalog`` and reload it every
+``PROVIDER_SEARCH_REFRESH_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import logging
+import re
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Set, Tuple
+
+from .env import env_float
+from .mongo_client import MongoUnavailable, get_provider_catalog_collection
+
+try:
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+SEARCH_FIELDS: Tuple[str, ...] = ("name", "genres", "services", "type")
+_DEFAULT_REFRESH_SECONDS = 300.0
+# After a failed load, skip retries for this long so callers fall back quickly.
+_RETRY_SECONDS = 30.0
+_MIN_SIMILARITY = 0.5
+_MIN_PREFIX = 3
+_WORD_RE = re.compile(r"[a-z0-9]+")
+# Role views stored on provider_catalog records.
+_VIEW_ROLES = ("venue", "lights", "solo_musician", "music_ensemble", "sound_specialist")
+
+
+def _refresh_interval() -> float:
+    return env_float("PROVIDER_SEARCH_REFRESH_SECONDS", _DEFAULT_REFRESH_SECONDS)
+
+
+def tokens(value: Any) -> Set[str]:
+    """Words of ``value`` plus the whole value with separators removed (``hip-hop`` -> ``hiphop``)."""
+
+    values = value if isinstance(value, list) else [value]
+    result: Set[str] = set()
+    for item in values:
+        if not isinstance(item, str):
+            continue
+        words = _WORD_RE.findall(item.lower())
+        result.update(words)
+        if len(words) > 1:
+            result.add("".join(words))
+    return result
+
+
+def trigrams(token: str) -> Set[str]:
+    padded = f"${token}$"
+    return {padded[i : i + 3] for i in range(len(padded) - 2)}
+
+
+def record_fields(record: Mapping[str, Any]) -> Dict[str, Set[str]]:
+    """Searchable tokens of one catalog record, merged across its role views."""
+
+    fields: Dict[str, Set[str]] = {field: set() for field in SEARCH_FIELDS}
+    fields["name"].update(tokens(record.get("name")))
+    for view in (record.get("views") or {}).values():
+        for field in SEARCH_FIELDS:
+            fields[field].update(tokens(view.get(field)))
+    return fields
+
+
+class ProviderSearchIndex:
+    """Thread-safe token -> provider id posting lists with trigram fuzzy lookup."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._postings: Dict[str, Dict[str, Set[Any]]] = {field: defaultdict(set) for field in SEARCH_FIELDS}
+        self._trigrams: Dict[str, Set[str]] = defaultdict(set)
+        self._docs: Dict[Any, Tuple[Set[str], Dict[str, Set[str]]]] = {}
+        self._role_ids: Dict[str, Set[Any]] = defaultdict(set)
+        self.loaded_at: Optional[float] = None
+        # Set when the catalog sync maintains the index; it then never expires.
+        self.live = False
+        self._failed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._docs)
+
+    @property
+    def ready(self) -> bool:
+        if self.loaded_at is None:
+            return False
+        return self.live or time.monotonic() - self.loaded_at < _refresh_interval()
+
+    def apply(self, record: Mapping[str, Any]) -> None:
+        """Index (or re-index) one provider catalog record."""
+
+        with self._lock:
+            self._discard_locked(record["_id"])
+            fields = record_fields(record)
+            roles = set(record.get("roles") or ())
+            self._docs[record["_id"]] = (roles, fields)
+            for role in roles:
+                self._role_ids[role].add(record["_id"])
+            for field, field_tokens in fields.items():
+                for token in field_tokens:
+                    self._postings[field][token].add(record["_id"])
+                    for gram in trigrams(token):
+                        self._trigrams[gram].add(token)
+
+    def discard(self, doc_id: Any) -> None:
+        with self._lock:
+            self._discard_locked(doc_id)
+
+    def _discard_locked(self, doc_id: Any) -> None:
+        entry = self._docs.pop(doc_id, None)
+        if entry is None:
+            return
+        for role in entry[0]:
+            self._role_ids[role].discard(doc_id)
+        for field, field_tokens in entry[1].items():
+            postings = self._postings[field]
+            for token in field_tokens:
+                ids = postings.get(token)
+                if ids is not None:
+                    ids.discard(doc_id)
+                    if not ids:
+                        del postings[token]
+        # Orphaned vocabulary entries in the trigram map are harmless: their
+        # postings are empty, and the next full replace drops them.
+
+    def replace(self, records: Iterable[Mapping[str, Any]], live: bool = False) -> None:
+        fresh = ProviderSearchIndex()
+        for record in records:
+            fresh.apply(record)
+        self.adopt(fresh, live=live)
+
+    def adopt(self, fresh: "ProviderSearchIndex", live: bool = False) -> None:
+        """Swap in the contents of an index built off to the side."""
+
+        with self._lock:
+            self._postings = fresh._postings
+            self._trigrams = fresh._trigrams
+            self._docs = fresh._docs
+            self._role_ids = fresh._role_ids
+            self.loaded_at = time.monotonic()
+            self.live = live
+            self._failed_at = None
+
+    def _expand(self, token: str) -> Set[str]:
+        """Vocabulary tokens a query token matches: exact, prefix or trigram-similar."""
+
+        grams = trigrams(token)
+        counts: Dict[str, int] = defaultdict(int)
+        for gram in grams:
+            for candidate in self._trigrams.get(gram, ()):
+                counts[candidate] += 1
+        matches = {token}
+        for candidate, shared in counts.items():
+            if len(token) >= _MIN_PREFIX and candidate.startswith(token):
+                matches.add(candidate)
+            elif 2 * shared / (len(grams) + len(trigrams(candidate))) >= _MIN_SIMILARITY:
+                matches.add(candidate)
+        return matches
+
+    def _match_token(self, token: str, fields: Iterable[str]) -> Set[Any]:
+        ids: Set[Any] = set()
+        for candidate in self._expand(token):
+            for field in fields:
+                ids |= self._postings[field].get(candidate, set())
+        return ids
+
+    def _match(self, text: str, fields: Iterable[str]) -> Set[Any]:
+        """Ids matching every word of ``text`` (or the words run together) in any of ``fields``."""
+
+        words = _WORD_RE.findall(text.lower())
+        if not words:
+            return set()
+        result = self._match_token(words[0], fields)
+        for word in words[1:]:
+            if not result:
+                break
+            result &= self._match_token(word, fields)
+        if len(words) > 1:
+            result |= self._match_token("".join(words), fields)
+        return result
+
+    def search(
+        self,
+        role_keys: Iterable[str],
+        q: Optional[str] = None,
+        genre: Optional[str] = None,
+        service: Optional[str] = None,
+    ) -> Set[Any]:
+        """Provider ids holding one of ``role_keys`` that match every given criterion."""
+
+        criteria: List[Tuple[str, Tuple[str, ...]]] = []
+        if q:
+            criteria.append((q, SEARCH_FIELDS))
+        if genre:
+            criteria.append((genre, ("genres",)))
+        if service:
+            criteria.append((service, ("services",)))
+
+        roles = set(role_keys)
+        with self._lock:
+            result: Optional[Set[Any]] = None
+            for text, fields in criteria:
+                ids = self._match(text, fields)
+                result = ids if result is None else result & ids
+                if not result:
+                    return set()
+            if not result:
+                return set()
+            # ``&`` iterates the smaller set, so this is bounded by the result size.
+            return set().union(*(result & self._role_ids.get(role, set()) for role in roles))
+
+    def ensure_loaded(self) -> bool:
+        """Load from ``provider_catalog`` unless current; returns ``False`` when unavailable."""
+
+        if self.ready:
+            return True
+        if self._failed_at is not None and time.monotonic() - self._failed_at < _RETRY_SECONDS:
+            return False
+        projection = {"roles": 1, "name": 1}
+        projection.update({f"views.{key}.{field}": 1 for key in _VIEW_ROLES for field in SEARCH_FIELDS})
+        try:
+            self.replace(get_provider_catalog_collection().find({}, projection=projection))
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.debug("Provider search index unavailable: %s", exc)
+            self._failed_at = time.monotonic()
+            return False
+        logger.info("Provider search index loaded: %s record(s)", len(self))
+        return True
+
+
+_INDEX = ProviderSearchIndex()
+
+
+def provider_search_index() -> ProviderSearchIndex:
+    return _INDEX
+
+
+def search_terms(filters: Mapping[str, Any]) -> Dict[str, str]:
+    """The index-backed criteria present in a listing's filters."""
+
+    return {key: filters[key] for key in ("q", "genre", "service") if filters.get(key)}
+
+
+__all__ = [
+    "ProviderSearchIndex",
+    "SEARCH_FIELDS",
+    "provider_search_index",
+    "record_fields",
+    "search_terms",
+    "tokens",
+    "trigrams",
+]
@@ -0,0 +1,145 @@
+"""Columnar in-memory view over normalised provider records.
+
+Ranking a whole city's providers as a list of dicts means a Python-level
+comparison per row for every filter and sort. ``ProviderTable`` keeps the
+numeric fields as NumPy arrays (NaN for missing) and the low-cardinality
+string fields as interned category codes. Predicates become boolean masks,
+top-k uses ``argpartition``, and dicts are only copied for the rows returned.
+"""
+
+from __future__ import annotations
+
+from typing import Any, Callable, Dict, Iterable, List, Mapping, Optional, Sequence, Tuple
+
+import numpy as np
+
+# Column name -> record fields read for it, first non-empty wins.
+NUMERIC_COLUMNS: Dict[str, Tuple[str, ...]] = {
+    "rate": ("standard_rate_lkr",),
+    "price": ("avg_cost_lkr", "standard_rate_lkr"),
+    "capacity": ("capacity",),
+    "rating": ("rating",),
+    "crew_size": ("crew_size",),
+    "lead_days": ("min_lead_days",),
+}
+STRING_COLUMNS: Tuple[str, ...] = ("type", "city")
+
+
+def _number(record: Mapping[str, Any], fields: Sequence[str]) -> float:
+    for field in fields:
+        value = record.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value:
+            return float(value)
+    return np.nan
+
+
+class ProviderTable:
+    """Immutable column store built from ``list_*`` records."""
+
+    def __init__(
+        self,
+        records: Sequence[Dict[str, Any]],
+        numeric: Dict[str, np.ndarray],
+        codes: Dict[str, np.ndarray],
+        categories: Dict[str, List[str]],
+    ) -> None:
+        self._records = records
+        self._numeric = numeric
+        self._codes = codes
+        self._categories = categories
+
+    @classmethod
+    def from_records(cls, records: Iterable[Dict[str, Any]]) -> "ProviderTable":
+        rows = list(records)
+        numeric = {
+            column: np.fromiter((_number(row, fields) for row in rows), dtype=np.float64, count=len(rows))
+            for column, fields in NUMERIC_COLUMNS.items()
+        }
+        codes: Dict[str, np.ndarray] = {}
+        categories: Dict[str, List[str]] = {}
+        for column in STRING_COLUMNS:
+            # Code 0 is "missing"; each distinct lowercased value is stored once.
+            lookup: Dict[str, int] = {"": 0}
+            values = []
+            for row in rows:
+                value = row.get(column)
+                key = value.strip().lower() if isinstance(value, str) else ""
+                values.append(lookup.setdefault(key, len(lookup)))
+            codes[column] = np.asarray(values, dtype=np.int32)
+            categories[column] = list(lookup)
+        return cls(rows, numeric, codes, categories)
+
+    def __len__(self) -> int:
+        return len(self._records)
+
+    def column(self, name: str) -> np.ndarray:
+        return self._numeric[name]
+
+    def all_rows(self) -> np.ndarray:
+        return np.ones(len(self), dtype=bool)
+
+    def at_least(self, column: str, value: Optional[float], missing_passes: bool = False) -> np.ndarray:
+        """Mask of rows with ``column >= value`` (no-op when ``value`` is falsy)."""
+
+        values = self._numeric[column]
+        if not value:
+            return self.all_rows()
+        with np.errstate(invalid="ignore"):
+            mask = values >= value
+        return mask | np.isnan(values) if missing_passes else mask
+
+    def at_most(self, column: str, value: Optional[float], missing_passes: bool = True) -> np.ndarray:
+        """Mask of rows with ``column <= value`` (no-op when ``value`` is falsy)."""
+
+        values = self._numeric[column]
+        if not value:
+            return self.all_rows()
+        with np.errstate(invalid="ignore"):
+            mask = values <= value
+        return mask | np.isnan(values) if missing_passes else mask
+
+    def where(self, column: str, predicate: Callable[[str], bool]) -> np.ndarray:
+        """Mask from a string predicate evaluated once per distinct value (``""`` = missing)."""
+
+        matching = [code for code, value in enumerate(self._categories[column]) if predicate(value)]
+        return np.isin(self._codes[column], matching)
+
+    def top_k(
+        self,
+        k: int,
+        by: Sequence[str],
+        mask: Optional[np.ndarray] = None,
+        descending: bool = True,
+        missing: float = 0.0,
+    ) -> np.ndarray:
+        """Row indices of the best ``k`` rows ordered by the ``by`` columns.
+
+        Missing values rank as ``missing``; ties keep input order, matching a
+        stable ``list.sort``.
+        """
+
+        candidates = np.flatnonzero(mask) if mask is not None else np.arange(len(self))
+        if k <= 0 or candidates.size == 0:
+            return candidates[:0]
+
+        sign = -1.0 if descending else 1.0
+        keys = [sign * np.nan_to_num(self._numeric[column][candidates], nan=missing) for column in by]
+        if candidates.size > k:
+            # Partition on the primary key, then keep every row tied with the
+            # k-th value so the secondary keys can still break those ties.
+            primary = keys[0]
+            threshold = primary[np.argpartition(primary, k - 1)[k - 1]]
+            keep = primary <= threshold
+            candidates = candidates[keep]
+            keys = [key[keep] for key in keys]
+        # np.lexsort sorts by the last key first; the row index breaks ties.
+        order = np.lexsort([candidates, *reversed(keys)])
+        return candidates[order[:k]]
+
+    def rows(self, indices: Iterable[int]) -> List[Dict[str, Any]]:
+        """Materialise (copies of) the records at ``indices``."""
+
+        return [dict(self._records[int(index)]) for index in indices]
+
+
+__all__ = ["NUMERIC_COLUMNS", "STRING_COLUMNS", "ProviderTable"]
@@ -0,0 +1,242 @@
+"""Precomputed provider rate statistics per (role, city).
+
+Budget estimation used to take medians over a six-row provider snapshot on
+every context build. ``RateStats`` keeps every provider's rate in a sorted
+array per ``(role, place)`` bucket (plus an all-cities bucket per role), so
+quantiles and top-k are index lookups. Buckets are exact rather than
+sketches: the provider catalog is small enough that a sorted list with
+bisect updates costs less than maintaining a sketch.
+
+Like the search index, the provider catalog sync applies single-record
+updates and swaps in a fresh instance after every reconcile; other processes
+load it lazily from ``provider_catalog`` and reload every
+``RATE_STATS_REFRESH_SECONDS``.
+"""
+
+from __future__ import annotations
+
+import bisect
+import logging
+import threading
+import time
+from collections import defaultdict
+from typing import Any, Dict, Iterable, List, Mapping, Optional, Tuple
+
+from .env import env_float
+from .geo import place_of
+from .mongo_client import MongoUnavailable, get_provider_catalog_collection
+from .single_flight import SingleFlight
+
+try:
+    from pymongo.errors import PyMongoError
+except Exception:  # pragma: no cover - pymongo optional during tests
+    class PyMongoError(Exception):
+        ...
+
+logger = logging.getLogger(__name__)
+
+_DEFAULT_REFRESH_SECONDS = 300.0
+# After a failed load, skip retries for this long so callers fall back quickly.
+_RETRY_SECONDS = 30.0
+# A city bucket thinner than this defers to the role's all-cities bucket.
+MIN_CITY_SAMPLES = 3
+_RATE_FIELDS: Dict[str, Tuple[str, ...]] = {
+    "venue": ("avg_cost_lkr", "standard_rate_lkr"),
+    "lights": ("standard_rate_lkr",),
+    "solo_musician": ("standard_rate_lkr",),
+    "music_ensemble": ("standard_rate_lkr",),
+    "sound_specialist": ("standard_rate_lkr",),
+}
+# Venue rate divided by the venue's capacity, for pricing unpriced venues by size.
+PER_SEAT_ROLE = "venue_per_seat"
+_ANY_CITY = None
+# Concurrent cold callers share one catalog scan.
+_LOAD_FLIGHT = SingleFlight()
+
+_Bucket = Tuple[str, Optional[str]]
+
+
+def _refresh_interval() -> float:
+    return env_float("RATE_STATS_REFRESH_SECONDS", _DEFAULT_REFRESH_SECONDS)
+
+
+def _rate(view: Mapping[str, Any], fields: Iterable[str]) -> Optional[int]:
+    for field in fields:
+        value = view.get(field)
+        if isinstance(value, (int, float)) and not isinstance(value, bool) and value > 0:
+            return int(value)
+    return None
+
+
+def record_place(record: Mapping[str, Any]) -> Optional[str]:
+    """Gazetteer place of a catalog record: its city, else any view's address."""
+
+    place = place_of(record.get("city"))
+    if place is None:
+        for view in (record.get("views") or {}).values():
+            place = place_of(view.get("address"))
+            if place is not None:
+                break
+    return place
+
+
+def _seat_rate(view: Mapping[str, Any], rate: int) -> Optional[int]:
+    capacity = view.get("capacity")
+    if not isinstance(capacity, int) or isinstance(capacity, bool) or capacity <= 0:
+        return None
+    return max(rate // capacity, 1)
+
+
+def record_rates(record: Mapping[str, Any]) -> List[Tuple[_Bucket, int]]:
+    """``((role, place), rate)`` entries one catalog record contributes."""
+
+    place = record_place(record)
+    rates: List[Tuple[str, int]] = []
+    for role, view in (record.get("views") or {}).items():
+        rate = _rate(view, _RATE_FIELDS.get(role, ("standard_rate_lkr",)))
+        if rate is None:
+            continue
+        rates.append((role, rate))
+        if role == "venue":
+            per_seat = _seat_rate(view, rate)
+            if per_seat is not None:
+                rates.append((PER_SEAT_ROLE, per_seat))
+    entries: List[Tuple[_Bucket, int]] = []
+    for role, rate in rates:
+        entries.append(((role, _ANY_CITY), rate))
+        if place is not None:
+            entries.append(((role, place), rate))
+    return entries
+
+
+class RateStats:
+    """Thread-safe sorted rate arrays per ``(role, place)`` bucket."""
+
+    def __init__(self) -> None:
+        self._lock = threading.RLock()
+        self._buckets: Dict[_Bucket, List[int]] = defaultdict(list)
+        self._entries: Dict[Any, List[Tuple[_Bucket, int]]] = {}
+        self.loaded_at: Optional[float] = None
+        self.live = False
+        self._failed_at: Optional[float] = None
+
+    def __len__(self) -> int:
+        return len(self._entries)
+
+    @property
+    def ready(self) -> bool:
+        if self.loaded_at is None:
+            return False
+        return self.live or time.monotonic() - self.loaded_at < _refresh_interval()
+
+    def apply(self, record: Mapping[str, Any]) -> None:
+        """Add (or replace) the rates of one provider catalog record."""
+
+        with self._lock:
+            self._discard_locked(record["_id"])
+            entries = record_rates(record)
+            if not entries:
+                return
+            self._entries[record["_id"]] = entries
+            for bucket, rate in entries:
+                bisect.insort(self._buckets[bucket], rate)
+
+    def discard(self, doc_id: Any) -> None:
+        with self._lock:
+            self._discard_locked(doc_id)
+
+    def _discard_locked(self, doc_id: Any) -> None:
+        for bucket, rate in self._entries.pop(doc_id, ()):
+            rates = self._buckets[bucket]
+            index = bisect.bisect_left(rates, rate)
+            if index < len(rates) and rates[index] == rate:
+                del rates[index]
+
+    def replace(self, records: Iterable[Mapping[str, Any]], live: bool = False) -> None:
+        fresh = RateStats()
+        for record in records:
+            fresh.apply(record)
+        self.adopt(fresh, live=live)
+
+    def adopt(self, fresh: "RateStats", live: bool = False) -> None:
+        """Swap in the contents of an instance built off to the side."""
+
+        with self._lock:
+            self._buckets = fresh._buckets
+            self._entries = fresh._entries
+            self.loaded_at = time.monotonic()
+            self.live = live
+            self._failed_at = None
+
+    def _rates(self, role: str, city: Optional[str]) -> List[int]:
+        place = place_of(city) if city else None
+        if place is not None:
+            rates = self._buckets.get((role, place), [])
+            if len(rates) >= MIN_CITY_SAMPLES:
+                return rates
+        return self._buckets.get((role, _ANY_CITY), [])
+
+    def count(self, role: str, city: Optional[str] = None) -> int:
+        with self._lock:
+            return len(self._rates(role, city))
+
+    def quantile(self, role: str, q: float, city: Optional[str] = None) -> Optional[int]:
+        """Nearest-rank ``q`` quantile (0..1) of ``role`` rates, ``None`` when unknown."""
+
+        with self._lock:
+            rates = self._rates(role, city)
+            if not rates:
+                return None
+            return rates[min(len(rates) - 1, max(0, round(q * (len(rates) - 1))))]
+
+    def median(self, role: str, city: Optional[str] = None) -> Optional[int]:
+        return self.quantile(role, 0.5, city)
+
+    def summary(self, role: str, city: Optional[str] = None) -> Dict[str, Optional[int]]:
+        return {
+            "count": self.count(role, city),
+            "p25": self.quantile(role, 0.25, city),
+            "median": self.median(role, city),
+            "p75": self.quantile(role, 0.75, city),
+        }
+
+    def top(self, roles: Iterable[str], k: int, city: Optional[str] = None) -> List[int]:
+        """The ``k`` highest rates across ``roles``, highest first."""
+
+        with self._lock:
+            heads: List[int] = []
+            for role in roles:
+                heads.extend(self._rates(role, city)[-k:])
+        return sorted(heads, reverse=True)[:k]
+
+    def ensure_loaded(self) -> bool:
+        """Load from ``provider_catalog`` unless current; returns ``False`` when unavailable."""
+
+        if self.ready:
+            return True
+        if self._failed_at is not None and time.monotonic() - self._failed_at < _RETRY_SECONDS:
+            return False
+        return _LOAD_FLIGHT.do(id(self), self._load)
+
+    def _load(self) -> bool:
+        projection: Dict[str, int] = {"city": 1, "views.venue.capacity": 1}
+        for role, fields in _RATE_FIELDS.items():
+            projection.update({f"views.{role}.{field}": 1 for field in (*fields, "address")})
+        try:
+            self.replace(get_provider_catalog_collection().find({}, projection=projection))
+        except (MongoUnavailable, PyMongoError) as exc:
+            logger.debug("Rate statistics unavailable: %s", exc)
+            self._failed_at = time.monotonic()
+            return False
+        logger.info("Rate statistics loaded: %s provider(s)", len(self))
+        return True
+
+
+_STATS = RateStats()
+
+
+def rate_stats() -> RateStats:
+    return _STATS
+
+
+__all__ = ["MIN_CITY_SAMPLES", "PER_SEAT_ROLE", "RateStats", "rate_stats", "record_place", "record_rates"]
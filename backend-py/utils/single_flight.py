@@ -0,0 +1,95 @@
+"""Single-flight de-duplication of concurrent calls.
+
+While a call for ``key`` is running, further calls for the same key wait for
+it and share its result (or exception) instead of repeating the work. Once
+the call finishes the key is forgotten; caching the result is up to the
+caller.
+"""
+
+from __future__ import annotations
+
+import asyncio
+import threading
+from typing import Any, Awaitable, Callable, Dict, Hashable, Optional, Tuple, TypeVar
+
+T = TypeVar("T")
+
+
+class _Call:
+    __slots__ = ("done", "value", "error")
+
+    def __init__(self) -> None:
+        self.done = threading.Event()
+        self.value: Any = None
+        self.error: Optional[BaseException] = None
+
+
+class SingleFlight:
+    """Thread-based single flight for blocking loaders."""
+
+    def __init__(self) -> None:
+        self._lock = threading.Lock()
+        self._calls: Dict[Hashable, _Call] = {}
+        self.shared = 0
+
+    def do(self, key: Hashable, fn: Callable[[], T]) -> T:
+        with self._lock:
+            call = self._calls.get(key)
+            leader = call is None
+            if leader:
+                call = self._calls[key] = _Call()
+            else:
+                self.shared += 1
+        if not leader:
+            call.done.wait()
+            if call.error is not None:
+                raise call.error
+            return call.value
+
+        try:
+            call.value = fn()
+        except BaseException as exc:
+            call.error = exc
+            raise
+        finally:
+            with self._lock:
+                self._calls.pop(key, None)
+            call.done.set()
+        return call.value
+
+
+class AsyncSingleFlight:
+    """:class:`SingleFlight` for coroutine loaders; calls are shared per event loop."""
+
+    def __init__(self) -> None:
+        self._calls: Dict[Tuple[int, Hashable], "asyncio.Future[Any]"] = {}
+        self.shared = 0
+
+    async def do(self, key: Hashable, fn: Callable[[], Awaitable[T]]) -> T:
+        loop = asyncio.get_running_loop()
+        slot = (id(loop), key)
+        pending = self._calls.get(slot)
+        if pending is not None:
+            self.shared += 1
+            # Shielded so a cancelled follower does not cancel the shared call.
+            return await asyncio.shield(pending)
+
+        future: "asyncio.Future[Any]" = loop.create_future()
+        self._calls[slot] = future
+        try:
+            value = await fn()
+        except asyncio.CancelledError:
+            future.cancel()
+            raise
+        except BaseException as exc:
+            future.set_exception(exc)
+            future.exception()  # mark retrieved when nobody else was waiting
+            raise
+        else:
+            future.set_result(value)
+            return value
+        finally:
+            self._calls.pop(slot, None)
+
+
+__all__ = ["AsyncSingleFlight", "SingleFlight"]
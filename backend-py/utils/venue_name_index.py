@@ -0,0 +1,67 @@
+"""In-memory venue ``name_key`` -> user ``_id`` map, refreshed with the provider catalog."""
+
+from __future__ import annotations
+
+import threading
+from typing import Any, Dict, Mapping, Optional
+
+
+class VenueNameIndex:
+    """Thread-safe O(1) exact venue-name lookup.
+
+    The catalog sync replaces the whole map after each full reconcile and
+    applies single-record updates from the users change feed in between.
+    """
+
+    def __init__(self) -> None:
+        self._ids: Dict[str, Any] = {}
+        self._keys: Dict[Any, str] = {}
+        self._lock = threading.Lock()
+
+    def __len__(self) -> int:
+        return len(self._ids)
+
+    def get(self, key: Optional[str]) -> Optional[Any]:
+        if not key:
+            return None
+        return self._ids.get(key)
+
+    def set(self, key: str, doc_id: Any) -> None:
+        with self._lock:
+            self._discard_locked(doc_id)
+            self._ids[key] = doc_id
+            self._keys[doc_id] = key
+
+    def discard(self, doc_id: Any) -> None:
+        with self._lock:
+            self._discard_locked(doc_id)
+
+    def _discard_locked(self, doc_id: Any) -> None:
+        key = self._keys.pop(doc_id, None)
+        if key is not None and self._ids.get(key) == doc_id:
+            del self._ids[key]
+
+    def apply(self, record: Mapping[str, Any]) -> None:
+        """Update the map from one provider catalog record."""
+
+        if "venue" in record.get("roles", ()) and record.get("name_key"):
+            self.set(record["name_key"], record["_id"])
+        else:
+            self.discard(record["_id"])
+
+    def replace(self, mapping: Mapping[str, Any]) -> None:
+        ids = dict(mapping)
+        keys = {doc_id: key for key, doc_id in ids.items()}
+        with self._lock:
+            self._ids = ids
+            self._keys = keys
+
+
+_INDEX = VenueNameIndex()
+
+
+def venue_name_index() -> VenueNameIndex:
+    return _INDEX
+
+
+__all__ = ["VenueNameIndex", "venue_name_index"]